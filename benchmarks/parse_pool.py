@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import functools
+import os
+import time
+
+from discolinks import outcome
+from discolinks.core import LinkKind, Url
+from discolinks.html import ScanCache
+from discolinks.link_extractor import get_document
+from discolinks.parsing import ParsePool, gil_enabled
+
+
+def make_page(index: int, links: int) -> str:
+    """
+    Return a page with distinct links, so that no two pages share a scan.
+    """
+
+    items = "".join(
+        f'<li><a href="/page/{index}/{link}">Link {link}</a> <img src="/{link}.png">'
+        for link in range(links)
+    )
+    return f"<html><body><h1 id='top'>Page {index}</h1><ul>{items}</ul></body></html>"
+
+
+async def parse_all(pages: list[str], threads: int) -> float:
+    """
+    Parse all pages like crawl workers would, and return the time taken in seconds.
+    """
+
+    scans = ScanCache()
+    pool = ParsePool.start(threads) if threads else None
+    kinds = frozenset([LinkKind.LINK, LinkKind.IMAGE])
+
+    async def parse_page(index: int, body: str) -> None:
+        parse = functools.partial(
+            get_document,
+            url=Url.from_str(f"http://example.net/page/{index}"),
+            result=outcome.Page(code=200, body=body),
+            kinds=kinds,
+            scans=scans,
+        )
+        document = parse() if pool is None else await pool.run(parse)
+        assert document is not None
+
+    start = time.perf_counter()
+
+    try:
+        await asyncio.gather(
+            *(parse_page(index, body) for (index, body) in enumerate(pages))
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare parsing pages on the event loop and on threads."
+    )
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--links", type=int, default=200)
+    parser.add_argument("--threads", type=int, nargs="*")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = args.threads or sorted({1, 2, 4, cpus})
+    pages = [make_page(index, args.links) for index in range(args.pages)]
+    print(f"GIL {'enabled' if gil_enabled() else 'disabled'}, {cpus} CPUs")
+    print(f"{args.pages} pages of {args.links} links")
+
+    inline = asyncio.run(parse_all(pages, threads=0))
+    print(f"inline: {inline:.2f} s")
+
+    for threads in counts:
+        duration = asyncio.run(parse_all(pages, threads=threads))
+        print(f"{threads} thread(s): {duration:.2f} s ({inline / duration:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
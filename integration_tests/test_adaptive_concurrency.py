@@ -0,0 +1,50 @@
+import json
+import subprocess
+from typing import Optional
+
+import pytest
+from flask import Blueprint, abort
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return "".join(f"""<a href="/{index}">""" for index in range(20))
+
+    @blueprint.route("/<int:index>")
+    def page(index: int):
+        if index % 5 == 0:
+            abort(503)
+
+        return """<a href="/">\n"""
+
+    return blueprint
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_adaptive_concurrency(http_server, processes: Optional[int]) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    expected = subprocess.run(
+        util.command(url="http://localhost:5000", json=True),
+        stdout=subprocess.PIPE,
+    )
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            adaptive_concurrency=True,
+            processes=processes,
+        ),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == expected.returncode == 1
+    assert json.loads(result.stdout.decode()) == json.loads(expected.stdout.decode())
+    # Each worker process reports its own limits.
+    assert result.stderr.decode().count("Concurrency settled at") == (processes or 1)
@@ -0,0 +1,82 @@
+import json
+import subprocess
+from pathlib import Path
+
+from flask import Blueprint, abort
+
+from . import util
+
+
+def make_blueprint(requests: list[str]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+    pages = {
+        "": """<a href="/a"><a href="/b#top"><a href="/nx">\n""",
+        "a": """<a href="/">\n""",
+        "b": """<p id="top">\n""",
+    }
+
+    @blueprint.route("/", defaults={"path": ""})
+    @blueprint.route("/<path>")
+    def page(path: str):
+        requests.append(f"/{path}")
+
+        if path not in pages:
+            abort(404)
+
+        return pages[path]
+
+    return blueprint
+
+
+def test_record_replay(http_server, tmp_path: Path) -> None:
+    requests: list[str] = []
+    http_server(blueprint=make_blueprint(requests=requests), port=5000)
+    archive = str(tmp_path / "crawl.jsonl.gz")
+
+    recorded = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, record=archive),
+        stdout=subprocess.PIPE,
+    )
+
+    assert recorded.returncode == 1
+    assert requests
+    requests.clear()
+
+    replayed = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, replay=archive),
+        stdout=subprocess.PIPE,
+    )
+
+    assert replayed.returncode == 1
+    assert requests == []
+    assert json.loads(replayed.stdout.decode()) == json.loads(recorded.stdout.decode())
+
+
+def test_replay_missing(tmp_path: Path) -> None:
+    archive = tmp_path / "crawl.jsonl.gz"
+    archive.write_bytes(b"")
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", replay=str(archive)),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == ""
+    assert "Not in archive" in result.stderr.decode()
+
+
+def test_record_and_replay(tmp_path: Path) -> None:
+    archive = tmp_path / "crawl.jsonl.gz"
+    archive.write_bytes(b"")
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000", record=str(archive), replay=str(archive)
+        ),
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 2
+    assert "--record" in result.stderr.decode()
@@ -0,0 +1,63 @@
+import subprocess
+from pathlib import Path
+
+from flask import Blueprint, abort
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """
+            <a href="/foo">
+            <a href="http://localhost:5001/ok">
+            <a href="http://localhost:5001/nx">
+        """
+
+    @blueprint.route("/foo")
+    def foo():
+        return ""
+
+    return blueprint
+
+
+def make_external_blueprint(requests: list[str]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/<path>", methods=["HEAD"])
+    def page(path: str):
+        requests.append(path)
+
+        if path != "ok":
+            abort(404)
+
+        return ""
+
+    return blueprint
+
+
+def test_text(http_server, tmp_path: Path) -> None:
+    requests: list[str] = []
+    http_server(blueprint=make_blueprint(), port=5000)
+    http_server(blueprint=make_external_blueprint(requests=requests), port=5001)
+    command = util.command(
+        url="http://localhost:5000",
+        cache=str(tmp_path / "cache.sqlite"),
+        cache_failure_ttl=0,
+    )
+
+    results = [subprocess.run(command, stdout=subprocess.PIPE) for _ in range(2)]
+
+    for result in results:
+        assert result.returncode == 1
+        assert result.stdout.decode() == util.output_str(
+            """
+            📂 Results: 3 links (2 ok, 1 failed)
+            └── 📄 http://localhost:5000
+                └── 🔗 http://localhost:5001/nx: 404
+            """
+        )
+    assert sorted(requests) == ["nx", "nx", "ok"]
@@ -0,0 +1,72 @@
+import json
+import subprocess
+
+from flask import Blueprint, request
+
+from . import util
+
+
+def make_blueprint(requests: list[str]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.before_app_request
+    def log_request():
+        requests.append(request.full_path)
+
+    @blueprint.route("/")
+    def root():
+        return """
+            <a href="/foo">
+            <a href="/foo/">
+            <a href="/foo?utm_source=x">
+            <a href="/bar?b=1&a=2">
+            <a href="/bar?a=2&b=1">
+        """
+
+    @blueprint.route("/foo")
+    def foo():
+        return ""
+
+    @blueprint.route("/bar")
+    def bar():
+        return ""
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    requests: list[str] = []
+    http_server(blueprint=make_blueprint(requests), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            canonicalize=["tracking-params", "sort-query", "trailing-slash"],
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    links = json.loads(result.stdout.decode())["http://localhost:5000"]["links"]
+    assert [(link["href"], link["url"]) for link in links] == [
+        ("/foo", "http://localhost:5000/foo"),
+        ("/foo/", "http://localhost:5000/foo"),
+        ("/foo?utm_source=x", "http://localhost:5000/foo"),
+        ("/bar?b=1&a=2", "http://localhost:5000/bar?a=2&b=1"),
+        ("/bar?a=2&b=1", "http://localhost:5000/bar?a=2&b=1"),
+    ]
+    assert sorted(requests) == ["/?", "/bar?a=2&b=1", "/foo?"]
+
+
+def test_json_none(http_server) -> None:
+    requests: list[str] = []
+    http_server(blueprint=make_blueprint(requests), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, canonicalize=["none"]),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1  # `/foo/` doesn't exist.
+    assert len(requests) == 6
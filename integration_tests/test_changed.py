@@ -0,0 +1,97 @@
+import json
+import subprocess
+from pathlib import Path
+
+from flask import Blueprint, abort
+
+from . import util
+
+
+def make_blueprint(pages: dict[str, str], requests: list[str]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/", defaults={"path": ""})
+    @blueprint.route("/<path>")
+    def page(path: str):
+        requests.append(f"/{path}")
+
+        if path not in pages:
+            abort(404)
+
+        return pages[path]
+
+    return blueprint
+
+
+def test_changed(http_server, tmp_path: Path) -> None:
+    pages = {
+        "": """<a href="/a"><a href="/b">\n""",
+        "a": """<a href="/c">\n""",
+        "b": """<a href="/c">\n""",
+        "c": "",
+    }
+    requests: list[str] = []
+    http_server(blueprint=make_blueprint(pages=pages, requests=requests), port=5000)
+    index = str(tmp_path / "index.sqlite")
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", index=index),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    pages["a"] = """<a href="/c"><a href="/d">\n"""
+    del pages["b"]
+    requests.clear()
+
+    result = subprocess.run(
+        util.command(
+            json=True,
+            index=index,
+            changed=["http://localhost:5000/a", "http://localhost:5000/b"],
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert sorted(requests) == ["/a", "/b", "/d"]
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5000": {
+            "links": [
+                {
+                    "href": "/a",
+                    "url": "http://localhost:5000/a",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+                {
+                    "href": "/b",
+                    "url": "http://localhost:5000/b",
+                    "results": [{"type": "response", "status_code": 404}],
+                },
+            ],
+        },
+        "http://localhost:5000/a": {
+            "links": [
+                {
+                    "href": "/c",
+                    "url": "http://localhost:5000/c",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+                {
+                    "href": "/d",
+                    "url": "http://localhost:5000/d",
+                    "results": [{"type": "response", "status_code": 404}],
+                },
+            ],
+        },
+    }
+
+
+def test_changed_without_index() -> None:
+    result = subprocess.run(
+        util.command(changed=["http://localhost:5000/a"]),
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 2
+    assert "--index" in result.stderr.decode()
@@ -0,0 +1,95 @@
+import json
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from flask import Blueprint
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/a"><a href="/missing"><a href="/a#nope">\n"""
+
+    @blueprint.route("/a")
+    def a():
+        return ""
+
+    return blueprint
+
+
+def test_junit(http_server, tmp_path: Path) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+    path = tmp_path / "report.xml"
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", junit=str(path)),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    suites = ET.parse(path).getroot()
+    # Pages are written in the order their results are known.
+    assert sorted((suite.attrib for suite in suites), key=lambda a: a["name"]) == [
+        {
+            "name": "http://localhost:5000",
+            "tests": "3",
+            "failures": "2",
+            "skipped": "0",
+        },
+        {
+            "name": "http://localhost:5000/a",
+            "tests": "0",
+            "failures": "0",
+            "skipped": "0",
+        },
+    ]
+    [root] = [suite for suite in suites if suite.attrib["tests"] == "3"]
+    cases = {case.attrib["name"]: case for case in root}
+    assert list(cases["/a"]) == []
+    assert cases["/missing"][0].tag == "failure"
+    assert cases["/missing"][0].attrib["message"] == "404"
+    assert cases["/a#nope"][0].attrib["message"] == "200 → #nope not found"
+
+
+def test_sarif(http_server, tmp_path: Path) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+    path = tmp_path / "report.sarif"
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", sarif=str(path)),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    log = json.loads(path.read_text())
+    assert log["version"] == "2.1.0"
+    [run] = log["runs"]
+    assert run["tool"]["driver"]["name"] == "discolinks"
+    assert sorted(
+        (item["ruleId"], item["message"]["text"]) for item in run["results"]
+    ) == [
+        ("broken-link", "/missing: 404"),
+        ("missing-fragment", "/a#nope: 200 → #nope not found"),
+    ]
+    assert run["results"][0]["locations"] == [
+        {"physicalLocation": {"artifactLocation": {"uri": "http://localhost:5000"}}}
+    ]
+
+
+def test_sarif_empty(http_server, tmp_path: Path) -> None:
+    http_server(blueprint=Blueprint("main", __name__), port=5000)
+    path = tmp_path / "report.sarif"
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", sarif=str(path)),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    [run] = json.loads(path.read_text())["runs"]
+    assert run["results"] == []
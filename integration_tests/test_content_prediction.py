@@ -0,0 +1,79 @@
+import subprocess
+
+from flask import Blueprint, Response, request
+
+from . import util
+
+
+def make_blueprint(requests: list[tuple[str, str]]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.before_app_request
+    def log_request():
+        requests.append((request.method, request.path))
+
+    @blueprint.route("/")
+    def root():
+        return """
+            <a href="/report.pdf">
+            <a href="/downloads/">
+            <a href="/nx.zip">
+            <a href="/page.pdf">
+        """
+
+    @blueprint.route("/report.pdf")
+    def report():
+        return Response(b"%PDF", mimetype="application/pdf")
+
+    @blueprint.route("/downloads/")
+    def downloads():
+        return """<a href="/downloads/1"><a href="/downloads/2">"""
+
+    @blueprint.route("/downloads/<int:index>")
+    def download(index: int):
+        return Response(b"PK", mimetype="application/zip")
+
+    @blueprint.route("/page.pdf")
+    def page():
+        return """<a href="/nx">"""
+
+    return blueprint
+
+
+def test_head(http_server) -> None:
+    requests: list[tuple[str, str]] = []
+    http_server(blueprint=make_blueprint(requests=requests), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", max_parallel_requests=1),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == util.output_str(
+        """
+        📂 Results: 7 links (5 ok, 2 failed)
+        ├── 📄 http://localhost:5000
+        │   └── 🔗 /nx.zip: 404
+        └── 📄 http://localhost:5000/page.pdf
+            └── 🔗 /nx: 404
+        """
+    )
+    assert sorted(
+        (method, path)
+        for (method, path) in requests
+        if not path.startswith("/downloads/")
+    ) == [
+        ("GET", "/"),
+        ("GET", "/nx"),
+        # Not a PDF file after all.
+        ("GET", "/page.pdf"),
+        ("HEAD", "/nx.zip"),
+        ("HEAD", "/page.pdf"),
+        ("HEAD", "/report.pdf"),
+    ]
+    # The content type of the first download fetched (after the directory itself)
+    # applies to the other one.
+    assert sorted(
+        method for (method, path) in requests if path.startswith("/downloads/")
+    ) == ["GET", "GET", "HEAD"]
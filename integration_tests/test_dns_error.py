@@ -0,0 +1,40 @@
+import json
+import subprocess
+
+from flask import Blueprint
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """
+            <a href="http://discolinks.invalid/foo">
+            <a href="http://discolinks.invalid/bar">
+        """
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    links = json.loads(result.stdout.decode())["http://localhost:5000"]["links"]
+    assert [link["href"] for link in links] == [
+        "http://discolinks.invalid/foo",
+        "http://discolinks.invalid/bar",
+    ]
+
+    for link in links:
+        [error] = link["results"]
+        assert error["type"] == "request_error"
+        assert error["message"].startswith("Failed to resolve discolinks.invalid")
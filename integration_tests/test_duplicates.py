@@ -0,0 +1,73 @@
+import json
+import subprocess
+
+from flask import Blueprint
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/en/page"><a href="/print/page">\n"""
+
+    @blueprint.route("/<section>/page")
+    def page(section: str):
+        return """<a href="other">\n"""
+
+    @blueprint.route("/en/other")
+    def other():
+        return ""
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, report_duplicates=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    pages = json.loads(result.stdout.decode())
+    assert pages["http://localhost:5000/en/page"]["duplicates"] == [
+        "http://localhost:5000/print/page"
+    ]
+    # Links of duplicate pages are resolved relative to each page.
+    assert pages["http://localhost:5000/print/page"] == {
+        "links": [
+            {
+                "href": "other",
+                "url": "http://localhost:5000/print/other",
+                "results": [{"type": "response", "status_code": 404}],
+            },
+        ],
+        "duplicates": ["http://localhost:5000/en/page"],
+    }
+    assert "duplicates" not in pages["http://localhost:5000"]
+
+
+def test_text(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", report_duplicates=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == util.output_str(
+        """
+        📂 Results: 4 links (3 ok, 1 failed)
+        ├── 📄 http://localhost:5000/print/page
+        │   └── 🔗 other: 404
+        └── 🪞 1 groups of identical pages
+            └── 2 pages
+                ├── 📄 http://localhost:5000/en/page
+                └── 📄 http://localhost:5000/print/page
+        """
+    )
@@ -0,0 +1,101 @@
+import json
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from flask import Blueprint, abort
+
+from . import util
+
+
+def make_external_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/<path>", methods=["HEAD"])
+    def page(path: str):
+        if path != "ok":
+            abort(404)
+
+        return ""
+
+    return blueprint
+
+
+def make_site(root: Path) -> None:
+    (root / "index.html").write_text(
+        """
+        <a href="/docs">
+        <a href="/missing.html">
+        <a href="http://localhost:5001/ok">
+        <a href="http://localhost:5001/nx">
+        """
+    )
+    (root / "docs").mkdir()
+    (root / "docs" / "index.html").write_text("""<a href="../">""")
+
+
+@pytest.mark.parametrize("processes", [None, 1])
+def test_root(http_server, tmp_path: Path, processes: Optional[int]) -> None:
+    http_server(blueprint=make_external_blueprint(), port=5001)
+    make_site(tmp_path)
+
+    result = subprocess.run(
+        util.command(
+            json=True,
+            root=str(tmp_path),
+            base_url="http://example.net/",
+            processes=processes,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    pages = json.loads(result.stdout.decode())
+    assert pages["http://example.net/"]["links"] == [
+        {
+            "href": "/docs",
+            "url": "http://example.net/docs",
+            "results": [
+                {
+                    "type": "redirect",
+                    "status_code": 301,
+                    "value": "http://example.net/docs/",
+                    "url": "http://example.net/docs/",
+                },
+                {"type": "response", "status_code": 200},
+            ],
+        },
+        {
+            "href": "/missing.html",
+            "url": "http://example.net/missing.html",
+            "results": [{"type": "response", "status_code": 404}],
+        },
+        {
+            "href": "http://localhost:5001/ok",
+            "url": "http://localhost:5001/ok",
+            "results": [{"type": "response", "status_code": 200}],
+        },
+        {
+            "href": "http://localhost:5001/nx",
+            "url": "http://localhost:5001/nx",
+            "results": [{"type": "response", "status_code": 404}],
+        },
+    ]
+    assert pages["http://example.net/docs/"]["links"] == [
+        {
+            "href": "../",
+            "url": "http://example.net/",
+            "results": [{"type": "response", "status_code": 200}],
+        },
+    ]
+
+
+def test_root_without_base_url(tmp_path: Path) -> None:
+    result = subprocess.run(
+        util.command(root=str(tmp_path)),
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 2
+    assert "--base-url" in result.stderr.decode()
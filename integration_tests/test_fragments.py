@@ -19,7 +19,12 @@ def make_blueprint() -> Blueprint:
 
     @blueprint.route("/foo")
     def foo():
-        return """<h2 id="bar">"""
+        return """
+            <h2 id="bar">
+            <a name="qux">
+            <a href="#qux">
+            <a href="#top">
+        """
 
     return blueprint
 
@@ -42,7 +47,7 @@ def test_json(http_server, url) -> None:
         stdout=subprocess.PIPE,
     )
 
-    assert result.returncode == 0
+    assert result.returncode == 1
     assert json.loads(result.stdout.decode()) == {
         "http://localhost:5000": {
             "links": [
@@ -63,12 +68,55 @@ def test_json(http_server, url) -> None:
                         {
                             "type": "response",
                             "status_code": 200,
-                        }
+                        },
+                        {
+                            "type": "missing_fragment",
+                            "fragment": "baz",
+                        },
                     ],
                 },
             ],
         },
         "http://localhost:5000/foo": {
-            "links": [],
+            "links": [
+                {
+                    "href": "#qux",
+                    "url": "http://localhost:5000/foo",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        }
+                    ],
+                },
+                {
+                    "href": "#top",
+                    "url": "http://localhost:5000/foo",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        }
+                    ],
+                },
+            ],
         },
     }
+
+
+def test_text(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000"),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == util.output_str(
+        """
+        📂 Results: 4 links (3 ok, 1 failed)
+        └── 📄 http://localhost:5000
+            └── 🔗 /foo#baz: 200 → #baz not found
+        """
+    )
@@ -0,0 +1,107 @@
+import json
+import subprocess
+
+import pytest
+from flask import Blueprint, redirect
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/day/1"><a href="/about">\n"""
+
+    @blueprint.route("/about")
+    def about():
+        return redirect("/about/")
+
+    @blueprint.route("/about/")
+    def about_slash():
+        return ""
+
+    @blueprint.route("/day/<int:day>")
+    def day(day: int):
+        return f"""<a href="/day/{day + 1}">\n"""
+
+    return blueprint
+
+
+def links_json(href: str, results: list) -> dict:
+    return {
+        "links": [
+            {"href": href, "url": f"http://localhost:5000{href}", "results": results},
+        ],
+    }
+
+
+def skipped_json(reason: str) -> list:
+    return [{"type": "skipped", "reason": reason}]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_json_max_depth(http_server, processes: int) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            max_depth=2,
+            processes=processes,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    pages = json.loads(result.stdout.decode())
+    assert pages.keys() == {
+        "http://localhost:5000",
+        "http://localhost:5000/about/",
+        "http://localhost:5000/day/1",
+        "http://localhost:5000/day/2",
+    }
+    assert pages["http://localhost:5000/day/2"] == links_json(
+        "/day/3", skipped_json("depth limit")
+    )
+
+
+def test_json_path_budget(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            path_budgets=["/day/=3"],
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    pages = json.loads(result.stdout.decode())
+    assert pages["http://localhost:5000/day/3"] == links_json(
+        "/day/4", skipped_json("page limit for /day/")
+    )
+    assert "http://localhost:5000/about/" in pages
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_text_max_pages(http_server, processes: int) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", max_pages=3, processes=processes),
+        stdout=subprocess.PIPE,
+    )
+
+    # The root page, `/day/1` and `/about` are crawled. `/about` is a redirect to
+    # `/about/`, which counts as the same page. `/day/2` is skipped.
+    assert result.returncode == 0
+    assert result.stdout.decode() == util.output_str(
+        """
+        📂 Results: 3 links (2 ok, 0 failed, 1 skipped)
+        """
+    )
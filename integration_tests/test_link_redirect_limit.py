@@ -0,0 +1,104 @@
+import json
+import subprocess
+
+import pytest
+from flask import Blueprint, redirect
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/loop-a"><a href="/hop/0">\n"""
+
+    @blueprint.route("/loop-a")
+    def loop_a():
+        return redirect("/loop-b")
+
+    @blueprint.route("/loop-b")
+    def loop_b():
+        return redirect("/loop-a")
+
+    @blueprint.route("/hop/<int:index>")
+    def hop(index: int):
+        if index == 2:
+            return ""
+        return redirect(f"/hop/{index + 1}")
+
+    return blueprint
+
+
+def redirect_json(path: str) -> dict:
+    return {
+        "type": "redirect",
+        "status_code": 302,
+        "value": path,
+        "url": f"http://localhost:5000{path}",
+    }
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_json_loop(http_server, processes: int) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            processes=processes,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5000": {
+            "links": [
+                {
+                    "href": "/loop-a",
+                    "url": "http://localhost:5000/loop-a",
+                    "results": [
+                        redirect_json("/loop-b"),
+                        redirect_json("/loop-a"),
+                        {"type": "request_error", "message": "Redirect loop"},
+                    ],
+                },
+                {
+                    "href": "/hop/0",
+                    "url": "http://localhost:5000/hop/0",
+                    "results": [
+                        redirect_json("/hop/1"),
+                        redirect_json("/hop/2"),
+                        {"type": "response", "status_code": 200},
+                    ],
+                },
+            ],
+        },
+        "http://localhost:5000/hop/2": {"links": []},
+    }
+
+
+def test_json_too_many_redirects(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            max_redirects=1,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode())["http://localhost:5000"]["links"][1] == {
+        "href": "/hop/0",
+        "url": "http://localhost:5000/hop/0",
+        "results": [
+            redirect_json("/hop/1"),
+            {"type": "request_error", "message": "Too many redirects"},
+        ],
+    }
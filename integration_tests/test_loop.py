@@ -0,0 +1,45 @@
+import json
+import subprocess
+from typing import Optional
+
+import pytest
+from flask import Blueprint
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/foo"><a href="/nx">\n"""
+
+    @blueprint.route("/foo")
+    def foo():
+        return """<a href="/">\n"""
+
+    return blueprint
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_uvloop(http_server, processes: Optional[int]) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    expected = subprocess.run(
+        util.command(url="http://localhost:5000", json=True),
+        stdout=subprocess.PIPE,
+    )
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            processes=processes,
+            uvloop=True,
+            stall_threshold=10,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == expected.returncode == 1
+    assert json.loads(result.stdout.decode()) == json.loads(expected.stdout.decode())
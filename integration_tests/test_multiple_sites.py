@@ -0,0 +1,129 @@
+import json
+import subprocess
+from pathlib import Path
+
+from flask import Blueprint
+
+from . import util
+
+
+def make_site_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """
+            <a href="http://localhost:5002">
+            <a href="/nx">
+        """
+
+    return blueprint
+
+
+def make_external_blueprint(requests: list[str]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/", methods=["GET", "HEAD"])
+    def root():
+        requests.append("/")
+        return ""
+
+    return blueprint
+
+
+def start_servers(http_server) -> list[str]:
+    requests: list[str] = []
+    http_server(blueprint=make_site_blueprint(), port=5000)
+    http_server(blueprint=make_site_blueprint(), port=5001)
+    http_server(blueprint=make_external_blueprint(requests=requests), port=5002)
+    return requests
+
+
+def test_text(http_server) -> None:
+    requests = start_servers(http_server)
+
+    result = subprocess.run(
+        util.command(urls=["http://localhost:5000", "http://localhost:5001"]),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == util.output_str(
+        """
+        📂 Results: 4 links (2 ok, 2 failed)
+        ├── 🌐 localhost:5000: 2 links (1 ok, 1 failed)
+        │   └── 📄 http://localhost:5000
+        │       └── 🔗 /nx: 404
+        └── 🌐 localhost:5001: 2 links (1 ok, 1 failed)
+            └── 📄 http://localhost:5001
+                └── 🔗 /nx: 404
+        """
+    )
+    assert requests == ["/"]
+
+
+def test_json_urls_from(http_server, tmp_path: Path) -> None:
+    start_servers(http_server)
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("# Sites\nhttp://localhost:5000\n\nhttp://localhost:5001\n")
+
+    result = subprocess.run(
+        util.command(urls_from=str(urls_file), json=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode()) == {
+        f"http://localhost:{port}": {
+            "links": [
+                {
+                    "href": "http://localhost:5002",
+                    "url": "http://localhost:5002",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        },
+                    ],
+                },
+                {
+                    "href": "/nx",
+                    "url": f"http://localhost:{port}/nx",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 404,
+                        },
+                    ],
+                },
+            ],
+        }
+        for port in (5000, 5001)
+    }
+
+
+def test_json_one_site_down(http_server) -> None:
+    start_servers(http_server)
+
+    result = subprocess.run(
+        util.command(urls=["http://localhost:1", "http://localhost:5002"], json=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5002": {
+            "links": [],
+        },
+    }
+
+
+def test_no_url() -> None:
+    result = subprocess.run(
+        util.command(json=True),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 2
+    assert result.stdout.decode() == ""
@@ -0,0 +1,45 @@
+import json
+import subprocess
+from typing import Optional
+
+import pytest
+from flask import Blueprint
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return "".join(f'<a href="/page/{index}">' for index in range(20))
+
+    @blueprint.route("/page/<int:index>")
+    def page(index: int):
+        # Identical bodies, which threads share the scan of.
+        return """<a href="/"><a href="/nx"><a href="#top">\n"""
+
+    return blueprint
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_parse_threads(http_server, processes: Optional[int]) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    expected = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, parse_threads=0),
+        stdout=subprocess.PIPE,
+    )
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            processes=processes,
+            parse_threads=4,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == expected.returncode == 1
+    assert json.loads(result.stdout.decode()) == json.loads(expected.stdout.decode())
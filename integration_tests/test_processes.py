@@ -0,0 +1,75 @@
+import json
+import subprocess
+
+from flask import Blueprint
+
+from . import util
+
+
+def make_blueprint(link: str) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return f"""
+            <a href="/foo">
+            <a href="{link}">
+        """
+
+    @blueprint.route("/foo")
+    def foo():
+        return """<a href="/bar">\n"""
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(link="http://localhost:5001"), port=5000)
+    http_server(blueprint=make_blueprint(link="http://localhost:5000"), port=5001)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, processes=2),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5000": {
+            "links": [
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        },
+                    ],
+                },
+                {
+                    "href": "http://localhost:5001",
+                    "url": "http://localhost:5001",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        },
+                    ],
+                },
+            ],
+        },
+        "http://localhost:5000/foo": {
+            "links": [
+                {
+                    "href": "/bar",
+                    "url": "http://localhost:5000/bar",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 404,
+                        },
+                    ],
+                },
+            ],
+        },
+    }
@@ -0,0 +1,126 @@
+import json
+import subprocess
+
+import pytest
+from flask import Blueprint, request
+
+from . import util
+
+
+def make_blueprint(requests: list[tuple[str, str]]) -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.before_app_request
+    def log_request():
+        requests.append((request.method, request.path))
+
+    @blueprint.route("/")
+    def root():
+        return """
+            <link rel="stylesheet" href="/style.css">
+            <script src="/script.js"></script>
+            <img src="/nx.png">
+            <a href="/foo">
+        """
+
+    @blueprint.route("/style.css")
+    def style():
+        return ""
+
+    @blueprint.route("/script.js")
+    def script():
+        return ""
+
+    @blueprint.route("/foo")
+    def foo():
+        return ""
+
+    return blueprint
+
+
+def test_text(http_server) -> None:
+    requests: list[tuple[str, str]] = []
+    http_server(blueprint=make_blueprint(requests=requests), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            checks=["link", "image", "stylesheet", "script"],
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == util.output_str(
+        """
+        📂 Results: 4 links (3 ok, 1 failed)
+        └── 📄 http://localhost:5000
+            └── 🔗 /nx.png (image): 404
+        """
+    )
+    assert sorted(requests) == [
+        ("GET", "/"),
+        ("GET", "/foo"),
+        ("HEAD", "/nx.png"),
+        ("HEAD", "/script.js"),
+        ("HEAD", "/style.css"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "checks,expected_links",
+    [
+        (
+            [],
+            [
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+            ],
+        ),
+        (
+            ["script"],
+            [
+                {
+                    "href": "/script.js",
+                    "url": "http://localhost:5000/script.js",
+                    "kind": "script",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+            ],
+        ),
+    ],
+)
+def test_json(http_server, checks, expected_links) -> None:
+    http_server(blueprint=make_blueprint(requests=[]), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", checks=checks, json=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout.decode())["http://localhost:5000"] == {
+        "links": expected_links,
+    }
+
+
+def test_resources_only(http_server) -> None:
+    requests: list[tuple[str, str]] = []
+    http_server(blueprint=make_blueprint(requests=requests), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", checks=["image"]),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    # Links are still followed.
+    assert sorted(requests) == [("GET", "/"), ("GET", "/foo"), ("HEAD", "/nx.png")]
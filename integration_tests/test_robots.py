@@ -0,0 +1,153 @@
+import itertools
+import json
+import subprocess
+import time
+
+from flask import Blueprint, request
+
+from discolinks.__version__ import __version__
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/robots.txt")
+    def robots():
+        return "User-agent: *\nDisallow: /private\nCrawl-delay: 0.5\n"
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/foo"><a href="/private/bar">\n"""
+
+    @blueprint.route("/foo")
+    def foo():
+        return ""
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    start = time.monotonic()
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, robots=True),
+        stdout=subprocess.PIPE,
+    )
+    duration = time.monotonic() - start
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5000": {
+            "links": [
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+                {
+                    "href": "/private/bar",
+                    "url": "http://localhost:5000/private/bar",
+                    "results": [
+                        {"type": "skipped", "reason": "disallowed by robots.txt"},
+                    ],
+                },
+            ],
+        },
+        "http://localhost:5000/foo": {"links": []},
+    }
+    # Two requests (`/` and `/foo`) spaced by the crawl delay.
+    assert duration >= 0.5
+
+
+def test_json_without_robots(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+
+
+def test_crawl_delay_processes(http_server) -> None:
+    times: list[float] = []
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.before_app_request
+    def log_request():
+        if request.path.startswith("/page/"):
+            times.append(time.monotonic())
+
+    @blueprint.route("/robots.txt")
+    def robots():
+        return "User-agent: *\nCrawl-delay: 0.2\n"
+
+    @blueprint.route("/")
+    def root():
+        return "".join(f"""<a href="/page/{index}">""" for index in range(6))
+
+    @blueprint.route("/page/<int:index>")
+    def page(index: int):
+        return ""
+
+    http_server(blueprint=blueprint, port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", robots=True, processes=2),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert len(times) == 6
+    # A single process requests the pages of the host, spaced by the crawl delay.
+    assert min(later - earlier for (earlier, later) in itertools.pairwise(times)) >= 0.18
+
+
+def test_user_agent(http_server) -> None:
+    user_agents: set[tuple[str, str]] = set()
+    blueprint = make_blueprint()
+
+    @blueprint.before_app_request
+    def log_request():
+        user_agents.add((request.path, request.headers.get("User-Agent", "")))
+
+    http_server(blueprint=blueprint, port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", robots=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert {path for (path, _) in user_agents} == {"/robots.txt", "/", "/foo"}
+    assert {agent for (_, agent) in user_agents} == {f"discolinks/{__version__}"}
+
+
+def test_sitemap_disallowed(http_server) -> None:
+    paths: list[str] = []
+    blueprint = make_blueprint()
+
+    @blueprint.before_app_request
+    def log_request():
+        paths.append(request.path)
+
+    http_server(blueprint=blueprint, port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            sitemaps=["/private/sitemap.xml"],
+            sitemap_only=True,
+            json=True,
+            robots=True,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout.decode()) == {}
+    assert "/private/sitemap.xml" not in paths
@@ -0,0 +1,46 @@
+import json
+import subprocess
+
+import pytest
+from flask import Blueprint, abort
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/", defaults={"index": 0})
+    @blueprint.route("/<int:index>")
+    def page(index: int):
+        if index >= 50:
+            abort(404)
+
+        return "".join(f"""<a href="/{index + step}">""" for step in (1, 2, 3))
+
+    return blueprint
+
+
+@pytest.mark.parametrize("bloom", [False, True])
+def test_compact_seen_urls(http_server, bloom: bool) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    expected = subprocess.run(
+        util.command(url="http://localhost:5000", json=True),
+        stdout=subprocess.PIPE,
+    )
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            compact_seen_urls=True,
+            seen_urls_error_rate=1e-3,
+            seen_urls_bloom_filter=bloom,
+        ),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == expected.returncode == 1
+    assert json.loads(result.stdout.decode()) == json.loads(expected.stdout.decode())
+    assert "Seen URLs: 53 fingerprints of" in result.stderr.decode()
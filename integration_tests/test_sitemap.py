@@ -0,0 +1,207 @@
+import gzip
+import json
+import subprocess
+
+from flask import Blueprint, redirect
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/foo">\n"""
+
+    @blueprint.route("/foo")
+    def foo():
+        return """<a href="/">\n"""
+
+    @blueprint.route("/bar")
+    def bar():
+        return """<a href="/nx">\n"""
+
+    @blueprint.route("/sitemap.xml")
+    def sitemap():
+        return """<?xml version="1.0" encoding="UTF-8"?>
+            <sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+                <sitemap><loc>http://localhost:5000/pages.xml.gz</loc></sitemap>
+            </sitemapindex>
+        """
+
+    @blueprint.route("/old-sitemap.xml")
+    def old_sitemap():
+        return redirect("/sitemap.xml")
+
+    @blueprint.route("/pages.xml.gz")
+    def pages():
+        return gzip.compress(
+            b"""<?xml version="1.0" encoding="UTF-8"?>
+            <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+                <url><loc>http://localhost:5000/foo</loc></url>
+                <url><loc>http://localhost:5000/bar</loc></url>
+            </urlset>
+            """
+        )
+
+    return blueprint
+
+
+SITEMAPS = {
+    "http://localhost:5000/sitemap.xml": {
+        "links": [
+            {
+                "href": "http://localhost:5000/pages.xml.gz",
+                "url": "http://localhost:5000/pages.xml.gz",
+                "results": [
+                    {
+                        "type": "response",
+                        "status_code": 200,
+                    },
+                ],
+            },
+        ],
+    },
+    "http://localhost:5000/pages.xml.gz": {
+        "links": [
+            {
+                "href": "http://localhost:5000/foo",
+                "url": "http://localhost:5000/foo",
+                "results": [
+                    {
+                        "type": "response",
+                        "status_code": 200,
+                    },
+                ],
+            },
+            {
+                "href": "http://localhost:5000/bar",
+                "url": "http://localhost:5000/bar",
+                "results": [
+                    {
+                        "type": "response",
+                        "status_code": 200,
+                    },
+                ],
+            },
+        ],
+    },
+}
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", sitemaps=["/sitemap.xml"], json=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5000": {
+            "links": [
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        },
+                    ],
+                },
+            ],
+        },
+        **SITEMAPS,
+        "http://localhost:5000/foo": {
+            "links": [
+                {
+                    "href": "/",
+                    "url": "http://localhost:5000/",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        },
+                    ],
+                },
+            ],
+        },
+        "http://localhost:5000/bar": {
+            "links": [
+                {
+                    "href": "/nx",
+                    "url": "http://localhost:5000/nx",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 404,
+                        },
+                    ],
+                },
+            ],
+        },
+        "http://localhost:5000/": {
+            "links": [
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [
+                        {
+                            "type": "response",
+                            "status_code": 200,
+                        },
+                    ],
+                },
+            ],
+        },
+    }
+
+
+def test_json_sitemap_only(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            sitemaps=["/sitemap.xml"],
+            sitemap_only=True,
+            json=True,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout.decode()) == SITEMAPS
+
+
+def test_json_sitemap_redirect(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            sitemaps=["/old-sitemap.xml"],
+            sitemap_only=True,
+            json=True,
+        ),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout.decode()) == SITEMAPS
+
+
+def test_sitemap_only_without_sitemap(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", sitemap_only=True, json=True),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 2
+    assert result.stdout.decode() == ""
@@ -0,0 +1,78 @@
+import json
+import subprocess
+
+from flask import Blueprint, redirect
+
+from . import util
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        return """<a href="/a"><a href="/b"><a href="/moved">\n"""
+
+    @blueprint.route("/a")
+    def a():
+        return """<a href="/missing">\n"""
+
+    @blueprint.route("/b")
+    def b():
+        return """<a href="/">\n"""
+
+    @blueprint.route("/moved")
+    def moved():
+        return redirect("/b")
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, stream=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout.decode()) == json.loads(
+        subprocess.run(
+            util.command(url="http://localhost:5000", json=True),
+            stdout=subprocess.PIPE,
+        ).stdout.decode()
+    )
+
+
+def test_text(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", stream=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 1
+    assert result.stdout.decode() == util.output_str(
+        """
+        📄 http://localhost:5000/a
+            🔗 /missing: 404
+        📂 Results: 8 links (7 ok, 1 failed)
+        """
+    )
+
+
+def test_stream_duplicates_json() -> None:
+    result = subprocess.run(
+        util.command(
+            url="http://localhost:5000",
+            json=True,
+            stream=True,
+            report_duplicates=True,
+        ),
+        stderr=subprocess.PIPE,
+    )
+
+    assert result.returncode == 2
+    assert "--report-duplicates" in result.stderr.decode()
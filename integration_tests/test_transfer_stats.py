@@ -0,0 +1,77 @@
+import gzip
+import json
+import subprocess
+
+from flask import Blueprint, Response, request
+
+from . import util
+
+ROOT_BODY = """<a href="/foo">\n""" + " " * 2000
+FOO_BODY = "foo"
+
+
+def make_blueprint() -> Blueprint:
+    blueprint = Blueprint("main", __name__)
+
+    @blueprint.route("/")
+    def root():
+        if "gzip" not in request.headers.get("Accept-Encoding", ""):
+            return ROOT_BODY
+
+        return Response(
+            gzip.compress(ROOT_BODY.encode(), mtime=0),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @blueprint.route("/foo")
+    def foo():
+        return FOO_BODY
+
+    return blueprint
+
+
+def test_json(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", json=True, transfer_stats=True),
+        stdout=subprocess.PIPE,
+    )
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout.decode()) == {
+        "http://localhost:5000": {
+            "links": [
+                {
+                    "href": "/foo",
+                    "url": "http://localhost:5000/foo",
+                    "results": [{"type": "response", "status_code": 200}],
+                },
+            ],
+            "transfer": {
+                "wire_bytes": len(gzip.compress(ROOT_BODY.encode(), mtime=0)),
+                "decoded_bytes": len(ROOT_BODY),
+            },
+        },
+        "http://localhost:5000/foo": {
+            "links": [],
+            "transfer": {"wire_bytes": 3, "decoded_bytes": 3},
+        },
+    }
+
+
+def test_text(http_server) -> None:
+    http_server(blueprint=make_blueprint(), port=5000)
+
+    result = subprocess.run(
+        util.command(url="http://localhost:5000", transfer_stats=True),
+        stdout=subprocess.PIPE,
+    )
+
+    wire_bytes = len(gzip.compress(ROOT_BODY.encode(), mtime=0)) + len(FOO_BODY)
+    assert result.returncode == 0
+    assert result.stdout.decode() == util.output_str(
+        f"""
+        📂 Results: 1 links (1 ok, 0 failed), {wire_bytes} B transferred (2.0 kB decoded)
+        """
+    )
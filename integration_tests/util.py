@@ -8,11 +8,45 @@ def output_str(s: str) -> str:
 
 
 def command(
-    url: str,
+    url: Optional[str] = None,
+    urls: Sequence[str] = (),
+    urls_from: Optional[str] = None,
     verbose: Optional[bool] = None,
     json: Optional[bool] = None,
+    transfer_stats: Optional[bool] = None,
+    report_duplicates: Optional[bool] = None,
+    stream: Optional[bool] = None,
+    junit: Optional[str] = None,
+    sarif: Optional[str] = None,
     exclude: Sequence[str] = (),
+    checks: Sequence[str] = (),
+    canonicalize: Sequence[str] = (),
     max_parallel_requests: Optional[int] = None,
+    adaptive_concurrency: Optional[bool] = None,
+    processes: Optional[int] = None,
+    parse_threads: Optional[int] = None,
+    max_redirects: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    path_budgets: Sequence[str] = (),
+    cache: Optional[str] = None,
+    cache_failure_ttl: Optional[int] = None,
+    robots: Optional[bool] = None,
+    sitemaps: Sequence[str] = (),
+    sitemap_only: Optional[bool] = None,
+    index: Optional[str] = None,
+    changed: Sequence[str] = (),
+    changed_from: Optional[str] = None,
+    root: Optional[str] = None,
+    base_url: Optional[str] = None,
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+    replay_latency: Optional[bool] = None,
+    compact_seen_urls: Optional[bool] = None,
+    seen_urls_error_rate: Optional[float] = None,
+    seen_urls_bloom_filter: Optional[bool] = None,
+    uvloop: Optional[bool] = None,
+    stall_threshold: Optional[float] = None,
 ) -> Sequence[str]:
     """
     Generate command-line strings based on function parameters.
@@ -29,12 +63,115 @@ def command(
     if json:
         cli += ["--json"]
 
+    if transfer_stats:
+        cli += ["--transfer-stats"]
+
+    if report_duplicates:
+        cli += ["--report-duplicates"]
+
+    if stream:
+        cli += ["--stream"]
+
+    if junit is not None:
+        cli += ["--junit", junit]
+
+    if sarif is not None:
+        cli += ["--sarif", sarif]
+
     for s in exclude:
         cli += ["--exclude", s]
 
+    for s in checks:
+        cli += ["--check", s]
+
+    for s in canonicalize:
+        cli += ["--canonicalize", s]
+
     if max_parallel_requests is not None:
         cli += ["--max-parallel-requests", str(max_parallel_requests)]
 
-    cli += ["--url", url]
+    if adaptive_concurrency:
+        cli += ["--adaptive-concurrency"]
+
+    if processes is not None:
+        cli += ["--processes", str(processes)]
+
+    if parse_threads is not None:
+        cli += ["--parse-threads", str(parse_threads)]
+
+    if max_redirects is not None:
+        cli += ["--max-redirects", str(max_redirects)]
+
+    if max_depth is not None:
+        cli += ["--max-depth", str(max_depth)]
+
+    if max_pages is not None:
+        cli += ["--max-pages", str(max_pages)]
+
+    for s in path_budgets:
+        cli += ["--path-budget", s]
+
+    if cache is not None:
+        cli += ["--cache", cache]
+
+    if cache_failure_ttl is not None:
+        cli += ["--cache-failure-ttl", str(cache_failure_ttl)]
+
+    if robots:
+        cli += ["--robots"]
+
+    for s in sitemaps:
+        cli += ["--sitemap", s]
+
+    if sitemap_only:
+        cli += ["--sitemap-only"]
+
+    if url is not None:
+        cli += ["--url", url]
+
+    for s in urls:
+        cli += ["--url", s]
+
+    if urls_from is not None:
+        cli += ["--urls-from", urls_from]
+
+    if index is not None:
+        cli += ["--index", index]
+
+    for s in changed:
+        cli += ["--changed", s]
+
+    if changed_from is not None:
+        cli += ["--changed-from", changed_from]
+
+    if root is not None:
+        cli += ["--root", root]
+
+    if base_url is not None:
+        cli += ["--base-url", base_url]
+
+    if record is not None:
+        cli += ["--record", record]
+
+    if replay is not None:
+        cli += ["--replay", replay]
+
+    if replay_latency:
+        cli += ["--replay-latency"]
+
+    if compact_seen_urls:
+        cli += ["--compact-seen-urls"]
+
+    if seen_urls_error_rate is not None:
+        cli += ["--seen-urls-error-rate", str(seen_urls_error_rate)]
+
+    if seen_urls_bloom_filter:
+        cli += ["--seen-urls-bloom-filter"]
+
+    if uvloop:
+        cli += ["--uvloop"]
+
+    if stall_threshold is not None:
+        cli += ["--stall-threshold", str(stall_threshold)]
 
     return cli
@@ -0,0 +1,16 @@
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .crawler import CrawlConfig, PageResult, StartError, crawl
+
+__all__ = ["CrawlConfig", "PageResult", "StartError", "crawl"]
+
+
+def __getattr__(name: str) -> Any:
+    # The API is imported on first use so that the command line doesn't pay for it.
+    if name in __all__:
+        from . import crawler
+
+        return getattr(crawler, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
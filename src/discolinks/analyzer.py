@@ -1,8 +1,10 @@
-from dataclasses import dataclass
-from typing import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import AbstractSet, Mapping, Optional, Sequence
+from urllib.parse import urldefrag
 
 from . import outcome
-from .core import Url
+from .core import Link, LinkKind, Transfer, Url
+from .html import has_anchor
 from .url_store import UrlInfo
 
 
@@ -10,32 +12,46 @@ from .url_store import UrlInfo
 class LinkResult:
     href: str
     url: Url
+    kind: LinkKind
     results: outcome.Results
 
     def ok(self) -> bool:
         return self.results.ok()
 
+    def skipped(self) -> bool:
+        return self.results.skipped()
+
 
 @dataclass(frozen=True)
 class Page:
     links: Sequence[LinkResult]
+    transfer: Optional[Transfer] = None
 
 
 def make_chain(
     url_infos: Mapping[Url, UrlInfo],
     start_url: Url,
+    fragment: Optional[str] = None,
 ) -> Sequence[outcome.Result]:
     """
     Build and return a redirect chain of URL results.
 
     Starting with a given URL, this follows redirects to determine the path leading to a
     web page, a connection error or a cancellation.
+
+    If a fragment is given, it is looked up in the anchors of the final page, if known.
     """
 
     url = start_url
     chain: list[outcome.Result] = []
+    visited: set[Url] = set()
 
     while True:
+        if url in visited:
+            chain.append(outcome.RequestError(msg="Redirect loop"))
+            break
+
+        visited.add(url)
         info = url_infos.get(url)
 
         if info is None:
@@ -47,6 +63,12 @@ def make_chain(
         redirect_url = result.redirect_url()
 
         if redirect_url is None:
+            if (
+                fragment
+                and info.anchors is not None
+                and not has_anchor(info.anchors, fragment)
+            ):
+                chain.append(outcome.MissingFragment(fragment=fragment))
             break
         else:
             url = redirect_url
@@ -58,13 +80,19 @@ def make_chain(
 class Stats:
     ok: int = 0
     failed: int = 0
+    # Links which weren't checked because of crawl limits.
+    skipped: int = 0
+    # Bytes downloaded during the crawl, including pages without links (e.g. redirects).
+    transfer: Transfer = field(default_factory=Transfer)
 
     @property
     def total(self) -> int:
-        return self.ok + self.failed
+        return self.ok + self.failed + self.skipped
 
-    def add(self, ok: bool) -> None:
-        if ok:
+    def add(self, link: LinkResult) -> None:
+        if link.skipped():
+            self.skipped += 1
+        elif link.ok():
             self.ok += 1
         else:
             self.failed += 1
@@ -74,36 +102,154 @@ class Stats:
 class Analysis:
     stats: Stats
     pages: Mapping[Url, Page]
+    # Groups of pages with identical bodies, sorted by URL.
+    duplicates: Sequence[Sequence[Url]] = ()
+    # Bytes downloaded for each website, keyed by network location (see
+    # `site_transfers`).
+    transfers: Mapping[str, Transfer] = field(default_factory=dict)
 
     def ok(self) -> bool:
         return self.stats.failed == 0
 
 
-def analyze(url_infos: Mapping[Url, UrlInfo]) -> Analysis:
+def find_duplicates(url_infos: Mapping[Url, UrlInfo]) -> Sequence[Sequence[Url]]:
     """
-    Analyze URL data obtained from web scraping.
+    Group the URLs of pages whose bodies are identical.
     """
 
-    pages = {}
-    stats = Stats()
+    groups: dict[str, list[Url]] = {}
 
     for url, info in url_infos.items():
-        if info.links is None:
-            continue
+        if info.digest is not None:
+            groups.setdefault(info.digest, []).append(url)
 
-        links = []
+    return sorted(
+        (sorted(group, key=str) for group in groups.values() if len(group) > 1),
+        key=lambda group: str(group[0]),
+    )
 
-        for link in info.links:
-            result = LinkResult(
+
+def analyze_page(
+    url_infos: Mapping[Url, UrlInfo],
+    links: Sequence[Link],
+    transfer: Optional[Transfer] = None,
+) -> Page:
+    """
+    Determine the results of the links of a page.
+    """
+
+    return Page(
+        links=[
+            LinkResult(
                 href=link.href,
                 url=link.url,
+                kind=link.kind,
                 results=outcome.Results(
-                    chain=make_chain(url_infos=url_infos, start_url=link.url)
+                    chain=make_chain(
+                        url_infos=url_infos,
+                        start_url=link.url,
+                        fragment=urldefrag(link.href).fragment,
+                    )
                 ),
             )
-            stats.add(ok=result.ok())
-            links.append(result)
+            for link in links
+        ],
+        transfer=transfer,
+    )
+
+
+def site_transfers(
+    url_infos: Mapping[Url, UrlInfo],
+    pages: Mapping[Url, Page],
+) -> Mapping[str, Transfer]:
+    """
+    Sum the bytes downloaded for each website of the given pages, keyed by network
+    location.
+
+    URLs of other hosts (e.g. external links) are counted for the first website linking
+    to them, or redirecting to them, so that the totals add up to the whole crawl.
+    """
+
+    sites = {url.netloc for url in pages}
+    owners: dict[Url, str] = {}
+
+    for page_url, page in pages.items():
+        for link in page.links:
+            url: Optional[Url] = link.url
+
+            while url is not None and url.netloc not in sites and url not in owners:
+                owners[url] = page_url.netloc
+                info = url_infos.get(url)
+                url = None if info is None else info.result.redirect_url()
+
+    transfers: dict[str, Transfer] = {}
+
+    for url, info in url_infos.items():
+        if info.transfer is not None:
+            site = owners.get(url, url.netloc)
+            transfers[site] = transfers.get(site, Transfer()) + info.transfer
+
+    return transfers
+
+
+def analyze(
+    url_infos: Mapping[Url, UrlInfo],
+    pages: Optional[AbstractSet[Url]] = None,
+) -> Analysis:
+    """
+    Analyze URL data obtained from web scraping.
+
+    If `pages` is given, only those pages are analyzed.
+    """
+
+    analyzed = {}
+    stats = Stats()
+
+    for url, info in url_infos.items():
+        if info.transfer is not None:
+            stats.transfer += info.transfer
+
+        if info.links is None or (pages is not None and url not in pages):
+            continue
+
+        page = analyze_page(url_infos, links=info.links, transfer=info.transfer)
+
+        for link in page.links:
+            stats.add(link)
+
+        analyzed[url] = page
+
+    return Analysis(
+        pages=analyzed,
+        stats=stats,
+        duplicates=find_duplicates(url_infos),
+        transfers=site_transfers(url_infos, pages=analyzed),
+    )
+
+
+def split_by_site(analysis: Analysis) -> Mapping[str, Analysis]:
+    """
+    Split an analysis into one analysis per website, keyed by network location.
+
+    The transfers of all websites add up to that of the whole analysis, including hosts
+    downloaded from without any page to analyze (e.g. a start URL redirecting elsewhere).
+    """
+
+    pages: dict[str, dict[Url, Page]] = {}
+    stats: dict[str, Stats] = {}
+
+    for url, page in analysis.pages.items():
+        pages.setdefault(url.netloc, {})[url] = page
+        site_stats = stats.setdefault(url.netloc, Stats())
+
+        for link in page.links:
+            site_stats.add(link)
 
-        pages[url] = Page(links=links)
+    for site, transfer in analysis.transfers.items():
+        pages.setdefault(site, {})
+        stats.setdefault(site, Stats()).transfer = transfer
 
-    return Analysis(pages=pages, stats=stats)
+    return {
+        site: Analysis(stats=stats[site], pages=site_pages)
+        for (site, site_pages) in pages.items()
+    }
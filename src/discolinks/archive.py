@@ -0,0 +1,199 @@
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Mapping, Sequence
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArchiveConfig:
+    """
+    Archive of HTTP exchanges to record to, or to replay from instead of the network.
+
+    This is sent to worker processes so it must be picklable.
+    """
+
+    path: Path
+    replay: bool
+    # Whether replayed responses take as long as they originally did.
+    latency: bool = False
+
+
+@dataclass(frozen=True)
+class Exchange:
+    """
+    HTTP request and its response, with the body as it was sent over the network (e.g.
+    still compressed).
+    """
+
+    method: str
+    url: str
+    status_code: int
+    headers: Sequence[tuple[str, str]]
+    body: bytes
+    # Time in seconds between the request and the end of the response.
+    elapsed: float
+
+    def to_json(self) -> Any:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "status_code": self.status_code,
+            "headers": [list(header) for header in self.headers],
+            "body": base64.b64encode(self.body).decode(),
+            "elapsed": self.elapsed,
+        }
+
+    @classmethod
+    def from_json(cls, obj: Any) -> "Exchange":
+        return cls(
+            method=obj["method"],
+            url=obj["url"],
+            status_code=obj["status_code"],
+            headers=[(name, value) for (name, value) in obj["headers"]],
+            body=base64.b64decode(obj["body"]),
+            elapsed=obj["elapsed"],
+        )
+
+
+def read_archive(path: Path) -> Iterator[Exchange]:
+    """
+    Read the exchanges of an archive.
+
+    The last exchange is skipped if it is incomplete, which happens when recording is
+    interrupted while writing it (e.g. killed or with a full disk).
+    """
+
+    count = 0
+
+    # Each exchange is a separate gzip member, which `gzip` reads as a single stream.
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                yield Exchange.from_json(json.loads(line))
+                count += 1
+        except (EOFError, gzip.BadGzipFile) as error:
+            # A member cut in its first bytes doesn't look like gzip, but neither does a
+            # file which isn't an archive.
+            if isinstance(error, gzip.BadGzipFile) and count == 0:
+                raise
+
+            logger.warning("%s: Skipped the last exchange, which is incomplete", path)
+
+
+@dataclass(frozen=True)
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport for `httpx` which records the exchanges made with another transport.
+
+    Exchanges are appended to the archive as soon as they complete, each compressed on
+    its own like in WARC files, so that an interrupted crawl leaves a usable archive.
+    """
+
+    transport: httpx.AsyncBaseTransport
+    file: BinaryIO
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        response = await self.transport.handle_async_request(request)
+        # Read the stream directly: responses built with their content (e.g. read from
+        # files) are already marked as read.
+        stream = response.stream
+        assert isinstance(stream, httpx.AsyncByteStream)
+
+        try:
+            body = b"".join([chunk async for chunk in stream])
+        finally:
+            await stream.aclose()
+
+        exchange = Exchange(
+            method=request.method,
+            url=str(request.url),
+            status_code=response.status_code,
+            headers=response.headers.multi_items(),
+            body=body,
+            elapsed=time.monotonic() - start,
+        )
+        line = f"{json.dumps(exchange.to_json())}\n"
+        self.file.write(gzip.compress(line.encode()))
+        self.file.flush()
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        self.file.close()
+        await self.transport.aclose()
+
+
+@dataclass(frozen=True)
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transport for `httpx` which answers requests with the responses of an archive,
+    without any network access.
+
+    Requests made several times get the recorded responses in order, the last one being
+    repeated if needed. Requests missing from the archive fail like connection errors.
+    """
+
+    exchanges: Mapping[tuple[str, str], Sequence[Exchange]]
+    latency: bool = False
+    # Number of times each request was replayed.
+    counts: dict[tuple[str, str], int] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, latency: bool = False) -> "ReplayTransport":
+        exchanges: dict[tuple[str, str], list[Exchange]] = {}
+
+        for exchange in read_archive(path):
+            key = (exchange.method, exchange.url)
+            exchanges.setdefault(key, []).append(exchange)
+
+        logger.debug("Loaded %d requests from %s", len(exchanges), path)
+        return cls(exchanges=exchanges, latency=latency)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = (request.method, str(request.url))
+        exchanges = self.exchanges.get(key)
+
+        if not exchanges:
+            raise httpx.ConnectError("Not in archive", request=request)
+
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        exchange = exchanges[min(count, len(exchanges) - 1)]
+
+        if self.latency:
+            await asyncio.sleep(exchange.elapsed)
+
+        return httpx.Response(
+            status_code=exchange.status_code,
+            headers=exchange.headers,
+            content=exchange.body,
+            request=request,
+        )
+
+
+def archive_transport(
+    config: ArchiveConfig,
+    transport: httpx.AsyncBaseTransport,
+) -> httpx.AsyncBaseTransport:
+    """
+    Wrap a transport to record its exchanges, or replace it with an archive.
+    """
+
+    if config.replay:
+        return ReplayTransport.load(config.path, latency=config.latency)
+
+    return RecordingTransport(transport=transport, file=config.path.open("ab"))
@@ -0,0 +1,99 @@
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from . import outcome
+from .core import Url
+from .export import result_from_json, result_to_json
+
+logger = logging.getLogger(__name__)
+
+# Number of stored results after which they are committed to disk.
+COMMIT_INTERVAL = 100
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """
+    Location and time-to-live (in seconds) of cached results.
+
+    Failures typically have a shorter TTL than successes since they are more likely to be
+    transient.
+    """
+
+    path: Path
+    success_ttl: float
+    failure_ttl: float
+
+
+@dataclass
+class ResultCache:
+    """
+    Persistent cache of the results of URLs, shared across runs.
+
+    Use `ResultCache.open` to create an instance and `close` to write pending results.
+    """
+
+    config: CacheConfig
+    connection: sqlite3.Connection
+    uncommitted: int = field(init=False, default=0)
+
+    @classmethod
+    def open(cls, config: CacheConfig) -> "ResultCache":
+        connection = sqlite3.connect(config.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                ok INTEGER NOT NULL,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        connection.commit()
+        return cls(config=config, connection=connection)
+
+    def get(self, url: Url) -> Optional[outcome.Result]:
+        """
+        Return the result stored for a URL unless it has expired.
+        """
+
+        row = self.connection.execute(
+            "SELECT result, ok, stored_at FROM results WHERE url = ?",
+            (url.full,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        (result, ok, stored_at) = row
+        ttl = self.config.success_ttl if ok else self.config.failure_ttl
+
+        if time.time() - stored_at > ttl:
+            return None
+
+        return result_from_json(json.loads(result))
+
+    def put(self, url: Url, result: outcome.Result) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (url.full, json.dumps(result_to_json(result)), result.ok(), time.time()),
+        )
+        self.uncommitted += 1
+
+        if self.uncommitted >= COMMIT_INTERVAL:
+            self.commit()
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self.uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
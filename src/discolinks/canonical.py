@@ -0,0 +1,127 @@
+import enum
+import re
+from dataclasses import dataclass
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters used by analytics and advertising services to track visitors, which
+# don't change the content of pages. Names ending with `_` are prefixes.
+TRACKING_PARAMS = frozenset(
+    [
+        "utm_",
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "mc_cid",
+        "mc_eid",
+        "_ga",
+        "_gl",
+    ]
+)
+
+UNRESERVED = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~"
+)
+
+PERCENT_ENCODED = re.compile("%([0-9A-Fa-f]{2})")
+
+
+class Rule(enum.Enum):
+    """
+    Transformation applied to URLs so that equivalent URLs are only fetched once.
+    """
+
+    LOWERCASE_HOST = "lowercase-host"
+    DEFAULT_PORT = "default-port"
+    PERCENT_ENCODING = "percent-encoding"
+    TRACKING_PARAMS = "tracking-params"
+    SORT_QUERY = "sort-query"
+    TRAILING_SLASH = "trailing-slash"
+    LOWERCASE_PATH = "lowercase-path"
+
+
+# Rules which can't change the resource a URL refers to, according to RFC 3986.
+SAFE_RULES = frozenset([Rule.LOWERCASE_HOST, Rule.DEFAULT_PORT, Rule.PERCENT_ENCODING])
+
+
+def normalize_percent_encoding(value: str) -> str:
+    """
+    Decode percent-encoded unreserved characters and use uppercase hexadecimal digits in
+    the other ones (e.g. `%7efoo%2f` → `~foo%2F`).
+    """
+
+    def replace(match: re.Match[str]) -> str:
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED else match.group(0).upper()
+
+    return PERCENT_ENCODED.sub(replace, value)
+
+
+def is_tracking_param(param: str) -> bool:
+    name = unquote(param.partition("=")[0]).lower()
+    return any(
+        name.startswith(tracking) if tracking.endswith("_") else name == tracking
+        for tracking in TRACKING_PARAMS
+    )
+
+
+@dataclass(frozen=True)
+class Canonicalizer:
+    """
+    Rewrite URLs into a canonical form according to a set of rules.
+
+    Only some of the rules are guaranteed to preserve the meaning of URLs: the others
+    rely on common conventions (e.g. `/foo` and `/foo/` being the same page), so they
+    are opt-in.
+    """
+
+    rules: frozenset[Rule] = SAFE_RULES
+
+    def canonicalize(self, url: str) -> str:
+        if not self.rules:
+            return url
+
+        parts = urlsplit(url)
+        netloc = parts.netloc
+        path = parts.path
+        query = parts.query
+
+        if Rule.LOWERCASE_HOST in self.rules:
+            (userinfo, at, host) = netloc.rpartition("@")
+            netloc = f"{userinfo}{at}{host.lower()}"
+
+        try:
+            port = parts.port
+        except ValueError:  # Invalid port, left as is.
+            port = None
+
+        if Rule.DEFAULT_PORT in self.rules and port is not None:
+            if DEFAULT_PORTS.get(parts.scheme) == port:
+                netloc = netloc.rpartition(":")[0]
+
+        if Rule.LOWERCASE_PATH in self.rules:
+            path = path.lower()
+
+        if Rule.PERCENT_ENCODING in self.rules:
+            path = normalize_percent_encoding(path)
+            query = normalize_percent_encoding(query)
+
+        if Rule.TRAILING_SLASH in self.rules and len(path) > 1:
+            path = path.rstrip("/") or "/"
+
+        if query and self.rules & {Rule.TRACKING_PARAMS, Rule.SORT_QUERY}:
+            params = query.split("&")
+
+            if Rule.TRACKING_PARAMS in self.rules:
+                params = [param for param in params if not is_tracking_param(param)]
+
+            if Rule.SORT_QUERY in self.rules:
+                # Stable sort, so that repeated parameters keep their relative order.
+                params.sort(key=lambda param: param.partition("=")[0])
+
+            query = "&".join(params)
+
+        return urlunsplit((parts.scheme, netloc, path, query, parts.fragment))
@@ -0,0 +1,167 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Sequence, TextIO
+from xml.sax.saxutils import quoteattr
+
+from . import outcome
+from .__version__ import __version__
+from .analyzer import LinkResult, Page, Stats
+from .core import Url
+from .report import PageWriter
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# SARIF rules, in the order of their indexes.
+SARIF_RULES = [
+    {
+        "id": "broken-link",
+        "shortDescription": {"text": "Link to a URL which can't be retrieved."},
+    },
+    {
+        "id": "missing-fragment",
+        "shortDescription": {"text": "Link to an anchor missing from its page."},
+    },
+]
+
+
+@dataclass(frozen=True)
+class Converter(outcome.Converter[str]):
+    def convert_page(self, page: outcome.Page) -> str:
+        return str(page.code)
+
+    def convert_redirect(self, redirect: outcome.Redirect) -> str:
+        return str(redirect.code)
+
+    def convert_request_error(self, error: outcome.RequestError) -> str:
+        return error.msg
+
+    def convert_excluded(self, excluded: outcome.Excluded) -> str:
+        return "excluded"
+
+    def convert_unknown(self, unknown: outcome.Unknown) -> str:
+        raise AssertionError("`Unknown` result isn't supposed to be shown")
+
+    def convert_missing_fragment(self, missing: outcome.MissingFragment) -> str:
+        return f"#{missing.fragment} not found"
+
+    def convert_skipped(self, skipped: outcome.Skipped) -> str:
+        return f"skipped ({skipped.reason})"
+
+
+def link_message(link: LinkResult) -> str:
+    return " → ".join(link.results.convert_with(Converter()))
+
+
+@dataclass
+class JunitWriter(PageWriter):
+    """
+    Write results as JUnit XML: one test suite per page, with a test case per link.
+    """
+
+    stream: TextIO
+    started: bool = False
+
+    def start(self) -> None:
+        if not self.started:
+            self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            self.stream.write('<testsuites name="discolinks">\n')
+            self.started = True
+
+    def write_pages(self, pages: Sequence[tuple[Url, Page]]) -> None:
+        self.start()
+
+        for url, page in pages:
+            name = quoteattr(url.full)
+            failures = sum(1 for link in page.links if not link.ok())
+            skipped = sum(1 for link in page.links if link.skipped())
+            self.stream.write(
+                f'  <testsuite name={name} tests="{len(page.links)}"'
+                f' failures="{failures}" skipped="{skipped}">\n'
+            )
+
+            for link in page.links:
+                self.stream.write(
+                    f"    <testcase classname={name} name={quoteattr(link.href)}"
+                )
+
+                if link.ok() and not link.skipped():
+                    self.stream.write(" />\n")
+                    continue
+
+                tag = "skipped" if link.skipped() else "failure"
+                self.stream.write(
+                    f">\n      <{tag} message={quoteattr(link_message(link))} />\n"
+                    "    </testcase>\n"
+                )
+
+            self.stream.write("  </testsuite>\n")
+
+        self.stream.flush()
+
+    def finish(self, stats: Stats, duplicates: Sequence[Sequence[Url]]) -> None:
+        self.start()
+        self.stream.write("</testsuites>\n")
+        self.stream.flush()
+
+
+def sarif_result(url: Url, link: LinkResult) -> dict[str, Any]:
+    rule_index = 1 if isinstance(link.results.chain[-1], outcome.MissingFragment) else 0
+    return {
+        "ruleId": SARIF_RULES[rule_index]["id"],
+        "ruleIndex": rule_index,
+        "level": "error",
+        "message": {"text": f"{link.href}: {link_message(link)}"},
+        "locations": [{"physicalLocation": {"artifactLocation": {"uri": url.full}}}],
+        "properties": {"url": link.url.full, "kind": link.kind.value},
+    }
+
+
+@dataclass
+class SarifWriter(PageWriter):
+    """
+    Write broken links as a SARIF log, with the pages they were found on as locations.
+    """
+
+    stream: TextIO
+    started: bool = False
+    # Whether a result was written, which must be followed by a comma.
+    separate: bool = False
+
+    def start(self) -> None:
+        if self.started:
+            return
+
+        tool = {
+            "driver": {
+                "name": "discolinks",
+                "version": __version__,
+                "informationUri": "https://github.com/bbc2/discolinks",
+                "rules": SARIF_RULES,
+            }
+        }
+        self.stream.write(
+            f'{{"version": "2.1.0", "$schema": {json.dumps(SARIF_SCHEMA)},'
+            f' "runs": [{{"tool": {json.dumps(tool)}, "results": ['
+        )
+        self.started = True
+
+    def write_pages(self, pages: Sequence[tuple[Url, Page]]) -> None:
+        self.start()
+
+        for url, page in pages:
+            for link in page.links:
+                if link.ok():
+                    continue
+
+                if self.separate:
+                    self.stream.write(", ")
+
+                self.stream.write(json.dumps(sarif_result(url, link)))
+                self.separate = True
+
+        self.stream.flush()
+
+    def finish(self, stats: Stats, duplicates: Sequence[Sequence[Url]]) -> None:
+        self.start()
+        self.stream.write("]}]}\n")
+        self.stream.flush()
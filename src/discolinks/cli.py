@@ -1,23 +1,24 @@
-import asyncio
-import functools
 import logging
-import signal
-from typing import Optional
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, TextIO
 from urllib.parse import urldefrag, urlparse
 
 import click
-import rich.console
-import rich.markup
-from rich.logging import RichHandler
-
-from . import analyzer, export, text
-from .core import Url
-from .excluder import Excluder, ExcluderRegexError
-from .link_extractor import get_links
-from .monitor import Monitor, new_monitor
-from .requester import Requester
-from .url_store import UrlInfo, UrlStore
-from .worker import work
+
+from .canonical import SAFE_RULES, Canonicalizer, Rule
+from .core import LinkKind, Url
+
+# Other modules are imported where they are needed, so that the command starts quickly
+# for `--help`, `--version` and usage errors (see `tests/test_import_time.py`).
+if TYPE_CHECKING:
+    from .archive import ArchiveConfig
+    from .cache import ResultCache
+    from .excluder import Excluder
+    from .files import FileSite
+    from .index import LinkIndex
+    from .monitor import Monitor
+    from .url_store import UrlStore
 
 logger = logging.getLogger(__name__)
 
@@ -43,94 +44,207 @@ def parse_url_arg(url: str) -> Optional[Url]:
     return Url.from_str(url)
 
 
-async def find_links(
-    max_parallel_requests: int,
-    requester: Requester,
-    url_store: UrlStore,
-    monitor: Monitor,
-    start_url: Url,
-    first_urls: frozenset[Url],
-) -> None:
-    queue: asyncio.Queue[Url] = asyncio.Queue()
-
-    for url in first_urls:
-        queue.put_nowait(url)
+def parse_path_budget(value: str) -> tuple[str, int]:
+    """
+    Parse a path budget like `/calendar/=100`.
+    """
 
-    workers: list[asyncio.Task] = []
+    (prefix, _, count) = value.rpartition("=")
 
-    for _ in range(max_parallel_requests):
-        worker = asyncio.create_task(
-            work(
-                queue=queue,
-                requester=requester,
-                url_store=url_store,
-                monitor=monitor,
-                start_url=start_url,
-            ),
+    if not prefix.startswith("/") or not count.isdigit():
+        raise click.BadParameter(
+            f"Expected PREFIX=COUNT with an absolute path, got `{value}`.",
+            param_hint="--path-budget",
         )
-        workers.append(worker)
-
-    # Wait for queue processing to finish, or for any worker to finish (which only happens
-    # if that worker raised an exception).
-    queue_task = asyncio.create_task(queue.join())
-    await asyncio.wait([queue_task, *workers], return_when=asyncio.FIRST_COMPLETED)
 
-    for worker in workers:
-        worker.cancel()
-
-    try:
-        await asyncio.gather(*workers)  # ← worker exceptions raised here
-    except asyncio.CancelledError:
-        pass
+    return (prefix, int(count))
 
 
 async def main_async(
+    processes: int,
     max_parallel_requests: int,
-    url_store: UrlStore,
-    monitor: Monitor,
-    excluder: Excluder,
-    start_url: Url,
-):
-    requester = Requester(excluder=excluder)
-    url = start_url
-
-    while True:
-        result = await requester.get(url)
-        next_url = result.redirect_url()
-        new_urls = url_store.add_page(
-            url=url,
-            info=UrlInfo(result=result, links=get_links(url=url, result=result)),
-        )
+    url_store: "UrlStore",
+    monitor: "Monitor",
+    excluder: "Excluder",
+    cache: Optional["ResultCache"],
+    dns_ttl: float,
+    robots: bool,
+    start_urls: Sequence[Url],
+    sitemaps: tuple[str, ...],
+    sitemap_only: bool,
+    kinds: frozenset[LinkKind],
+    canonicalizer: Canonicalizer,
+    index: Optional["LinkIndex"] = None,
+    changed: frozenset[Url] = frozenset(),
+    files: Optional["FileSite"] = None,
+    archive: Optional["ArchiveConfig"] = None,
+    uvloop: bool = False,
+    adaptive: bool = False,
+    parse_threads: int = 0,
+) -> bool:
+    """
+    Crawl the websites of the given start URLs.
+
+    With `changed` URLs, the crawl saved in `index` is restored instead, and only the
+    changed URLs and the new URLs they link to are fetched. The resulting crawl is saved
+    to `index`, if given.
 
-        if next_url is None:
-            break
+    URLs of the `files` website are read from disk. HTTP exchanges are recorded to, or
+    replayed from, `archive` if given. Worker processes run on `uvloop` if requested.
 
-        logger.info(f"Redirected to {next_url}")
+    With `adaptive`, `max_parallel_requests` is only the maximum: the number of parallel
+    requests adapts to the responses, overall and for each host.
 
-        if next_url not in new_urls:
-            logger.error("Detected circular redirects. Aborting.")
+    Pages are parsed on `parse_threads` threads in each process, or on the event loop
+    if zero.
+
+    Returns whether all of the start URLs could be retrieved.
+    """
+
+    from .concurrency import Throttle
+    from .content import ContentPredictor
+    from .crawler import find_links, start_site
+    from .distributed import find_links_distributed
+    from .dns import Resolver, new_client
+    from .html import parse_href
+    from .parsing import ParsePool
+    from .requester import Requester
+    from .robots import Robots
+    from .scope import Scope
+    from .sitemap import add_sitemap
+
+    resolver = Resolver(ttl=dns_ttl)
+    client = new_client(resolver, files=files, archive=archive)
+    throttle = Throttle(maximum=max_parallel_requests) if adaptive else None
+    requester = Requester(
+        excluder=excluder,
+        cache=cache,
+        client=client,
+        # Replayed crawls don't need to resolve anything.
+        resolver=None if archive is not None and archive.replay else resolver,
+        robots=Robots(client=client) if robots else None,
+        throttle=throttle,
+        content=ContentPredictor(),
+    )
+    site_urls: dict[str, Url] = {}
+    new_urls: frozenset[Url] = frozenset()
+    ok = True
+
+    if changed:
+        assert index is not None
+        (site_urls, url_infos) = index.load()
+
+        if not site_urls:
+            logger.error("No crawl saved in the index: run without --changed first.")
             exit(1)
 
-        url = next_url
+        url_store.restore(
+            {url: info for (url, info) in url_infos.items() if url not in changed}
+        )
+        new_urls = changed
+
+    for start_url in [] if changed else start_urls:
+        if start_url in url_store.get_url_infos():
+            continue
+
+        started = await start_site(
+            requester=requester,
+            url_store=url_store,
+            start_url=start_url,
+            sitemap_only=sitemap_only,
+            kinds=kinds,
+            canonicalizer=canonicalizer,
+        )
 
-    error_msg = result.error_msg()
-    if error_msg is not None:
-        logger.error("%s", error_msg)
-        exit(1)
+        if started is None:
+            ok = False
+            continue
 
-    if not result.ok():
-        logger.error("Bad response status code: %d", result.status_code())
+        (url, site_new_urls) = started
+        site_urls.setdefault(url.netloc, url)
+        new_urls |= site_new_urls
+
+    if not site_urls:
         exit(1)
 
-    await find_links(
-        max_parallel_requests=max_parallel_requests,
-        requester=requester,
-        url_store=url_store,
-        monitor=monitor,
-        start_url=url,
-        first_urls=new_urls,
+    scope = Scope(
+        sites=frozenset(site_urls),
+        extract_links=not sitemap_only,
+        kinds=kinds,
+        canonicalizer=canonicalizer,
+    )
+
+    for site_url in [] if changed else site_urls.values():
+        for sitemap in sitemaps:
+            sitemap_url = parse_href(
+                sitemap,
+                base_url=site_url,
+                canonicalizer=canonicalizer,
+            )
+
+            if sitemap_url is None:
+                logger.error("Invalid sitemap URL: %s", sitemap)
+                exit(1)
+
+            if sitemap_url in url_store.get_url_infos():
+                continue
+
+            new_urls |= await add_sitemap(
+                requester=requester,
+                url_store=url_store,
+                url=sitemap_url,
+                canonicalizer=canonicalizer,
+            )
+
+    # Some start URLs and sitemaps may also have been found as links, but they are
+    # already stored.
+    new_urls = frozenset(
+        new_url for new_url in new_urls if new_url not in url_store.get_url_infos()
     )
 
+    if processes > 1:
+        await find_links_distributed(
+            processes=processes,
+            max_parallel_requests=max_parallel_requests,
+            excluder=excluder,
+            cache_config=None if cache is None else cache.config,
+            dns_ttl=dns_ttl,
+            robots=robots,
+            files=files,
+            archive=archive,
+            uvloop=uvloop,
+            adaptive=adaptive,
+            parse_threads=parse_threads,
+            url_store=url_store,
+            monitor=monitor,
+            scope=scope,
+            first_urls=new_urls,
+        )
+    else:
+        pool = ParsePool.start(parse_threads) if parse_threads else None
+
+        try:
+            await find_links(
+                max_parallel_requests=max_parallel_requests,
+                requester=requester,
+                url_store=url_store,
+                monitor=monitor,
+                scope=scope,
+                first_urls=new_urls,
+                pool=pool,
+            )
+        finally:
+            if pool is not None:
+                pool.close()
+
+        if throttle is not None:
+            logger.info(throttle.summary())
+
+    if index is not None:
+        index.save(site_urls=site_urls, url_infos=url_store.get_url_infos())
+
+    return ok
+
 
 @click.command()
 @click.option(
@@ -140,9 +254,75 @@ async def main_async(
 )
 @click.option(
     "--max-parallel-requests",
-    default=4,
     type=click.IntRange(min=1),
-    help="Maximum of requests which can be in-flight at any given time.",
+    help="""
+        Maximum of requests which can be in-flight at any given time. Defaults to 4, or
+        to 64 with --adaptive-concurrency.
+    """,
+)
+@click.option(
+    "--adaptive-concurrency",
+    is_flag=True,
+    help="""
+        Adapt the number of parallel requests, overall and for each host, to the
+        latency and errors of responses (timeouts, 429 and 5xx status codes), up to
+        --max-parallel-requests. The settled numbers are reported at the end.
+    """,
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    help="""
+        Number of worker processes fetching URLs. With more than one, each process runs
+        up to --max-parallel-requests requests: the pages of the crawled websites are
+        spread over all of them, and other links are shared out by host. With --robots
+        or --adaptive-concurrency, all links are shared out by host so that per-host
+        limits hold. Defaults to 1, or to the number of CPUs with --root.
+    """,
+)
+@click.option(
+    "--parse-threads",
+    type=click.IntRange(min=0),
+    help="""
+        Number of threads parsing pages in each process, or 0 to parse them on the event
+        loop. Threads only parse pages in parallel on free-threaded builds of Python
+        (3.13+) with the GIL disabled. Defaults to the number of CPUs there (shared by
+        --processes), and to 0 otherwise.
+    """,
+)
+@click.option(
+    "--max-redirects",
+    default=20,
+    type=click.IntRange(min=0),
+    show_default=True,
+    help="Maximum number of consecutive redirects followed from a link.",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=0),
+    help="""
+        Maximum number of links between a start URL and the pages crawled. Links to
+        deeper pages are reported as skipped.
+    """,
+)
+@click.option(
+    "--max-pages",
+    type=click.IntRange(min=1),
+    help="""
+        Maximum number of pages crawled. Links to further pages are reported as skipped.
+        External links and resources aren't counted since they are only checked.
+    """,
+)
+@click.option(
+    "--path-budget",
+    "path_budgets",
+    default=[],
+    type=str,
+    multiple=True,
+    help="""
+        Maximum number of pages crawled whose path starts with a prefix, in the form
+        `PREFIX=COUNT` (e.g. `/calendar/=100`). Can be supplied multiple times.
+    """,
 )
 @click.option(
     "--json",
@@ -150,6 +330,45 @@ async def main_async(
     is_flag=True,
     help="Export results as JSON to the standard output.",
 )
+@click.option(
+    "--transfer-stats",
+    is_flag=True,
+    help="""
+        Report the number of bytes downloaded, as sent over the network and after
+        decompression, in total and for each page in the JSON export.
+    """,
+)
+@click.option(
+    "--report-duplicates",
+    is_flag=True,
+    help="Report groups of pages with identical content, served under several URLs.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="""
+        Write the results of each page as soon as they are known, during the crawl,
+        instead of all of them at the end. Text output only shows broken links.
+    """,
+)
+@click.option(
+    "--junit",
+    "junit_file",
+    type=click.File("w"),
+    help="""
+        Also write results to a file as JUnit XML, with a test suite per page and a test
+        case per link. Pages are written during the crawl, like with --stream.
+    """,
+)
+@click.option(
+    "--sarif",
+    "sarif_file",
+    type=click.File("w"),
+    help="""
+        Also write broken links to a file as SARIF. Pages are written during the crawl,
+        like with --stream.
+    """,
+)
 @click.option(
     "--exclude",
     default=[],
@@ -160,31 +379,449 @@ async def main_async(
         Can be supplied multiple times.
     """,
 )
-@click.option("--url", required=True, help="URL where crawling will start.")
+@click.option(
+    "--check",
+    "checks",
+    default=[LinkKind.LINK.value],
+    type=click.Choice([kind.value for kind in LinkKind]),
+    multiple=True,
+    show_default=True,
+    help="""
+        Kind of links to check: regular links, or resources embedded in pages (checked
+        without being crawled). Can be supplied multiple times. Regular links are always
+        checked, since the crawl follows them.
+    """,
+)
+@click.option(
+    "--canonicalize",
+    "canonical_rules",
+    default=sorted(rule.value for rule in SAFE_RULES),
+    type=click.Choice(["none", *(rule.value for rule in Rule)]),
+    multiple=True,
+    show_default=True,
+    help="""
+        Rule applied to discovered URLs so that equivalent URLs are only fetched once
+        (links are still reported as written). Supplying rules replaces the default
+        ones, which can't change the page a URL refers to, and `none` disables them all.
+        Can be supplied multiple times.
+    """,
+)
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="""
+        File where the results of external links are kept across runs (created if
+        needed). Fresh enough results are reused without any request.
+    """,
+)
+@click.option(
+    "--cache-ttl",
+    default=86400,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="Time in seconds during which successful cached results are reused.",
+)
+@click.option(
+    "--cache-failure-ttl",
+    default=3600,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="Time in seconds during which failed cached results are reused.",
+)
+@click.option(
+    "--dns-ttl",
+    default=300,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="""
+        Time in seconds during which host name resolutions are reused, including
+        failures, which make all the requests to a host fail right away.
+    """,
+)
+@click.option(
+    "--robots",
+    is_flag=True,
+    help="""
+        Follow the `robots.txt` files of websites: disallowed URLs are reported as
+        skipped and `Crawl-delay` is honored.
+    """,
+)
+@click.option(
+    "--sitemap",
+    "sitemaps",
+    default=[],
+    type=str,
+    multiple=True,
+    help="""
+        URL of a sitemap or sitemap index (e.g. `/sitemap.xml`), possibly relative to
+        the start URL. The URLs it lists are crawled from the start. Can be supplied
+        multiple times.
+    """,
+)
+@click.option(
+    "--sitemap-only",
+    is_flag=True,
+    help="""
+        Only check that the URLs listed in sitemaps are available, without following
+        the links on their pages.
+    """,
+)
+@click.option(
+    "--url",
+    "urls",
+    default=[],
+    type=str,
+    multiple=True,
+    help="""
+        URL where crawling will start. Can be supplied multiple times to check several
+        websites at once.
+    """,
+)
+@click.option(
+    "--urls-from",
+    type=click.File(),
+    help="File with start URLs, one per line (`-` for the standard input).",
+)
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="""
+        File where the results of the crawl are saved, along with the links between
+        pages, so that later runs can use --changed.
+    """,
+)
+@click.option(
+    "--changed",
+    "changed",
+    default=[],
+    type=str,
+    multiple=True,
+    help="""
+        URL which changed since the crawl saved in --index. Only changed URLs and the new
+        URLs they link to are fetched, and only the pages which may be affected are
+        reported. Can be supplied multiple times.
+    """,
+)
+@click.option(
+    "--changed-from",
+    type=click.File(),
+    help="File with changed URLs, one per line (`-` for the standard input).",
+)
+@click.option(
+    "--record",
+    "record_path",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="""
+        Append every HTTP request and response (status, headers and body) to an
+        archive, to replay them later with --replay.
+    """,
+)
+@click.option(
+    "--replay",
+    "replay_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="""
+        Answer HTTP requests with the responses of an archive made with --record,
+        without any network access. Requests missing from the archive fail.
+    """,
+)
+@click.option(
+    "--replay-latency",
+    is_flag=True,
+    help="Make replayed responses take as long as they originally did.",
+)
+@click.option(
+    "--root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="""
+        Directory of a static website, whose pages are read from disk instead of being
+        requested from a web server. Requires --base-url, which is also the default
+        start URL.
+    """,
+)
+@click.option(
+    "--base-url",
+    type=str,
+    help="URL under which the files of --root would be served (e.g. `/` of a site).",
+)
+@click.option(
+    "--compact-seen-urls",
+    is_flag=True,
+    help="""
+        Keep fingerprints of the URLs found instead of the URLs themselves, for crawls
+        of millions of URLs. A few new URLs may be taken as seen and never checked: the
+        estimated rate of such false positives is reported at the end.
+    """,
+)
+@click.option(
+    "--seen-urls-error-rate",
+    default=1e-6,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    show_default=True,
+    help="Maximum false positive rate of --compact-seen-urls.",
+)
+@click.option(
+    "--seen-urls-capacity",
+    default=10_000_000,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Number of URLs up to which --seen-urls-error-rate is guaranteed.",
+)
+@click.option(
+    "--seen-urls-bloom-filter",
+    is_flag=True,
+    help="""
+        Put a Bloom filter in front of the fingerprints of --compact-seen-urls, which
+        allows shorter fingerprints for the same error rate.
+    """,
+)
+@click.option(
+    "--uvloop",
+    is_flag=True,
+    help="""
+        Run on uvloop, a faster event loop, if it is installed (with the `uvloop` extra).
+        This helps with many parallel requests.
+    """,
+)
+@click.option(
+    "--stall-threshold",
+    type=click.FloatRange(min=0, min_open=True),
+    help="""
+        Measure the delays of the event loop and report the times it was blocked for
+        longer than this number of seconds, with the URL and stage being processed.
+    """,
+)
 @click.version_option(
     prog_name="discolinks",
     message="%(prog)s version %(version)s",
 )
 def main(
     verbose: bool,
-    max_parallel_requests: int,
+    max_parallel_requests: Optional[int],
+    adaptive_concurrency: bool,
+    processes: Optional[int],
+    parse_threads: Optional[int],
+    max_redirects: int,
+    max_depth: Optional[int],
+    max_pages: Optional[int],
+    path_budgets: tuple[str, ...],
     to_json: bool,
+    transfer_stats: bool,
+    report_duplicates: bool,
+    stream: bool,
+    junit_file: Optional[TextIO],
+    sarif_file: Optional[TextIO],
     exclude: tuple[str, ...],
-    url: str,
+    checks: tuple[str, ...],
+    canonical_rules: tuple[str, ...],
+    cache_path: Optional[Path],
+    cache_ttl: float,
+    cache_failure_ttl: float,
+    dns_ttl: float,
+    robots: bool,
+    sitemaps: tuple[str, ...],
+    sitemap_only: bool,
+    urls: tuple[str, ...],
+    urls_from: Optional[TextIO],
+    index_path: Optional[Path],
+    changed: tuple[str, ...],
+    changed_from: Optional[TextIO],
+    record_path: Optional[Path],
+    replay_path: Optional[Path],
+    replay_latency: bool,
+    root: Optional[Path],
+    base_url: Optional[str],
+    compact_seen_urls: bool,
+    seen_urls_error_rate: float,
+    seen_urls_capacity: int,
+    seen_urls_bloom_filter: bool,
+    uvloop: bool,
+    stall_threshold: Optional[float],
 ) -> None:
+    if sitemap_only and not sitemaps:
+        raise click.UsageError("--sitemap-only requires at least one --sitemap.")
+
+    if stream and to_json and report_duplicates:
+        raise click.UsageError(
+            "--report-duplicates can't be combined with --stream and --json."
+        )
+
+    if urls_from is not None:
+        urls += tuple(
+            line
+            for raw_line in urls_from
+            if (line := raw_line.strip()) and not line.startswith("#")
+        )
+
+    if changed_from is not None:
+        changed += tuple(
+            line
+            for raw_line in changed_from
+            if (line := raw_line.strip()) and not line.startswith("#")
+        )
+
+    if changed and index_path is None:
+        raise click.UsageError("--changed and --changed-from require --index.")
+
+    if record_path is not None and replay_path is not None:
+        raise click.UsageError("--record and --replay can't be used together.")
+
+    if replay_latency and replay_path is None:
+        raise click.UsageError("--replay-latency requires --replay.")
+
+    if record_path is not None and processes is not None and processes > 1:
+        raise click.UsageError("--record only works with a single process.")
+
+    if (root is None) != (base_url is None):
+        raise click.UsageError("--root and --base-url must be used together.")
+
+    if base_url is not None and not urls:
+        urls = (base_url,)
+
+    if not urls and not changed:
+        raise click.UsageError("At least one --url or --urls-from is required.")
+
+    import asyncio
+    import functools
+    import signal
+    import sqlite3
+
+    import rich.console
+    import rich.markup
+    from rich.logging import RichHandler
+
+    from . import analyzer, ci, export, report, text
+    from .archive import ArchiveConfig
+    from .cache import CacheConfig, ResultCache
+    from .excluder import Excluder, ExcluderRegexError
+    from .files import FileSite
+    from .index import LinkIndex
+    from .loop import LagMonitor, has_uvloop, new_event_loop
+    from .monitor import new_monitor
+    from .parsing import default_parse_threads, gil_enabled
+    from .seen import CompactSeenUrls, ExactSeenUrls
+    from .url_store import Limits, UrlStore
+
     console = rich.console.Console(stderr=True)
     main_logger = logging.getLogger("discolinks")
     level = logging.DEBUG if verbose else logging.INFO
     main_logger.setLevel(level)
     main_logger.addHandler(RichHandler(console=console, show_time=False))
 
-    start_url = parse_url_arg(url)
+    if uvloop and not has_uvloop():
+        logger.warning("uvloop isn't installed: using the standard event loop.")
+        uvloop = False
 
-    if start_url is None:
-        logger.error("Invalid URL: %s", url)
-        exit(1)
+    canonicalizer = Canonicalizer(
+        rules=frozenset(Rule(rule) for rule in canonical_rules if rule != "none")
+    )
+    start_urls = []
+
+    for url in urls:
+        start_url = parse_url_arg(url)
+
+        if start_url is None:
+            logger.error("Invalid URL: %s", url)
+            exit(1)
+
+        start_urls.append(Url.from_str(canonicalizer.canonicalize(start_url.full)))
+
+    files = None
+
+    if root is not None and base_url is not None:
+        parsed_base_url = parse_url_arg(base_url)
+
+        if parsed_base_url is None:
+            logger.error("Invalid URL: %s", base_url)
+            exit(1)
+
+        files = FileSite(
+            root=root,
+            base_url=Url.from_str(canonicalizer.canonicalize(parsed_base_url.full)),
+        )
+
+    if max_parallel_requests is None:
+        # Adaptive concurrency starts low and only grows as far as hosts can take.
+        max_parallel_requests = 64 if adaptive_concurrency else 4
+
+    if processes is None:
+        # Pages read from disk are parsed as fast as the CPUs allow, unless they are
+        # recorded (the archive is written by a single process).
+        processes = (
+            (os.cpu_count() or 1) if files is not None and record_path is None else 1
+        )
+
+    if parse_threads is None:
+        parse_threads = default_parse_threads(processes)
+
+    logger.debug(
+        "Parsing pages on %s (GIL %s)",
+        f"{parse_threads} threads" if parse_threads else "the event loop",
+        "enabled" if gil_enabled() else "disabled",
+    )
+    archive = None
+
+    if record_path is not None:
+        archive = ArchiveConfig(path=record_path, replay=False)
+    elif replay_path is not None:
+        archive = ArchiveConfig(path=replay_path, replay=True, latency=replay_latency)
+
+    changed_urls = set()
 
-    url_store = UrlStore()
+    for url in changed:
+        changed_url = parse_url_arg(url)
+
+        if changed_url is None:
+            logger.error("Invalid URL: %s", url)
+            exit(1)
+
+        changed_urls.add(Url.from_str(canonicalizer.canonicalize(changed_url.full)))
+
+    index = None if index_path is None else LinkIndex.open(index_path)
+    # Pages whose results may change, besides the ones fetched again.
+    affected = frozenset() if index is None else index.affected(changed_urls)
+
+    limits = Limits(
+        max_depth=max_depth,
+        max_pages=max_pages,
+        path_budgets=dict(parse_path_budget(budget) for budget in path_budgets),
+    )
+    writers: list[report.PageWriter] = []
+
+    if stream:
+        writers.append(
+            report.JsonWriter(with_transfer=transfer_stats)
+            if to_json
+            else report.TextWriter(
+                with_transfer=transfer_stats,
+                with_duplicates=report_duplicates,
+            )
+        )
+
+    if junit_file is not None:
+        writers.append(ci.JunitWriter(stream=junit_file))
+
+    if sarif_file is not None:
+        writers.append(ci.SarifWriter(stream=sarif_file))
+
+    reporter = report.Reporter(writers=writers) if writers else None
+    seen_urls = (
+        CompactSeenUrls(
+            capacity=seen_urls_capacity,
+            error_rate=seen_urls_error_rate,
+            bloom=seen_urls_bloom_filter,
+        )
+        if compact_seen_urls
+        else ExactSeenUrls()
+    )
+    url_store = UrlStore(
+        max_redirects=max_redirects,
+        limits=limits,
+        on_store=None if reporter is None else reporter.on_store,
+        seen_urls=seen_urls,
+    )
 
     try:
         excluder = Excluder.from_regexes(regexes=exclude)
@@ -197,20 +834,55 @@ def main(
         )
         exit(1)
 
-    try:
-        with new_monitor(console=console) as monitor:
-            # Set event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+    if cache_path is None:
+        cache = None
+    else:
+        config = CacheConfig(
+            path=cache_path,
+            success_ttl=cache_ttl,
+            failure_ttl=cache_failure_ttl,
+        )
 
+        try:
+            cache = ResultCache.open(config)
+        except sqlite3.Error as error:
+            logger.error("Can't open cache %s: %s", cache_path, error)
+            exit(1)
+
+    started_all = False
+    # Raised when no start URL could be crawled, after which reports are still completed.
+    stopped: Optional[SystemExit] = None
+    loop = new_event_loop(uvloop=uvloop)
+    asyncio.set_event_loop(loop)
+    consumer = None if reporter is None else loop.create_task(reporter.run())
+    lag = None if stall_threshold is None else LagMonitor(threshold=stall_threshold)
+    sampler = None if lag is None else loop.create_task(lag.run())
+
+    try:
+        with new_monitor(console=console, lag=lag) as monitor:
             # Define main task (wrap in a future to make it cancellable).
             main_task = asyncio.ensure_future(
                 main_async(
+                    processes=processes,
                     max_parallel_requests=max_parallel_requests,
                     url_store=url_store,
                     monitor=monitor,
                     excluder=excluder,
-                    start_url=start_url,
+                    cache=cache,
+                    dns_ttl=dns_ttl,
+                    robots=robots,
+                    start_urls=start_urls,
+                    sitemaps=sitemaps,
+                    sitemap_only=sitemap_only,
+                    kinds=frozenset([LinkKind.LINK, *map(LinkKind, checks)]),
+                    canonicalizer=canonicalizer,
+                    index=index,
+                    changed=frozenset(changed_urls),
+                    files=files,
+                    archive=archive,
+                    uvloop=uvloop,
+                    adaptive=adaptive_concurrency,
+                    parse_threads=parse_threads,
                 )
             )
 
@@ -225,23 +897,69 @@ def main(
             )
 
             # Run main task.
-            loop.run_until_complete(main_task)
+            started_all = loop.run_until_complete(main_task)
     except asyncio.CancelledError as error:
         logger.warning("Interrupted (%s)", error)
         interrupted = True
+    except SystemExit as error:
+        stopped = error
+        interrupted = True
     except Exception as exc:
         logger.exception(exc)
         interrupted = True
     else:
         interrupted = False
 
+    if lag is not None and sampler is not None:
+        sampler.cancel()
+        loop.run_until_complete(asyncio.gather(sampler, return_exceptions=True))
+        logger.debug(lag.summary())
+
+    if isinstance(seen_urls, CompactSeenUrls):
+        logger.info(seen_urls.summary())
+
+    if cache is not None:
+        cache.close()
+
+    if index is not None:
+        index.close()
+
     url_infos = url_store.get_url_infos()
-    analysis = analyzer.analyze(url_infos)
-    ok = not interrupted and analysis.ok()
+    # Only report the pages fetched again or affected by those, if any were restored.
+    pages = (
+        (url_infos.keys() - url_store.restored_urls) | affected
+        if url_store.restored_urls
+        else None
+    )
+
+    if reporter is not None and consumer is not None:
+        reporter.close(url_infos, pages=affected & url_store.restored_urls)
+        loop.run_until_complete(consumer)
+        stats = reporter.finish(url_infos)
+
+        if stream and stopped is None:
+            exit(0 if not interrupted and started_all and stats.failed == 0 else 1)
+
+    if stopped is not None:
+        raise stopped
+
+    analysis = analyzer.analyze(url_infos, pages=pages)
+    ok = not interrupted and started_all and analysis.ok()
 
     if to_json:
-        print(export.dump_json(analysis=analysis))
+        print(
+            export.dump_json(
+                analysis=analysis,
+                with_transfer=transfer_stats,
+                with_duplicates=report_duplicates,
+            )
+        )
     else:
-        text.print_results(analysis=analysis)
+        text.print_results(
+            analysis=analysis,
+            by_site=len(start_urls) > 1,
+            with_transfer=transfer_stats,
+            with_duplicates=report_duplicates,
+        )
 
     exit(0 if ok else 1)
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .core import Url
+
+# Factor applied to a limit when a host shows signs of overload.
+ERROR_BACKOFF = 0.5
+# Factor applied to a limit when responses get slow, which is a milder sign.
+LATENCY_BACKOFF = 0.9
+# Latencies this many times above their baseline are a sign of overload.
+LATENCY_TOLERANCE = 2.0
+# Latencies are compared to baselines of at least this many seconds, so that small
+# variations of very short latencies (e.g. on a local network) don't count.
+LATENCY_FLOOR = 0.05
+# Weight of the latest sample in moving averages.
+SMOOTHING = 0.2
+
+
+def is_overloaded(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def relative(latency: float, baseline: float) -> float:
+    return latency / max(baseline, LATENCY_FLOOR)
+
+
+def smooth(average: Optional[float], sample: float) -> float:
+    return sample if average is None else average + SMOOTHING * (sample - average)
+
+
+@dataclass
+class AdaptiveLimit:
+    """
+    Number of requests allowed in parallel, adjusted like TCP congestion windows: with an
+    additive increase and a multiplicative decrease (AIMD).
+
+    The limit grows by one request per successful request until the first decrease (slow
+    start), then by one request per round of `limit` successful requests. It only grows
+    when it is reached, so that it reflects the concurrency actually needed. Requests
+    started before a decrease can't cause another one, since they were sent with the
+    old limit.
+    """
+
+    maximum: int
+    limit: float = 1
+    in_flight: int = 0
+    slow_start: bool = True
+    # Number of decreases so far, to tell which requests were sent before the last one.
+    decreases: int = 0
+
+    def available(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def increase(self) -> None:
+        # The request which succeeded is still counted in `in_flight`.
+        if self.in_flight < int(self.limit):
+            return
+
+        step = 1 if self.slow_start else 1 / self.limit
+        self.limit = min(self.maximum, self.limit + step)
+
+    def decrease(self, epoch: int, factor: float) -> None:
+        if epoch != self.decreases:
+            return
+
+        self.slow_start = False
+        self.decreases += 1
+        self.limit = max(1, self.limit * factor)
+
+
+@dataclass(frozen=True)
+class Slot:
+    """
+    Permission to send a request, given by `Throttle.acquire`.
+    """
+
+    host: str
+    method: str
+    start: float
+    # Decreases of the overall and host limits when the request was sent.
+    epochs: tuple[int, int]
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+
+@dataclass
+class Throttle:
+    """
+    Adaptive limits of parallel requests, overall and for each host, between 1 and
+    `maximum` (see `AdaptiveLimit`).
+
+    The limit of a host decreases when it times out, answers with 429 or 5xx status
+    codes, or gets slower than its usual latency (the lowest seen, for each method and
+    class of status codes, since redirects or errors are typically faster than pages).
+    The overall limit decreases when all hosts get slower together, which means the
+    bottleneck is on our side (e.g. bandwidth or CPU).
+    """
+
+    maximum: int
+    total: AdaptiveLimit = field(init=False)
+    hosts: dict[str, AdaptiveLimit] = field(default_factory=dict)
+    # Lowest and average latencies of each host, for each method and status class.
+    baselines: dict[tuple[str, str, int], float] = field(default_factory=dict)
+    latencies: dict[tuple[str, str, int], float] = field(default_factory=dict)
+    # Average of latencies relative to their baselines, over all hosts.
+    relative_latency: Optional[float] = None
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    def __post_init__(self) -> None:
+        self.total = AdaptiveLimit(maximum=self.maximum)
+
+    def host_limit(self, host: str) -> AdaptiveLimit:
+        return self.hosts.setdefault(host, AdaptiveLimit(maximum=self.maximum))
+
+    async def acquire(self, url: Url, method: str) -> Slot:
+        """
+        Wait until a request to a URL is allowed. `release` must be called once done.
+        """
+
+        host = self.host_limit(url.netloc)
+
+        async with self.condition:
+            await self.condition.wait_for(
+                lambda: self.total.available() and host.available()
+            )
+            self.total.in_flight += 1
+            host.in_flight += 1
+
+        return Slot(
+            host=url.netloc,
+            method=method,
+            start=time.monotonic(),
+            epochs=(self.total.decreases, host.decreases),
+        )
+
+    async def release(
+        self,
+        slot: Slot,
+        status_code: Optional[int] = None,
+        timeout: bool = False,
+        latency: Optional[float] = None,
+    ) -> None:
+        """
+        Adjust the limits to the outcome of a request: its response status code, if any,
+        or whether it timed out.
+
+        The `latency` of the response is the time it took in seconds, until now by
+        default. It should only cover the headers, since bodies take time according to
+        their size.
+        """
+
+        (total_epoch, host_epoch) = slot.epochs
+        host = self.hosts[slot.host]
+
+        if timeout or (status_code is not None and is_overloaded(status_code)):
+            host.decrease(host_epoch, factor=ERROR_BACKOFF)
+        elif status_code is not None:
+            key = (slot.host, slot.method, status_code // 100)
+
+            if latency is None:
+                latency = slot.elapsed()
+            baseline = min(self.baselines.get(key, latency), latency)
+            average = smooth(self.latencies.get(key), latency)
+            self.baselines[key] = baseline
+            self.latencies[key] = average
+            self.relative_latency = smooth(
+                self.relative_latency,
+                relative(latency, baseline),
+            )
+
+            if relative(average, baseline) > LATENCY_TOLERANCE:
+                host.decrease(host_epoch, factor=LATENCY_BACKOFF)
+            else:
+                host.increase()
+
+            if self.relative_latency > LATENCY_TOLERANCE:
+                self.total.decrease(total_epoch, factor=LATENCY_BACKOFF)
+            else:
+                self.total.increase()
+
+        async with self.condition:
+            self.total.in_flight -= 1
+            host.in_flight -= 1
+            self.condition.notify_all()
+
+    def summary(self) -> str:
+        """
+        Describe the limits the crawl settled on.
+        """
+
+        total = int(self.total.limit)
+        lower = sorted(
+            f"{host}: {int(limit.limit)}"
+            for (host, limit) in self.hosts.items()
+            if int(limit.limit) < total
+        )
+        details = f" ({', '.join(lower)})" if lower else ""
+        return f"Concurrency settled at {total} parallel requests{details}"
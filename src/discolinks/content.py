@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .core import Url
+
+# Media types of HTML pages, which links can be extracted from.
+HTML_TYPES = frozenset(["text/html", "application/xhtml+xml"])
+
+# Extensions of HTML pages, or of scripts which typically generate them.
+HTML_EXTENSIONS = frozenset(
+    ["asp", "aspx", "cgi", "htm", "html", "jsp", "php", "pl", "shtml", "xhtml"]
+)
+
+# Extensions of files which are almost never HTML pages.
+OTHER_EXTENSIONS = frozenset(
+    [
+        # Documents and data
+        "csv", "doc", "docx", "epub", "json", "odp", "ods", "odt", "pdf", "ppt",
+        "pptx", "rtf", "txt", "xls", "xlsx", "xml",
+        # Archives and binaries
+        "7z", "apk", "bz2", "deb", "dmg", "exe", "gz", "iso", "jar", "msi", "rar",
+        "rpm", "tar", "tgz", "whl", "xz", "zip", "zst",
+        # Images
+        "avif", "bmp", "gif", "ico", "jpeg", "jpg", "png", "svg", "tif", "tiff", "webp",
+        # Audio and video
+        "avi", "flac", "m4a", "m4v", "mkv", "mov", "mp3", "mp4", "mpeg", "ogg", "wav",
+        "webm",
+        # Web assets
+        "css", "eot", "js", "map", "otf", "ttf", "woff", "woff2",
+    ]
+)  # fmt: skip
+
+
+def is_html(content_type: str) -> bool:
+    (media_type, _, _) = content_type.partition(";")
+    return media_type.strip().lower() in HTML_TYPES
+
+
+def directory(url: Url) -> str:
+    path = urlsplit(url.full).path
+    return f"{url.scheme}://{url.netloc}{path[: path.rfind('/') + 1]}"
+
+
+def extension(url: Url) -> Optional[str]:
+    name = urlsplit(url.full).path.rpartition("/")[2]
+    (stem, dot, ext) = name.rpartition(".")
+    return ext.lower() if dot and stem else None
+
+
+@dataclass
+class ContentPredictor:
+    """
+    Predict which URLs of the crawled websites aren't HTML pages, so that they can be
+    checked with `HEAD` instead of being downloaded for nothing.
+
+    URLs are predicted from their extension when it is a common one (e.g. `.pdf`), and
+    otherwise from the content type of the last response from the same directory, since
+    websites tend to keep similar files together (e.g. under `/downloads/`).
+    """
+
+    # Whether the last response from each directory was an HTML page.
+    directories: dict[str, bool] = field(default_factory=dict)
+
+    def learn(self, url: Url, content_type: str) -> None:
+        """
+        Take note of the content type of a successful response.
+        """
+
+        ext = extension(url)
+
+        # Files with a known extension say nothing about their neighbors.
+        if ext not in HTML_EXTENSIONS and ext not in OTHER_EXTENSIONS:
+            self.directories[directory(url)] = is_html(content_type)
+
+    def predicts_other(self, url: Url) -> bool:
+        """
+        Tell whether a URL is probably not an HTML page.
+        """
+
+        ext = extension(url)
+
+        if ext in HTML_EXTENSIONS:
+            return False
+
+        if ext in OTHER_EXTENSIONS:
+            return True
+
+        return self.directories.get(directory(url)) is False
@@ -1,3 +1,4 @@
+import enum
 from dataclasses import dataclass
 from urllib.parse import urldefrag, urlparse
 
@@ -30,7 +31,41 @@ class Url:
         return self.full
 
 
+class LinkKind(enum.Enum):
+    """
+    Element a link was found in.
+
+    Only regular links (`<a>` elements) lead to pages which are crawled. Other kinds are
+    resources embedded in pages, which are only checked.
+    """
+
+    LINK = "link"
+    IMAGE = "image"
+    SCRIPT = "script"
+    STYLESHEET = "stylesheet"
+    FRAME = "frame"
+    MEDIA = "media"
+
+
+@dataclass(frozen=True)
+class Transfer:
+    """
+    Size of the body of HTTP responses, as sent over the network (`wire_bytes`, possibly
+    compressed) and after decompression (`decoded_bytes`).
+    """
+
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    def __add__(self, other: "Transfer") -> "Transfer":
+        return Transfer(
+            wire_bytes=self.wire_bytes + other.wire_bytes,
+            decoded_bytes=self.decoded_bytes + other.decoded_bytes,
+        )
+
+
 @dataclass(frozen=True)
 class Link:
     href: str
     url: Url
+    kind: LinkKind = LinkKind.LINK
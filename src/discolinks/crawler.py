@@ -0,0 +1,288 @@
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, Sequence
+
+import httpx
+
+from .analyzer import LinkResult
+from .canonical import Canonicalizer
+from .content import ContentPredictor
+from .core import LinkKind, Url
+from .dns import Resolver, new_client
+from .excluder import Excluder
+from .html import ScanCache
+from .link_extractor import get_document
+from .monitor import Monitor
+from .parsing import ParsePool
+from .report import Reporter
+from .requester import Requester
+from .robots import Robots
+from .scope import Scope
+from .url_store import Limits, UrlInfo, UrlStore
+from .worker import work
+
+logger = logging.getLogger(__name__)
+
+
+async def find_links(
+    max_parallel_requests: int,
+    requester: Requester,
+    url_store: UrlStore,
+    monitor: Monitor,
+    scope: Scope,
+    first_urls: frozenset[Url],
+    pool: Optional[ParsePool] = None,
+) -> None:
+    queue: asyncio.Queue[Url] = asyncio.Queue()
+    scans = ScanCache()
+    requester.prefetch(first_urls)
+
+    for url in first_urls:
+        queue.put_nowait(url)
+
+    workers: list[asyncio.Task] = []
+
+    for _ in range(max_parallel_requests):
+        worker = asyncio.create_task(
+            work(
+                queue=queue,
+                requester=requester,
+                url_store=url_store,
+                monitor=monitor,
+                scope=scope,
+                scans=scans,
+                pool=pool,
+            ),
+        )
+        workers.append(worker)
+
+    # Wait for queue processing to finish, or for any worker to finish (which only happens
+    # if that worker raised an exception).
+    queue_task = asyncio.create_task(queue.join())
+    await asyncio.wait([queue_task, *workers], return_when=asyncio.FIRST_COMPLETED)
+
+    for worker in workers:
+        worker.cancel()
+
+    try:
+        await asyncio.gather(*workers)  # ← worker exceptions raised here
+    except asyncio.CancelledError:
+        pass
+
+
+async def start_site(
+    requester: Requester,
+    url_store: UrlStore,
+    start_url: Url,
+    sitemap_only: bool,
+    kinds: frozenset[LinkKind],
+    canonicalizer: Canonicalizer,
+) -> Optional[tuple[Url, frozenset[Url]]]:
+    """
+    Fetch a start URL, following redirects, and return the first page and the new URLs.
+
+    Returns `None` if the first page can't be retrieved.
+    """
+
+    url = start_url
+    visited = []
+    new_urls: frozenset[Url] = frozenset()
+
+    while True:
+        if not url_store.try_crawl(url):
+            logger.error("%s: Skipped because of crawl limits", start_url)
+            return None
+
+        visited.append(url)
+        (result, transfer) = await requester.request(url)
+        page_urls = url_store.add_page(
+            url=url,
+            info=UrlInfo.from_document(
+                result=result,
+                document=(
+                    None
+                    if sitemap_only
+                    else get_document(
+                        url=url,
+                        result=result,
+                        kinds=kinds,
+                        canonicalizer=canonicalizer,
+                    )
+                ),
+                transfer=transfer,
+            ).compact(),
+        )
+        new_urls |= page_urls
+        # Redirects beyond the limit are stored as errors.
+        result = url_store.get_url_infos()[url].result
+        next_url = result.redirect_url()
+
+        if next_url is None:
+            break
+
+        logger.info(f"Redirected to {next_url}")
+
+        if next_url in visited:
+            logger.error("Detected circular redirects from %s.", start_url)
+            return None
+
+        if next_url not in page_urls:
+            # Already found from another start URL.
+            next_info = url_store.get_url_infos().get(next_url)
+
+            if next_info is not None and (msg := next_info.result.error_msg()):
+                logger.error("%s: %s", start_url, msg)
+                return None
+
+            return (next_url, new_urls)
+
+        url = next_url
+
+    error_msg = result.error_msg()
+    if error_msg is not None:
+        logger.error("%s: %s", start_url, error_msg)
+        return None
+
+    if not result.ok():
+        logger.error(
+            "Bad response status code for %s: %d",
+            start_url,
+            result.status_code(),
+        )
+        return None
+
+    return (url, new_urls)
+
+
+class StartError(Exception):
+    """
+    None of the start URLs of a crawl could be retrieved.
+    """
+
+
+@dataclass(frozen=True)
+class CrawlConfig:
+    """
+    Settings of a crawl run with `crawl`.
+
+    The crawled websites are those of the start URLs, after redirects. A `client` can be
+    given to share its connection pool with other crawls: it is left open at the end.
+    """
+
+    start_urls: Sequence[str]
+    client: Optional[httpx.AsyncClient] = None
+    max_parallel_requests: int = 4
+    max_redirects: int = 20
+    limits: Limits = field(default_factory=Limits)
+    # Regular expressions matching URLs to exclude from the crawl.
+    exclude: Sequence[str] = ()
+    kinds: frozenset[LinkKind] = frozenset([LinkKind.LINK])
+    canonicalizer: Canonicalizer = field(default_factory=Canonicalizer)
+    robots: bool = False
+
+
+@dataclass(frozen=True)
+class PageResult:
+    url: Url
+    links: Sequence[LinkResult]
+
+    def ok(self) -> bool:
+        return all(link.ok() for link in self.links)
+
+
+async def run_crawl(
+    config: CrawlConfig,
+    requester: Requester,
+    url_store: UrlStore,
+) -> None:
+    site_urls: dict[str, Url] = {}
+    new_urls: frozenset[Url] = frozenset()
+
+    for start_url in config.start_urls:
+        url = Url.from_str(config.canonicalizer.canonicalize(start_url))
+
+        if url in url_store.get_url_infos():
+            continue
+
+        started = await start_site(
+            requester=requester,
+            url_store=url_store,
+            start_url=url,
+            sitemap_only=False,
+            kinds=config.kinds,
+            canonicalizer=config.canonicalizer,
+        )
+
+        if started is not None:
+            (url, site_new_urls) = started
+            site_urls.setdefault(url.netloc, url)
+            new_urls |= site_new_urls
+
+    if not site_urls:
+        raise StartError("None of the start URLs could be retrieved")
+
+    await find_links(
+        max_parallel_requests=config.max_parallel_requests,
+        requester=requester,
+        url_store=url_store,
+        monitor=Monitor(),
+        scope=Scope(
+            sites=frozenset(site_urls),
+            kinds=config.kinds,
+            canonicalizer=config.canonicalizer,
+        ),
+        first_urls=frozenset(
+            url for url in new_urls if url not in url_store.get_url_infos()
+        ),
+    )
+
+
+async def crawl(config: CrawlConfig) -> AsyncIterator[PageResult]:
+    """
+    Crawl websites and yield the results of the links of each page, as soon as they are
+    known.
+
+    Raises `StartError` if none of the start URLs can be retrieved and
+    `ExcluderRegexError` if an exclusion pattern is invalid. Stopping the iteration
+    early stops the crawl.
+    """
+
+    excluder = Excluder.from_regexes(regexes=config.exclude)
+    reporter = Reporter(writers=())
+    url_store = UrlStore(
+        max_redirects=config.max_redirects,
+        limits=config.limits,
+        on_store=reporter.on_store,
+    )
+
+    async with contextlib.AsyncExitStack() as stack:
+        resolver = None
+        client = config.client
+
+        if client is None:
+            resolver = Resolver()
+            client = await stack.enter_async_context(new_client(resolver))
+
+        requester = Requester(
+            excluder=excluder,
+            client=client,
+            resolver=resolver,
+            robots=Robots(client=client) if config.robots else None,
+            content=ContentPredictor(),
+        )
+        task = asyncio.create_task(
+            run_crawl(config=config, requester=requester, url_store=url_store)
+        )
+        task.add_done_callback(lambda _: reporter.close(url_store.get_url_infos()))
+
+        try:
+            while (item := await reporter.queue.get()) is not None:
+                (url, page) = item
+                yield PageResult(url=url, links=page.links)
+
+            await task
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
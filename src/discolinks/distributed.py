@@ -0,0 +1,366 @@
+import asyncio
+import functools
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.queues
+import os
+import queue
+import signal
+import traceback
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from .archive import ArchiveConfig
+from .cache import CacheConfig, ResultCache
+from .concurrency import Throttle
+from .content import ContentPredictor
+from .core import Url
+from .dns import Resolver, new_client
+from .excluder import Excluder
+from .files import FileSite
+from .html import ScanCache
+from .loop import new_event_loop
+from .monitor import Monitor
+from .parsing import ParsePool
+from .requester import Requester
+from .robots import Robots
+from .scope import Scope
+from .url_store import UrlInfo, UrlStore
+from .worker import admit, fetch_url_info
+
+logger = logging.getLogger(__name__)
+
+# Maximum time to wait for a result before checking that worker processes are alive.
+POLL_TIMEOUT = 1.0
+
+
+@dataclass(frozen=True)
+class WorkerConfig:
+    """
+    Everything a worker process needs to fetch URLs on its own.
+
+    This is sent to the worker processes so it must be picklable.
+    """
+
+    excluder: Excluder
+    cache_config: Optional[CacheConfig]
+    scope: Scope
+    max_parallel_requests: int
+    dns_ttl: float
+    robots: bool
+    files: Optional[FileSite] = None
+    archive: Optional[ArchiveConfig] = None
+    uvloop: bool = False
+    # Whether the number of parallel requests adapts to responses.
+    adaptive: bool = False
+    # Number of threads to parse pages on, or zero to parse them on the event loop.
+    parse_threads: int = 0
+
+
+@dataclass(frozen=True)
+class Task:
+    url: Url
+    resource: bool
+    # Redirect targets are fetched before other URLs, so that redirects are followed
+    # right away like with a single process.
+    redirect: bool = False
+
+
+@dataclass(frozen=True)
+class WorkerResult:
+    url: Url
+    info: UrlInfo
+
+
+@dataclass(frozen=True)
+class WorkerError:
+    url: Url
+    traceback: str
+
+
+@dataclass(frozen=True)
+class WorkerSummary:
+    """
+    Limits of parallel requests a worker settled on, sent when it stops.
+    """
+
+    pid: int
+    summary: str
+
+
+Message = Union[WorkerResult, WorkerError, WorkerSummary]
+
+
+def partition(
+    url: Url,
+    count: int,
+    scope: Optional[Scope] = None,
+    files: Optional[FileSite] = None,
+) -> int:
+    """
+    Return the index of the worker process responsible for a URL.
+
+    Pages of the crawled websites (in `scope`, if given) and URLs read from disk are
+    spread over all the processes, so that they are fetched and parsed in parallel.
+    Other URLs are partitioned by host so that each external host only gets connections
+    from one process. The hash must be stable across processes, which rules out the
+    builtin `hash`.
+    """
+
+    if (scope is not None and scope.is_internal(url)) or (
+        files is not None and files.serves(url)
+    ):
+        return zlib.crc32(url.full.encode()) % count
+
+    return zlib.crc32(url.netloc.encode()) % count
+
+
+async def serve(
+    config: WorkerConfig,
+    inbox: "multiprocessing.queues.Queue[Optional[Task]]",
+    outbox: "multiprocessing.queues.Queue[Message]",
+) -> None:
+    """
+    Fetch URLs received from the coordinator and send back the results.
+
+    Stops when `None` is received, after sending the limits of parallel requests it
+    settled on (with adaptive concurrency).
+    """
+
+    loop = asyncio.get_running_loop()
+    cache = None if config.cache_config is None else ResultCache.open(config.cache_config)
+    resolver = Resolver(ttl=config.dns_ttl)
+    client = new_client(resolver, files=config.files, archive=config.archive)
+    replay = config.archive is not None and config.archive.replay
+    throttle = Throttle(maximum=config.max_parallel_requests) if config.adaptive else None
+    requester = Requester(
+        excluder=config.excluder,
+        cache=cache,
+        client=client,
+        # Replayed crawls don't need to resolve anything.
+        resolver=None if replay else resolver,
+        robots=Robots(client=client) if config.robots else None,
+        throttle=throttle,
+        content=ContentPredictor(),
+    )
+    scans = ScanCache()
+    pool = ParsePool.start(config.parse_threads) if config.parse_threads else None
+    tasks: asyncio.PriorityQueue[tuple[bool, int, Task]] = asyncio.PriorityQueue()
+
+    async def fetch() -> None:
+        while True:
+            (_, _, task) = await tasks.get()
+            try:
+                info = await fetch_url_info(
+                    requester=requester,
+                    scope=config.scope,
+                    url=task.url,
+                    resource=task.resource,
+                    scans=scans,
+                    pool=pool,
+                )
+            except Exception:
+                outbox.put(WorkerError(url=task.url, traceback=traceback.format_exc()))
+            else:
+                outbox.put(WorkerResult(url=task.url, info=info))
+
+    fetchers = [asyncio.create_task(fetch()) for _ in range(config.max_parallel_requests)]
+
+    for index in itertools.count():
+        task = await loop.run_in_executor(None, inbox.get)
+
+        if task is None:
+            break
+
+        requester.prefetch([task.url])
+        # The index keeps the order of tasks with the same priority.
+        tasks.put_nowait((not task.redirect, index, task))
+
+    for fetcher in fetchers:
+        fetcher.cancel()
+
+    await asyncio.gather(*fetchers, return_exceptions=True)
+
+    if pool is not None:
+        pool.close()
+
+    if throttle is not None:
+        outbox.put(WorkerSummary(pid=os.getpid(), summary=throttle.summary()))
+
+    if cache is not None:
+        cache.close()
+
+
+def run_worker(
+    config: WorkerConfig,
+    inbox: "multiprocessing.queues.Queue[Optional[Task]]",
+    outbox: "multiprocessing.queues.Queue[Message]",
+) -> None:
+    """
+    Entry point of worker processes.
+    """
+
+    # Interruptions are handled by the coordinator, which stops the workers itself.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    loop = new_event_loop(uvloop=config.uvloop)
+
+    try:
+        loop.run_until_complete(serve(config=config, inbox=inbox, outbox=outbox))
+    finally:
+        loop.close()
+
+
+async def find_links_distributed(
+    processes: int,
+    max_parallel_requests: int,
+    excluder: Excluder,
+    cache_config: Optional[CacheConfig],
+    dns_ttl: float,
+    robots: bool,
+    files: Optional[FileSite],
+    archive: Optional[ArchiveConfig],
+    uvloop: bool,
+    adaptive: bool,
+    parse_threads: int,
+    url_store: UrlStore,
+    monitor: Monitor,
+    scope: Scope,
+    first_urls: frozenset[Url],
+) -> None:
+    """
+    Crawl from the given URLs with several worker processes.
+
+    This process acts as the coordinator: it owns the URL store (the frontier) and hands
+    out URLs to the workers, which fetch them and extract their links. With `adaptive`,
+    the limits each worker settled on are logged at the end.
+    """
+
+    context = multiprocessing.get_context("spawn")
+    outbox: multiprocessing.queues.Queue[Message] = context.Queue()
+    inboxes: list[multiprocessing.queues.Queue[Optional[Task]]] = [
+        context.Queue() for _ in range(processes)
+    ]
+    config = WorkerConfig(
+        excluder=excluder,
+        cache_config=cache_config,
+        scope=scope,
+        max_parallel_requests=max_parallel_requests,
+        dns_ttl=dns_ttl,
+        robots=robots,
+        files=files,
+        archive=archive,
+        uvloop=uvloop,
+        adaptive=adaptive,
+        parse_threads=parse_threads,
+    )
+    workers = [
+        context.Process(
+            target=run_worker,
+            kwargs={"config": config, "inbox": inbox, "outbox": outbox},
+            daemon=True,
+        )
+        for inbox in inboxes
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    loop = asyncio.get_running_loop()
+    pending = 0
+    stopped = False
+    # Crawl delays and adaptive limits are enforced by each process for its hosts, so
+    # pages of a host must all go to the same process for them to hold.
+    spread_scope = None if robots or adaptive else scope
+
+    async def receive() -> Optional[Message]:
+        """
+        Wait for a message from the workers, or return `None` after `POLL_TIMEOUT`.
+        """
+
+        try:
+            return await loop.run_in_executor(
+                None,
+                functools.partial(outbox.get, timeout=POLL_TIMEOUT),
+            )
+        except queue.Empty:
+            return None
+
+    def stop() -> None:
+        nonlocal stopped
+
+        if not stopped:
+            for inbox in inboxes:
+                inbox.put(None)
+
+            stopped = True
+
+    def dispatch(urls: Iterable[Url], redirect_url: Optional[Url] = None) -> None:
+        nonlocal pending
+
+        for url in urls:
+            if not admit(url_store=url_store, scope=scope, url=url):
+                continue
+
+            task = Task(
+                url=url,
+                resource=url_store.is_resource(url),
+                redirect=url == redirect_url,
+            )
+            index = partition(url, count=processes, scope=spread_scope, files=files)
+            inboxes[index].put(task)
+            pending += 1
+            monitor.on_task_start(queued=pending)
+
+    try:
+        dispatch(first_urls)
+
+        while pending:
+            message = await receive()
+
+            if message is None:
+                if not all(worker.is_alive() for worker in workers):
+                    raise RuntimeError("Worker process exited unexpectedly")
+                continue
+
+            if isinstance(message, WorkerError):
+                raise RuntimeError(
+                    f"Worker failed on {message.url}:\n{message.traceback}"
+                )
+
+            assert isinstance(message, WorkerResult)
+            pending -= 1
+            monitor.on_stage(message.url, "storing")
+            dispatch(
+                url_store.add_page(url=message.url, info=message.info),
+                redirect_url=message.info.result.redirect_url(),
+            )
+            monitor.on_task_done(
+                queued=pending,
+                result=url_store.get_url_infos()[message.url].result,
+            )
+
+        stop()
+        summaries = 0
+
+        while adaptive and summaries < processes:
+            message = await receive()
+
+            if message is None:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+
+            if isinstance(message, WorkerSummary):
+                logger.info("Worker process %d: %s", message.pid, message.summary)
+                summaries += 1
+    finally:
+        stop()
+
+        for worker in workers:
+            worker.join(timeout=POLL_TIMEOUT)
+
+            if worker.is_alive():
+                logger.debug("Terminating worker process %d", worker.pid)
+                worker.terminate()
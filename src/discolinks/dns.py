@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import socket
+import time
+import typing
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Union, cast
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from .__version__ import __version__
+from .archive import ArchiveConfig, archive_transport
+from .core import Url
+from .files import FileSite, FileTransport
+from .robots import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """
+    Addresses of a host, or the reason why it couldn't be resolved.
+    """
+
+    addresses: tuple[str, ...]
+    error: Optional[str]
+    expires_at: float
+
+
+def url_host(url: Url) -> Optional[str]:
+    return urlsplit(url.full).hostname
+
+
+@dataclass
+class Resolver:
+    """
+    Asynchronous DNS cache, shared by all the requests of a crawl.
+
+    The system resolver doesn't expose the TTL of DNS records, so resolutions (including
+    failures) are kept for a fixed time instead. Hosts can be resolved ahead of time with
+    `prefetch` so that requests don't have to wait for DNS when they reach them.
+    """
+
+    ttl: float = 300
+    resolutions: dict[str, Resolution] = field(init=False, default_factory=dict)
+    pending: dict[str, asyncio.Task[Resolution]] = field(init=False, default_factory=dict)
+
+    async def lookup(self, host: str) -> Resolution:
+        loop = asyncio.get_running_loop()
+
+        try:
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        # Invalid hosts (e.g. with labels over 63 characters) fail to be encoded with
+        # IDNA before any lookup.
+        except (OSError, ValueError) as error:
+            logger.debug("Failed to resolve %s: %s", host, error)
+            return Resolution(
+                addresses=(),
+                error=f"Failed to resolve {host}: {error}",
+                expires_at=time.monotonic() + self.ttl,
+            )
+
+        # Keep the order chosen by the system (e.g. IPv6 first) without duplicates.
+        addresses = tuple(dict.fromkeys(str(info[4][0]) for info in infos))
+        logger.debug("Resolved %s: %s", host, ", ".join(addresses))
+        return Resolution(
+            addresses=addresses,
+            error=None,
+            expires_at=time.monotonic() + self.ttl,
+        )
+
+    def start(self, host: str) -> Union[Resolution, asyncio.Task[Resolution]]:
+        """
+        Return the cached resolution of a host, or a task resolving it.
+        """
+
+        resolution = self.resolutions.get(host)
+
+        if resolution is not None and resolution.expires_at > time.monotonic():
+            return resolution
+
+        task = self.pending.get(host)
+
+        if task is None:
+            task = asyncio.create_task(self.lookup(host))
+            task.add_done_callback(lambda task: self.on_done(host, task))
+            self.pending[host] = task
+
+        return task
+
+    def on_done(self, host: str, task: asyncio.Task[Resolution]) -> None:
+        del self.pending[host]
+
+        if not task.cancelled():
+            self.resolutions[host] = task.result()
+
+    async def resolve(self, host: str) -> Resolution:
+        started = self.start(host)
+
+        if isinstance(started, Resolution):
+            return started
+
+        # Several requests may wait for the same resolution: none of them should cancel
+        # it for the others.
+        return await asyncio.shield(started)
+
+    def prefetch(self, urls: Iterable[Url]) -> None:
+        """
+        Start resolving the hosts of the given URLs in the background.
+        """
+
+        for host in {url_host(url) for url in urls}:
+            if host is not None:
+                self.start(host)
+
+
+@dataclass(frozen=True)
+class ResolvingBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend for `httpcore` which resolves hosts with a `Resolver`.
+
+    Hosts which failed to resolve make connections fail right away.
+    """
+
+    resolver: Resolver
+    backend: httpcore.AsyncNetworkBackend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[typing.Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        resolution = await self.resolver.resolve(host)
+
+        if resolution.error is not None:
+            raise httpcore.ConnectError(resolution.error)
+
+        error: Optional[Exception] = None
+
+        for address in resolution.addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    host=address,
+                    port=port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                error = exc
+
+        assert error is not None, f"No address for {host}"
+        raise error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[typing.Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(
+            path=path,
+            timeout=timeout,
+            socket_options=socket_options,
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+def new_client(
+    resolver: Resolver,
+    files: Optional[FileSite] = None,
+    archive: Optional[ArchiveConfig] = None,
+) -> httpx.AsyncClient:
+    """
+    Create an HTTP client which resolves hosts with the given resolver.
+
+    URLs of the `files` website, if given, are read from disk instead. Exchanges are
+    recorded to, or replayed from, the `archive` if given. Requests identify us with the
+    user agent `robots.txt` rules are matched against.
+    """
+
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+
+    # httpx doesn't let us choose how its connection pool opens connections, so the pool
+    # is replaced by an equivalent one with our network backend (which is why the
+    # versions of httpx are pinned). Proxies configured in the environment have their
+    # own transports and keep resolving hosts themselves.
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(),
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=ResolvingBackend(
+            resolver=resolver,
+            # httpcore declares a placeholder class instead when anyio isn't installed,
+            # but httpx depends on it.
+            backend=cast(httpcore.AsyncNetworkBackend, httpcore.AnyIOBackend()),
+        ),
+    )
+    wrapped: httpx.AsyncBaseTransport = transport
+
+    if files is not None:
+        wrapped = FileTransport(site=files, transport=wrapped)
+
+    if archive is not None:
+        wrapped = archive_transport(archive, transport=wrapped)
+
+    return httpx.AsyncClient(
+        transport=wrapped,
+        headers={"User-Agent": f"{USER_AGENT}/{__version__}"},
+    )
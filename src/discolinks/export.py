@@ -4,7 +4,7 @@ from typing import Any, Mapping, Sequence
 
 from . import outcome
 from .analyzer import Analysis, LinkResult, Page
-from .core import Url
+from .core import LinkKind, Transfer, Url
 
 
 @dataclass(frozen=True)
@@ -39,29 +39,131 @@ class Converter(outcome.Converter[Any]):
             "type": "unknown",
         }
 
+    def convert_missing_fragment(self, missing: outcome.MissingFragment) -> Any:
+        return {
+            "type": "missing_fragment",
+            "fragment": missing.fragment,
+        }
+
+    def convert_skipped(self, skipped: outcome.Skipped) -> Any:
+        return {
+            "type": "skipped",
+            "reason": skipped.reason,
+        }
+
+
+def result_to_json(result: outcome.Result) -> Any:
+    return result.convert_with(Converter())
+
+
+def result_from_json(obj: Any) -> outcome.Result:
+    """
+    Build a result from its JSON representation.
+
+    Page bodies aren't exported so they are empty in the returned results.
+    """
+
+    kind = obj["type"]
+
+    if kind == "response":
+        return outcome.Page(code=obj["status_code"], body="")
+    elif kind == "redirect":
+        return outcome.Redirect(
+            code=obj["status_code"],
+            ref=obj["value"],
+            url=Url.from_str(obj["url"]),
+        )
+    elif kind == "request_error":
+        return outcome.RequestError(msg=obj["message"])
+    elif kind == "excluded":
+        return outcome.Excluded()
+    elif kind == "unknown":
+        return outcome.Unknown()
+    elif kind == "missing_fragment":
+        return outcome.MissingFragment(fragment=obj["fragment"])
+    elif kind == "skipped":
+        return outcome.Skipped(reason=obj["reason"])
+    else:
+        raise ValueError(f"Unknown result type: {kind}")
+
 
 def results_to_json(results: outcome.Results) -> Sequence[Any]:
     return results.convert_with(Converter())
 
 
 def link_to_json(link: LinkResult) -> Any:
-    return {
+    obj = {
         "href": link.href,
         "url": str(link.url),
         "results": results_to_json(link.results),
     }
 
+    # Omitted for regular links to keep the output compact.
+    if link.kind is not LinkKind.LINK:
+        obj["kind"] = link.kind.value
 
-def page_to_json(page: Page) -> Any:
+    return obj
+
+
+def transfer_to_json(transfer: Transfer) -> Any:
     return {
+        "wire_bytes": transfer.wire_bytes,
+        "decoded_bytes": transfer.decoded_bytes,
+    }
+
+
+def page_to_json(
+    page: Page,
+    with_transfer: bool = False,
+    duplicates: Sequence[Url] = (),
+) -> Any:
+    obj: dict[str, Any] = {
         "links": [link_to_json(link) for link in page.links],
     }
 
+    if with_transfer and page.transfer is not None:
+        obj["transfer"] = transfer_to_json(page.transfer)
+
+    if duplicates:
+        obj["duplicates"] = [url.full for url in duplicates]
+
+    return obj
 
-def pages_to_json(pages: Mapping[Url, Page]) -> Any:
-    return {url.full: page_to_json(page) for (url, page) in pages.items()}
+
+def pages_to_json(
+    pages: Mapping[Url, Page],
+    with_transfer: bool = False,
+    duplicates: Sequence[Sequence[Url]] = (),
+) -> Any:
+    """
+    Export pages, with the other pages with the same content for each page of the given
+    duplicate groups.
+    """
+
+    page_duplicates = {
+        url: [other for other in group if other != url]
+        for group in duplicates
+        for url in group
+    }
+
+    return {
+        url.full: page_to_json(
+            page,
+            with_transfer=with_transfer,
+            duplicates=page_duplicates.get(url, ()),
+        )
+        for (url, page) in pages.items()
+    }
 
 
-def dump_json(analysis: Analysis) -> str:
-    obj = pages_to_json(pages=analysis.pages)
+def dump_json(
+    analysis: Analysis,
+    with_transfer: bool = False,
+    with_duplicates: bool = False,
+) -> str:
+    obj = pages_to_json(
+        pages=analysis.pages,
+        with_transfer=with_transfer,
+        duplicates=analysis.duplicates if with_duplicates else (),
+    )
     return json.dumps(obj)
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import mimetypes
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import httpx
+
+from .core import Url
+
+logger = logging.getLogger(__name__)
+
+# File served for URLs of directories, like most web servers do.
+INDEX_FILE = "index.html"
+
+
+@dataclass(frozen=True)
+class FileSite:
+    """
+    Website served from a directory, typically the output of a static site generator.
+
+    URLs under `base_url` correspond to the files under `root`, as a basic web server
+    would serve them.
+    """
+
+    root: Path
+    base_url: Url
+
+    def base_path(self) -> str:
+        path = urlsplit(self.base_url.full).path
+        return path if path.endswith("/") else f"{path}/"
+
+    def serves(self, url: Url) -> bool:
+        """
+        Tell whether a URL is served from the directory.
+        """
+
+        parts = urlsplit(url.full)
+        return (
+            url.netloc == self.base_url.netloc
+            and url.scheme == self.base_url.scheme
+            and f"{parts.path}/".startswith(self.base_path())
+        )
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        """
+        Build the response of a web server for a URL served from the directory.
+        """
+
+        url_path = unquote(request.url.path)
+        relative = url_path[len(self.base_path()) :]
+        root = self.root.resolve()
+        path = (root / relative).resolve()
+
+        if path != root and root not in path.parents:
+            return httpx.Response(404, request=request)
+
+        if path.is_dir():
+            if not url_path.endswith("/"):
+                location = request.url.copy_with(path=f"{request.url.path}/")
+                return httpx.Response(
+                    301,
+                    headers={"Location": str(location)},
+                    request=request,
+                )
+
+            path = path / INDEX_FILE
+
+        if not path.is_file():
+            return httpx.Response(404, request=request)
+
+        (content_type, _) = mimetypes.guess_type(path.name)
+        headers = {"Content-Type": content_type or "application/octet-stream"}
+
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(path.stat().st_size)
+            return httpx.Response(200, headers=headers, request=request)
+
+        # One read of the whole file, which is all we need since pages are parsed
+        # entirely anyway.
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=path.read_bytes(),
+            request=request,
+        )
+
+
+@dataclass(frozen=True)
+class FileTransport(httpx.AsyncBaseTransport):
+    """
+    Transport for `httpx` which reads the URLs of a `FileSite` from disk, without any
+    web server, and sends other requests over the network with another transport.
+    """
+
+    site: FileSite
+    transport: httpx.AsyncBaseTransport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = Url.from_str(str(request.url))
+
+        if not self.site.serves(url):
+            return await self.transport.handle_async_request(request)
+
+        logger.debug("Read %s from %s", url, self.site.root)
+        # Disk reads would block the event loop, and other requests with it.
+        return await asyncio.to_thread(self.site.respond, request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
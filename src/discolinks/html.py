@@ -1,25 +1,236 @@
+import hashlib
+import threading
 import warnings
-from typing import Optional, Sequence
-from urllib.parse import urldefrag, urljoin, urlparse
+from dataclasses import dataclass, field
+from typing import AbstractSet, Iterator, Mapping, Optional, Sequence
+from urllib.parse import unquote, urldefrag, urljoin, urlparse
 
 import bs4
 
-from .core import Link, Url
+from .canonical import Canonicalizer
+from .core import Link, LinkKind, Url
 
+# Attributes of elements embedding resources, with the kind of resource they refer to.
+RESOURCE_ATTRIBUTES: Mapping[str, Sequence[tuple[str, LinkKind]]] = {
+    "audio": [("src", LinkKind.MEDIA)],
+    "frame": [("src", LinkKind.FRAME)],
+    "iframe": [("src", LinkKind.FRAME)],
+    "img": [("src", LinkKind.IMAGE), ("srcset", LinkKind.IMAGE)],
+    "script": [("src", LinkKind.SCRIPT)],
+    "source": [("src", LinkKind.MEDIA), ("srcset", LinkKind.IMAGE)],
+    "track": [("src", LinkKind.MEDIA)],
+    "video": [("src", LinkKind.MEDIA), ("poster", LinkKind.IMAGE)],
+}
+
+# Relations of `<link>` elements which embed a resource in the page.
+LINK_RELATIONS: Mapping[str, LinkKind] = {
+    "stylesheet": LinkKind.STYLESHEET,
+    "icon": LinkKind.IMAGE,
+    "apple-touch-icon": LinkKind.IMAGE,
+}
+
+# Number of locks of scan caches, each guarding the bodies whose digests map to it.
+SCAN_LOCK_STRIPES = 64
+
+
+def parse_srcset(srcset: str) -> Sequence[str]:
+    """
+    Return the URLs of a `srcset` attribute (e.g. `foo.png 1x, foo@2x.png 2x`).
+
+    URLs are separated from their descriptors by spaces and may contain commas (e.g. data
+    URLs), so splitting on commas isn't enough.
+    """
+
+    urls = []
+    position = 0
+
+    while True:
+        while position < len(srcset) and (
+            srcset[position].isspace() or srcset[position] == ","
+        ):
+            position += 1
+
+        if position >= len(srcset):
+            return urls
+
+        start = position
+
+        while position < len(srcset) and not srcset[position].isspace():
+            position += 1
+
+        url = srcset[start:position]
+
+        if url.endswith(","):
+            url = url.rstrip(",")
+        else:
+            depth = 0
+
+            while position < len(srcset):
+                char = srcset[position]
+
+                if char == "(":
+                    depth += 1
+                elif char == ")":
+                    depth = max(depth - 1, 0)
+                elif char == "," and depth == 0:
+                    break
+
+                position += 1
+
+        if url:
+            urls.append(url)
+
+
+@dataclass(frozen=True)
+class Ref:
+    href: str
+    kind: LinkKind
+
+
+@dataclass(frozen=True)
+class Scan:
+    """
+    Raw data found in an HTML document.
+
+    `anchors` are the targets of URL fragments (`id` attributes and names of `<a>`
+    elements).
+    """
+
+    refs: Sequence[Ref]
+    anchors: frozenset[str]
+
+
+def get_resource_refs(tag: bs4.Tag, kinds: AbstractSet[LinkKind]) -> Iterator[Ref]:
+    if tag.name == "link":
+        href = tag.attrs.get("href")
+        rels = tag.attrs.get("rel") or []
+
+        if not isinstance(href, str):
+            return
+
+        if isinstance(rels, str):
+            rels = rels.split()
+
+        for rel in rels:
+            kind = LINK_RELATIONS.get(rel.lower())
+
+            if kind is not None and kind in kinds:
+                yield Ref(href=href, kind=kind)
+                return
+
+        return
+
+    for attribute, kind in RESOURCE_ATTRIBUTES.get(tag.name, ()):
+        if kind not in kinds or not isinstance(value := tag.attrs.get(attribute), str):
+            continue
+
+        if attribute == "srcset":
+            for href in parse_srcset(value):
+                yield Ref(href=href, kind=kind)
+        else:
+            yield Ref(href=value, kind=kind)
+
+
+def scan(body: str, kinds: AbstractSet[LinkKind] = frozenset([LinkKind.LINK])) -> Scan:
+    """
+    Collect links and anchors of an HTML document in a single pass over its elements.
+
+    Only links of the given kinds are collected.
+    """
 
-def get_hrefs(body: str) -> Sequence[str]:
     with warnings.catch_warnings():
         warnings.simplefilter(action="ignore", category=bs4.XMLParsedAsHTMLWarning)
         soup = bs4.BeautifulSoup(body, features="html.parser")
 
-    return [url for a in soup.find_all("a") if (url := a.attrs.get("href")) is not None]
+    refs = []
+    anchors = set()
+    with_resources = any(kind is not LinkKind.LINK for kind in kinds)
+
+    for tag in soup.find_all(True):
+        if isinstance(anchor := tag.attrs.get("id"), str):
+            anchors.add(anchor)
+
+        if tag.name == "a":
+            if LinkKind.LINK in kinds and isinstance(href := tag.attrs.get("href"), str):
+                refs.append(Ref(href=href, kind=LinkKind.LINK))
+
+            if isinstance(name := tag.attrs.get("name"), str):
+                anchors.add(name)
+        elif with_resources:
+            refs.extend(get_resource_refs(tag, kinds=kinds))
+
+    return Scan(refs=refs, anchors=frozenset(anchors))
+
+
+def body_digest(body: str) -> str:
+    return hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
 
 
-def parse_href(href: str, base_url: Url) -> Optional[Url]:
+@dataclass
+class ScanCache:
+    """
+    Scans of page bodies by digest, so that pages served identically under several URLs
+    (e.g. with session IDs or on mirrors) are only parsed once.
+
+    Scans are independent of the URL of pages since they hold hrefs as written. The
+    oldest ones are evicted beyond `max_size` entries.
+
+    The cache can be shared by threads (see `parsing.ParsePool`). Locks are striped by
+    digest: a body being scanned by a thread isn't scanned again by another, while
+    different bodies are scanned in parallel.
+    """
+
+    max_size: int = 10_000
+    scans: dict[str, Scan] = field(default_factory=dict)
+    stripes: Sequence[threading.Lock] = field(
+        default_factory=lambda: [threading.Lock() for _ in range(SCAN_LOCK_STRIPES)]
+    )
+    # Guards the eviction of scans, which may belong to any stripe.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def scan(self, body: str, digest: str, kinds: AbstractSet[LinkKind]) -> Scan:
+        with self.stripes[int(digest[:8], 16) % len(self.stripes)]:
+            cached = self.scans.get(digest)
+
+            if cached is not None:
+                return cached
+
+            result = scan(body, kinds=kinds)
+
+            with self.lock:
+                if len(self.scans) >= self.max_size:
+                    del self.scans[next(iter(self.scans))]
+
+                self.scans[digest] = result
+
+        return result
+
+
+def get_hrefs(body: str) -> Sequence[str]:
+    return [ref.href for ref in scan(body).refs]
+
+
+def has_anchor(anchors: frozenset[str], fragment: str) -> bool:
+    """
+    Tell whether a URL fragment points to an existing anchor.
+
+    Like browsers, this accepts the empty fragment and `top`, which point to the top of
+    the document.
+    """
+
+    return fragment in ("", "top") or fragment in anchors or unquote(fragment) in anchors
+
+
+def parse_href(
+    href: str,
+    base_url: Url,
+    canonicalizer: Optional[Canonicalizer] = None,
+) -> Optional[Url]:
     """
     Parse the value of an `href` HTML attribute into a URL.
 
-    If the link is relative, we need the base URL to infer the absolute URL.
+    If the link is relative, we need the base URL to infer the absolute URL. If a
+    canonicalizer is given, the URL is put in canonical form.
     """
 
     (href, _) = urldefrag(href)
@@ -36,12 +247,44 @@ def parse_href(href: str, base_url: Url) -> Optional[Url]:
     else:
         url = urljoin(base_url.full, href)
 
+    if canonicalizer is not None:
+        url = canonicalizer.canonicalize(url)
+
     return Url.from_str(url)
 
 
-def get_links(body: str, url: Url) -> Sequence[Link]:
-    return [
-        Link(href=href, url=link_url)
-        for href in get_hrefs(body)
-        if (link_url := parse_href(href, base_url=url)) is not None
+@dataclass(frozen=True)
+class Document:
+    links: Sequence[Link]
+    anchors: frozenset[str]
+    # Digest of the body, identical for pages with the same content.
+    digest: Optional[str] = None
+
+
+def parse_document(
+    body: str,
+    url: Url,
+    kinds: AbstractSet[LinkKind],
+    canonicalizer: Optional[Canonicalizer] = None,
+    scans: Optional[ScanCache] = None,
+) -> Document:
+    """
+    Extract links and anchors from an HTML page.
+
+    With a scan cache, pages with the same body as a previous page aren't parsed again:
+    the hrefs of that page are resolved relative to the URL of the new one.
+    """
+
+    digest = body_digest(body)
+    result = (
+        scan(body, kinds=kinds)
+        if scans is None
+        else scans.scan(body, digest=digest, kinds=kinds)
+    )
+    links = [
+        Link(href=ref.href, url=link_url, kind=ref.kind)
+        for ref in result.refs
+        if (link_url := parse_href(ref.href, base_url=url, canonicalizer=canonicalizer))
+        is not None
     ]
+    return Document(links=links, anchors=result.anchors, digest=digest)
@@ -0,0 +1,183 @@
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from . import outcome
+from .core import Link, LinkKind, Url
+from .export import result_from_json, result_to_json
+from .url_store import UrlInfo
+
+
+def info_to_json(info: UrlInfo) -> Any:
+    return {
+        "result": result_to_json(info.result),
+        "links": (
+            None
+            if info.links is None
+            else [
+                {"href": link.href, "url": link.url.full, "kind": link.kind.value}
+                for link in info.links
+            ]
+        ),
+        "anchors": None if info.anchors is None else sorted(info.anchors),
+        "digest": info.digest,
+    }
+
+
+def info_from_json(obj: Any) -> UrlInfo:
+    """
+    Build URL information from its JSON representation.
+
+    Transfer sizes aren't saved: they only make sense for the crawl which measured them.
+    """
+
+    return UrlInfo(
+        result=result_from_json(obj["result"]),
+        links=(
+            None
+            if obj["links"] is None
+            else [
+                Link(
+                    href=link["href"],
+                    url=Url.from_str(link["url"]),
+                    kind=LinkKind(link["kind"]),
+                )
+                for link in obj["links"]
+            ]
+        ),
+        anchors=None if obj["anchors"] is None else frozenset(obj["anchors"]),
+        digest=obj["digest"],
+    )
+
+
+@dataclass
+class LinkIndex:
+    """
+    Results of a crawl saved on disk, to check only the pages which changed since then.
+
+    Along with what was learned about each URL (including the links found on pages), the
+    index keeps the reverse links: for each URL, the pages and redirects leading to it.
+
+    Use `LinkIndex.open` to create an instance and `close` when done.
+    """
+
+    connection: sqlite3.Connection
+
+    @classmethod
+    def open(cls, path: Path) -> "LinkIndex":
+        connection = sqlite3.connect(path, timeout=30)
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sites (
+                netloc TEXT PRIMARY KEY,
+                url TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                info TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS links (
+                target TEXT NOT NULL,
+                source TEXT NOT NULL,
+                href TEXT NOT NULL,
+                redirect INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS links_target ON links (target);
+            """
+        )
+        connection.commit()
+        return cls(connection=connection)
+
+    def save(
+        self, site_urls: Mapping[str, Url], url_infos: Mapping[Url, UrlInfo]
+    ) -> None:
+        """
+        Replace the saved crawl with the given one.
+        """
+
+        with self.connection:
+            for table in ("sites", "urls", "links"):
+                self.connection.execute(f"DELETE FROM {table}")
+
+            self.connection.executemany(
+                "INSERT INTO sites VALUES (?, ?)",
+                ((netloc, url.full) for (netloc, url) in site_urls.items()),
+            )
+            self.connection.executemany(
+                "INSERT INTO urls VALUES (?, ?)",
+                (
+                    (url.full, json.dumps(info_to_json(info)))
+                    for (url, info) in url_infos.items()
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO links VALUES (?, ?, ?, ?)",
+                (
+                    row
+                    for (url, info) in url_infos.items()
+                    for row in reverse_links(url, info)
+                ),
+            )
+
+    def load(self) -> tuple[dict[str, Url], dict[Url, UrlInfo]]:
+        """
+        Return the sites (keyed by network location) and URL information of the saved
+        crawl.
+        """
+
+        site_urls = {
+            netloc: Url.from_str(url)
+            for (netloc, url) in self.connection.execute("SELECT netloc, url FROM sites")
+        }
+        url_infos = {
+            Url.from_str(url): info_from_json(json.loads(info))
+            for (url, info) in self.connection.execute("SELECT url, info FROM urls")
+        }
+        return (site_urls, url_infos)
+
+    def referrers(self, url: Url) -> list[tuple[Url, str, bool]]:
+        """
+        Return the URLs linking to a URL, with the `href` of each link and whether it is a
+        redirect.
+        """
+
+        return [
+            (Url.from_str(source), href, bool(redirect))
+            for (source, href, redirect) in self.connection.execute(
+                "SELECT source, href, redirect FROM links WHERE target = ?",
+                (url.full,),
+            )
+        ]
+
+    def affected(self, urls: Iterable[Url]) -> frozenset[Url]:
+        """
+        Return the pages whose link results depend on the given URLs: the pages linking to
+        them, directly or through redirects.
+        """
+
+        pages = set()
+        visited = set(urls)
+        pending = list(visited)
+
+        while pending:
+            for source, _, redirect in self.referrers(pending.pop()):
+                if not redirect:
+                    pages.add(source)
+                elif source not in visited:
+                    visited.add(source)
+                    pending.append(source)
+
+        return frozenset(pages)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def reverse_links(url: Url, info: UrlInfo) -> Iterable[tuple[str, str, str, bool]]:
+    if isinstance(info.result, outcome.Redirect):
+        yield (info.result.url.full, url.full, info.result.ref, True)
+
+    for link in info.links or ():
+        yield (link.url.full, url.full, link.href, False)
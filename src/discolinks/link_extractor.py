@@ -1,19 +1,29 @@
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from typing import AbstractSet, Optional
 
 from . import html, outcome
-from .core import Link, Url
+from .canonical import Canonicalizer
+from .core import LinkKind, Url
 
 
 @dataclass(frozen=True)
-class LinkExtractor(outcome.Converter[Optional[Sequence[Link]]]):
+class LinkExtractor(outcome.Converter[Optional[html.Document]]):
     url: Url
+    kinds: AbstractSet[LinkKind]
+    canonicalizer: Optional[Canonicalizer] = None
+    scans: Optional[html.ScanCache] = None
 
     def convert_redirect(self, redirect: outcome.Redirect) -> None:
         return None
 
-    def convert_page(self, page: outcome.Page) -> Sequence[Link]:
-        return html.get_links(body=page.body, url=self.url)
+    def convert_page(self, page: outcome.Page) -> html.Document:
+        return html.parse_document(
+            body=page.body,
+            url=self.url,
+            kinds=self.kinds,
+            canonicalizer=self.canonicalizer,
+            scans=self.scans,
+        )
 
     def convert_request_error(self, error: outcome.RequestError) -> None:
         return None
@@ -24,7 +34,24 @@ class LinkExtractor(outcome.Converter[Optional[Sequence[Link]]]):
     def convert_unknown(self, unknown: outcome.Unknown) -> None:
         return None
 
+    def convert_missing_fragment(self, missing: outcome.MissingFragment) -> None:
+        return None
+
+    def convert_skipped(self, skipped: outcome.Skipped) -> None:
+        return None
+
 
-def get_links(url: Url, result: outcome.Result) -> Optional[Sequence[Link]]:
-    converter = LinkExtractor(url=url)
+def get_document(
+    url: Url,
+    result: outcome.Result,
+    kinds: AbstractSet[LinkKind],
+    canonicalizer: Optional[Canonicalizer] = None,
+    scans: Optional[html.ScanCache] = None,
+) -> Optional[html.Document]:
+    converter = LinkExtractor(
+        url=url,
+        kinds=kinds,
+        canonicalizer=canonicalizer,
+        scans=scans,
+    )
     return result.convert_with(converter)
@@ -0,0 +1,116 @@
+import asyncio
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .core import Url
+
+logger = logging.getLogger(__name__)
+
+
+def has_uvloop() -> bool:
+    return importlib.util.find_spec("uvloop") is not None
+
+
+def new_event_loop(uvloop: bool = False) -> asyncio.AbstractEventLoop:
+    """
+    Create an event loop, from `uvloop` if requested (see `has_uvloop`).
+    """
+
+    if uvloop:
+        return importlib.import_module("uvloop").new_event_loop()
+
+    return asyncio.new_event_loop()
+
+
+@dataclass(frozen=True)
+class Stall:
+    # Time in seconds during which the event loop couldn't run anything else.
+    duration: float
+    url: Optional[Url]
+    stage: str
+
+    def label(self) -> str:
+        target = "" if self.url is None else f" {self.url}"
+        return f"{self.duration:.3f} s while {self.stage}{target}"
+
+
+@dataclass
+class LagMonitor:
+    """
+    Measure the scheduling delay of the event loop, and report the stalls longer than
+    `threshold` (in seconds), which happen when some code blocks the loop.
+
+    A task sleeping for `interval` seconds at a time measures how late it wakes up. A
+    thread watches that task so that the stage being processed (see `on_stage`) is
+    captured during a stall, rather than after the code responsible for it is done.
+    """
+
+    threshold: float
+    interval: float = 0.01
+    stalls: list[Stall] = field(default_factory=list)
+    samples: int = 0
+    max_lag: float = 0
+    total_lag: float = 0
+    # Last stage which started, with the URL it is about.
+    activity: tuple[Optional[Url], str] = (None, "idle")
+    # Time of the last heartbeat of the loop.
+    beat: float = field(default_factory=time.monotonic)
+    # Activity seen by the watcher during the current stall, if any.
+    captured: Optional[tuple[Optional[Url], str]] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    stopped: threading.Event = field(default_factory=threading.Event)
+
+    def on_stage(self, url: Optional[Url], stage: str) -> None:
+        self.activity = (url, stage)
+
+    def watch(self) -> None:
+        while not self.stopped.wait(self.interval):
+            late = time.monotonic() - self.beat > self.threshold
+
+            with self.lock:
+                if late and self.captured is None:
+                    self.captured = self.activity
+
+    def on_sample(self, lag: float) -> None:
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+
+        with self.lock:
+            (url, stage) = self.captured or self.activity
+            self.captured = None
+
+        if lag > self.threshold:
+            stall = Stall(duration=lag, url=url, stage=stage)
+            self.stalls.append(stall)
+            logger.warning("Event loop blocked for %s", stall.label())
+
+    async def run(self) -> None:
+        """
+        Sample the loop until cancelled.
+        """
+
+        watcher = threading.Thread(target=self.watch, daemon=True)
+        watcher.start()
+
+        try:
+            while True:
+                self.beat = time.monotonic()
+                await asyncio.sleep(self.interval)
+                self.on_sample(time.monotonic() - self.beat - self.interval)
+        finally:
+            self.stopped.set()
+            watcher.join()
+
+    def summary(self) -> str:
+        mean = self.total_lag / self.samples if self.samples else 0
+        return (
+            f"Event loop lag: {mean * 1000:.1f} ms on average,"
+            f" {self.max_lag * 1000:.1f} ms at most,"
+            f" {len(self.stalls)} stalls over {self.threshold} s"
+        )
@@ -1,11 +1,13 @@
 from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Iterator
+from typing import Iterator, Optional
 
 import rich.console
 import rich.status
 
 from . import outcome
+from .core import Url
+from .loop import LagMonitor
 
 
 @dataclass
@@ -35,23 +37,40 @@ class Monitor:
     """
     Handle updates of the status bar during scraping.
 
-    Create an instance with `start` and finish the execution with `stop`.
+    Create an instance with `start` and finish the execution with `stop`. Instances
+    created without a status bar (e.g. when crawling as a library) only keep stats.
+    Stages of the processing of URLs are passed on to `lag`, if given.
     """
 
-    console: rich.console.Console
-    status: rich.status.Status
+    console: Optional[rich.console.Console] = None
+    status: Optional[rich.status.Status] = None
+    lag: Optional[LagMonitor] = None
     stats: Stats = field(init=False, default_factory=Stats)
 
     @classmethod
-    def start(cls, console: rich.console.Console) -> "Monitor":
+    def start(
+        cls,
+        console: rich.console.Console,
+        lag: Optional[LagMonitor] = None,
+    ) -> "Monitor":
         status = rich.status.Status(status="Working", console=console)
         status.start()
-        return cls(console=console, status=status)
+        return cls(console=console, status=status, lag=lag)
 
     def print(self, msg: str) -> None:
-        self.console.print(msg, markup=False, emoji=False)
+        if self.console is not None:
+            self.console.print(msg, markup=False, emoji=False)
+
+    def on_stage(self, url: Optional[Url], stage: str) -> None:
+        if self.lag is not None:
+            self.lag.on_stage(url, stage)
 
     def _update_status(self) -> None:
+        if self.status is None:
+            return
+
+        self.on_stage(None, "updating the status bar")
+
         self.status.update(
             f"Working:"
             f" [bold blue]{self.stats.queued} [dim white]queued"
@@ -70,16 +89,20 @@ class Monitor:
         self._update_status()
 
     def stop(self) -> None:
-        self.status.stop()
+        if self.status is not None:
+            self.status.stop()
 
 
 @contextmanager
-def new_monitor(console: rich.console.Console) -> Iterator[Monitor]:
+def new_monitor(
+    console: rich.console.Console,
+    lag: Optional[LagMonitor] = None,
+) -> Iterator[Monitor]:
     """
     Yield a `Monitor` instance and ensure it is stopped properly.
     """
 
-    monitor = Monitor.start(console=console)
+    monitor = Monitor.start(console=console, lag=lag)
     try:
         yield monitor
     finally:
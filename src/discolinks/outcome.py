@@ -131,6 +131,57 @@ class Unknown(Result):
         return converter.convert_unknown(self)
 
 
+@dataclass(frozen=True)
+class MissingFragment(Result):
+    """
+    The final page of a link was retrieved but has no anchor matching the fragment of the
+    link (e.g. `bar` in `/foo#bar`).
+    """
+
+    fragment: str
+
+    def ok(self) -> bool:
+        return False
+
+    def status_code(self) -> Optional[int]:
+        return None
+
+    def redirect_url(self) -> Optional[Url]:
+        return None
+
+    def error_msg(self) -> Optional[str]:
+        return f"Fragment not found: #{self.fragment}"
+
+    def convert_with(self, converter: "Converter[Out]") -> Out:
+        return converter.convert_missing_fragment(self)
+
+
+@dataclass(frozen=True)
+class Skipped(Result):
+    """
+    The URL wasn't retrieved because the crawl reached one of its limits (e.g. maximum
+    depth).
+    """
+
+    reason: str
+
+    def ok(self) -> bool:
+        # Nothing is known to be wrong with the link: it just wasn't checked.
+        return True
+
+    def status_code(self) -> Optional[int]:
+        return None
+
+    def redirect_url(self) -> Optional[Url]:
+        return None
+
+    def error_msg(self) -> Optional[str]:
+        return None
+
+    def convert_with(self, converter: "Converter[Out]") -> Out:
+        return converter.convert_skipped(self)
+
+
 @dataclass(frozen=True)
 class Results:
     chain: Sequence[Result]
@@ -139,6 +190,9 @@ class Results:
         final = self.chain[-1]
         return final.ok()
 
+    def skipped(self) -> bool:
+        return isinstance(self.chain[-1], Skipped)
+
     def convert_with(self, converter: "Converter[Out]") -> Sequence[Out]:
         return tuple(item.convert_with(converter) for item in self.chain)
 
@@ -163,3 +217,11 @@ class Converter(ABC, Generic[Out]):
     @abstractmethod
     def convert_unknown(self, unknown: Unknown) -> Out:
         pass
+
+    @abstractmethod
+    def convert_missing_fragment(self, missing: MissingFragment) -> Out:
+        pass
+
+    @abstractmethod
+    def convert_skipped(self, skipped: Skipped) -> Out:
+        pass
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def gil_enabled() -> bool:
+    """
+    Tell whether the GIL is enabled, which is always the case before Python 3.13.
+
+    Free-threaded builds of Python 3.13+ run without it unless an extension module
+    requires it (or `PYTHON_GIL=1` is set).
+    """
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else bool(is_gil_enabled())
+
+
+def default_parse_threads(processes: int = 1) -> int:
+    """
+    Return the number of threads to parse pages with in each of `processes`, when
+    unspecified: enough to use all CPUs.
+
+    With the GIL, threads can't parse pages in parallel, so pages are parsed on the
+    event loop instead (zero threads).
+    """
+
+    return 0 if gil_enabled() else (os.cpu_count() or 1) // processes
+
+
+@dataclass(frozen=True)
+class ParsePool:
+    """
+    Threads to parse pages on, off the event loop.
+
+    Unlike worker processes, threads share memory so page bodies aren't copied to them
+    and they can share a scan cache (see `html.ScanCache`). Pages are only parsed in
+    parallel if the GIL is disabled (see `gil_enabled`).
+    """
+
+    executor: ThreadPoolExecutor
+
+    @classmethod
+    def start(cls, threads: int) -> "ParsePool":
+        executor = ThreadPoolExecutor(
+            max_workers=threads,
+            thread_name_prefix="discolinks-parse",
+        )
+        return cls(executor=executor)
+
+    async def run(self, function: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function)
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
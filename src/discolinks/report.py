@@ -0,0 +1,205 @@
+import asyncio
+import json
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Optional, Sequence, TextIO
+
+from rich.console import Console
+
+from . import text
+from .analyzer import Page, Stats, analyze_page, find_duplicates
+from .core import Url
+from .export import page_to_json
+from .url_store import UrlInfo
+
+
+class PageWriter(ABC):
+    """
+    Output of pages whose results are final, written as they come.
+    """
+
+    @abstractmethod
+    def write_pages(self, pages: Sequence[tuple[Url, Page]]) -> None:
+        pass
+
+    @abstractmethod
+    def finish(self, stats: Stats, duplicates: Sequence[Sequence[Url]]) -> None:
+        pass
+
+
+@dataclass
+class JsonWriter(PageWriter):
+    """
+    Write the same JSON object as `export.dump_json`, one page at a time.
+    """
+
+    with_transfer: bool = False
+    stream: TextIO = field(default_factory=lambda: sys.stdout)
+    started: bool = False
+
+    def write_pages(self, pages: Sequence[tuple[Url, Page]]) -> None:
+        for url, page in pages:
+            obj = page_to_json(page, with_transfer=self.with_transfer)
+            self.stream.write(", " if self.started else "{")
+            self.stream.write(f"{json.dumps(url.full)}: {json.dumps(obj)}")
+            self.started = True
+
+        self.stream.flush()
+
+    def finish(self, stats: Stats, duplicates: Sequence[Sequence[Url]]) -> None:
+        self.stream.write("}\n" if self.started else "{}\n")
+        self.stream.flush()
+
+
+@dataclass
+class TextWriter(PageWriter):
+    """
+    Write broken links line by line, with the summary at the end.
+    """
+
+    with_transfer: bool = False
+    with_duplicates: bool = False
+    console: Console = field(default_factory=Console)
+
+    def write_pages(self, pages: Sequence[tuple[Url, Page]]) -> None:
+        lines = [line for (url, page) in pages for line in text.page_lines(url, page)]
+
+        if lines:
+            self.console.print("\n".join(lines))
+
+    def finish(self, stats: Stats, duplicates: Sequence[Sequence[Url]]) -> None:
+        label = text.stats_label(stats, with_transfer=self.with_transfer)
+        lines = [f"📂 Results: {label}"]
+
+        if self.with_duplicates and duplicates:
+            lines.extend(text.duplicates_lines(duplicates))
+
+        self.console.print("\n".join(lines))
+
+
+@dataclass
+class Reporter:
+    """
+    Report pages during the crawl, as soon as the results of all their links are known.
+
+    `on_store` must be called for every stored URL (see `UrlStore.on_store`). Pages are
+    then written to each writer by `run`, in a background task, until `close` is
+    called. Writes happen in a thread so that a slow output doesn't hold up the crawl.
+    """
+
+    writers: Sequence[PageWriter]
+    queue: asyncio.Queue[Optional[tuple[Url, Page]]] = field(
+        default_factory=asyncio.Queue
+    )
+    stats: Stats = field(default_factory=Stats)
+    # Pages waiting for URLs not stored yet (one entry per link leading to each URL).
+    waiting: dict[Url, list[Url]] = field(default_factory=dict)
+    # Number of entries in `waiting` for each page not reported yet.
+    remaining: dict[Url, int] = field(default_factory=dict)
+
+    def wait_for(self, page: Url, url: Url, url_infos: Mapping[Url, UrlInfo]) -> None:
+        """
+        Make a page wait for the end of the redirect chain starting at a URL, unless
+        that chain is already complete.
+        """
+
+        visited = set()
+
+        while url not in visited:
+            visited.add(url)
+            info = url_infos.get(url)
+
+            if info is None:
+                self.waiting.setdefault(url, []).append(page)
+                self.remaining[page] += 1
+                return
+
+            if (next_url := info.result.redirect_url()) is None:
+                return
+
+            url = next_url
+
+    def on_store(self, url: Url, url_infos: Mapping[Url, UrlInfo]) -> None:
+        info = url_infos[url]
+        pages = self.waiting.pop(url, [])
+
+        for page in pages:
+            self.remaining[page] -= 1
+            self.wait_for(page, url, url_infos)
+
+        if info.links is not None:
+            self.remaining[url] = 0
+            pages.append(url)
+
+            for link_url in {link.url for link in info.links}:
+                self.wait_for(url, link_url, url_infos)
+
+        for page in dict.fromkeys(pages):
+            if self.remaining.get(page) == 0:
+                self.report(page, url_infos)
+
+    def report(self, url: Url, url_infos: Mapping[Url, UrlInfo]) -> None:
+        del self.remaining[url]
+        info = url_infos[url]
+        assert info.links is not None
+        page = analyze_page(url_infos, links=info.links, transfer=info.transfer)
+
+        for link in page.links:
+            self.stats.add(link)
+
+        self.queue.put_nowait((url, page))
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        done = False
+
+        while not done:
+            items = [await self.queue.get()]
+
+            while not self.queue.empty():
+                items.append(self.queue.get_nowait())
+
+            pages = [item for item in items if item is not None]
+            done = len(pages) < len(items)
+
+            for writer in self.writers:
+                await loop.run_in_executor(None, writer.write_pages, pages)
+
+    def close(
+        self,
+        url_infos: Mapping[Url, UrlInfo],
+        pages: Iterable[Url] = (),
+    ) -> None:
+        """
+        Report the pages still waiting for URLs (e.g. after an interruption) and stop.
+
+        `pages` are stored pages to report as well, which `on_store` wasn't called for
+        (e.g. restored from a previous crawl).
+        """
+
+        for page in pages:
+            if url_infos[page].links is not None:
+                self.remaining.setdefault(page, 0)
+
+        for page in list(self.remaining):
+            self.report(page, url_infos)
+
+        self.waiting.clear()
+        self.queue.put_nowait(None)
+
+    def finish(self, url_infos: Mapping[Url, UrlInfo]) -> Stats:
+        """
+        Write the summary once all the pages are written, and return the final stats.
+        """
+
+        for info in url_infos.values():
+            if info.transfer is not None:
+                self.stats.transfer += info.transfer
+
+        duplicates = find_duplicates(url_infos)
+
+        for writer in self.writers:
+            writer.finish(stats=self.stats, duplicates=duplicates)
+
+        return self.stats
@@ -1,17 +1,52 @@
+import importlib.util
 import logging
 import ssl
 from dataclasses import dataclass, field
-from typing import Union
+from typing import Callable, Iterable, Optional, Union
 
 import httpx
 
 from . import outcome
-from .core import Url
+from .cache import ResultCache
+from .concurrency import Throttle
+from .content import ContentPredictor, is_html
+from .core import Transfer, Url
+from .dns import Resolver
 from .excluder import Excluder
+from .robots import Robots
 
 logger = logging.getLogger(__name__)
 
 
+def accept_encoding() -> str:
+    """
+    Return the content encodings we can decode, in order of preference.
+
+    httpx only decodes Brotli and Zstandard if the corresponding optional packages are
+    installed (and Zstandard since httpx 0.28).
+    """
+
+    encodings = ["gzip", "deflate"]
+
+    if any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi")):
+        encodings.insert(0, "br")
+
+    if importlib.util.find_spec("zstandard"):
+        encodings.insert(0, "zstd")
+
+    return ", ".join(encodings)
+
+
+ACCEPT_ENCODING = accept_encoding()
+
+
+def httpx_to_transfer(response: httpx.Response) -> Transfer:
+    return Transfer(
+        wire_bytes=response.num_bytes_downloaded,
+        decoded_bytes=len(response.content),
+    )
+
+
 def httpx_to_result(response: httpx.Response) -> outcome.Result:
     if response.next_request is not None:
         return outcome.Redirect(
@@ -33,27 +68,266 @@ def httpx_to_error(error: Union[httpx.RequestError, ssl.SSLError]) -> str:
     return str(error)
 
 
+def needs_get(response: httpx.Response) -> bool:
+    """
+    Tell whether the response to a `HEAD` isn't enough to know that a page can't have
+    links.
+    """
+
+    if response.status_code == 405:  # method not allowed
+        return True
+
+    content_type = response.headers.get("content-type")
+    return response.is_success and (not content_type or is_html(content_type))
+
+
+async def read(
+    response: httpx.Response,
+    feed: Optional[Callable[[bytes], None]] = None,
+) -> None:
+    """
+    Read the body of a streamed response and close it.
+
+    If `feed` is given, the body of a successful response is passed to it instead.
+    """
+
+    try:
+        if feed is None or not response.is_success:
+            await response.aread()
+        else:
+            async for chunk in response.aiter_bytes():
+                feed(chunk)
+    finally:
+        await response.aclose()
+
+
 @dataclass(frozen=True)
 class Requester:
     excluder: Excluder
-    client: httpx.AsyncClient = field(init=False, default_factory=httpx.AsyncClient)
+    cache: Optional[ResultCache] = None
+    client: httpx.AsyncClient = field(default_factory=httpx.AsyncClient)
+    # Resolver used by the client, if any, to resolve hosts ahead of requests.
+    resolver: Optional[Resolver] = None
+    # Rules of `robots.txt` files, if they are to be followed.
+    robots: Optional[Robots] = None
+    # Adaptive limits of parallel requests, if any.
+    throttle: Optional[Throttle] = None
+    # Predictions of which pages aren't HTML, to only check them with `HEAD`.
+    content: Optional[ContentPredictor] = None
+
+    def prefetch(self, urls: Iterable[Url]) -> None:
+        """
+        Prepare for requests to the given URLs, by resolving their hosts in advance.
+        """
+
+        if self.resolver is not None:
+            self.resolver.prefetch(
+                url for url in urls if not self.excluder.is_excluded(url)
+            )
 
     async def get(self, url: Url, use_head: bool = False) -> outcome.Result:
         """
         Fetch a page from the given HTTP URL.
         """
+
+        (result, _) = await self.request(url=url, use_head=use_head)
+        return result
+
+    async def request(
+        self,
+        url: Url,
+        use_head: bool = False,
+    ) -> tuple[outcome.Result, Optional[Transfer]]:
+        """
+        Fetch a page and return the size of its body too, if there was a response.
+        """
+
+        (result, response) = await self.exchange(url=url, use_head=use_head)
+        return (result, None if response is None else httpx_to_transfer(response))
+
+    async def request_page(
+        self,
+        url: Url,
+    ) -> tuple[outcome.Result, Optional[Transfer], bool]:
+        """
+        Fetch a page of a crawled website, and also return whether it may be an HTML
+        page to extract links from.
+
+        Pages predicted not to be HTML (see `ContentPredictor`) are only checked with a
+        `HEAD`, unless its response shows that a `GET` is needed after all: an HTML or
+        unknown content type, or `HEAD` not being supported.
+        """
+
+        if self.content is not None and self.content.predicts_other(url):
+            (result, response) = await self.exchange(url=url, use_head=True)
+
+            if response is None or not needs_get(response):
+                transfer = None if response is None else httpx_to_transfer(response)
+                return (result, transfer, False)
+
+            logger.debug("Wrong prediction of content for %s", url)
+
+        (result, transfer) = await self.request(url=url)
+        return (result, transfer, True)
+
+    async def exchange(
+        self,
+        url: Url,
+        use_head: bool = False,
+    ) -> tuple[outcome.Result, Optional[httpx.Response]]:
+        """
+        Fetch a page and return the response too, if there was one.
+        """
+
         method = "HEAD" if use_head else "GET"
 
+        if (refusal := await self.screen(url)) is not None:
+            return (refusal, None)
+
+        logger.debug("%s %s", method, url)
+
+        try:
+            response = await self.send(method=method, url=url)
+        except (httpx.RequestError, ssl.SSLError) as error:
+            msg = httpx_to_error(error)
+            return (outcome.RequestError(msg=msg), None)
+
+        content_type = response.headers.get("content-type")
+
+        if self.content is not None and response.is_success and content_type:
+            self.content.learn(url, content_type)
+
+        return (httpx_to_result(response), response)
+
+    async def stream(
+        self,
+        url: Url,
+        feed: Callable[[bytes], None],
+    ) -> tuple[outcome.Result, Optional[Transfer]]:
+        """
+        Fetch a document with a `GET` like `request`, but pass the body of a successful
+        response to `feed` chunk by chunk instead of holding it.
+
+        The result of a successful response has an empty body. Errors raised by `feed`
+        are propagated.
+        """
+
+        if (refusal := await self.screen(url)) is not None:
+            return (refusal, None)
+
+        logger.debug("GET %s (streamed)", url)
+        decoded_bytes = 0
+
+        def count(chunk: bytes) -> None:
+            nonlocal decoded_bytes
+            decoded_bytes += len(chunk)
+            feed(chunk)
+
+        try:
+            response = await self.send(method="GET", url=url, feed=count)
+        except (httpx.RequestError, ssl.SSLError) as error:
+            msg = httpx_to_error(error)
+            return (outcome.RequestError(msg=msg), None)
+
+        if response.is_success:
+            result = outcome.Page(code=response.status_code, body="")
+            transfer = Transfer(
+                wire_bytes=response.num_bytes_downloaded,
+                decoded_bytes=decoded_bytes,
+            )
+            return (result, transfer)
+
+        return (httpx_to_result(response), httpx_to_transfer(response))
+
+    async def screen(self, url: Url) -> Optional[outcome.Result]:
+        """
+        Return the result of a URL which must not be fetched, if any, or wait until it
+        can be fetched according to `robots.txt`.
+        """
+
         if self.excluder.is_excluded(url):
             logger.debug("Excluded: %s", url)
             return outcome.Excluded()
-        else:
-            logger.debug("%s %s", method, url)
+
+        if self.robots is not None:
+            if not await self.robots.allows(url):
+                logger.debug("Disallowed by robots.txt: %s", url)
+                return outcome.Skipped(reason="disallowed by robots.txt")
+
+            await self.robots.wait(url)
+
+        return None
+
+    async def send(
+        self,
+        method: str,
+        url: Url,
+        feed: Optional[Callable[[bytes], None]] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, once the throttle (if any) allows it, and report its outcome to
+        the throttle.
+
+        If `feed` is given, the body of a successful response is passed to it chunk by
+        chunk instead of being read into the response.
+        """
+
+        request = self.client.build_request(
+            method=method,
+            url=url.full,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+        )
+
+        if self.throttle is None:
+            response = await self.client.send(request, stream=True)
+            await read(response, feed=feed)
+            return response
+
+        slot = await self.throttle.acquire(url, method=method)
+        status_code = None
+        latency = None
+        timeout = False
 
         try:
-            response = await self.client.request(method=method, url=url.full)
-        except (httpx.RequestError, ssl.SSLError) as error:
-            msg = httpx_to_error(error)
-            return outcome.RequestError(msg=msg)
+            # The latency is measured until the headers: the time taken by the body
+            # depends on its size more than on the load of the host.
+            response = await self.client.send(request, stream=True)
+            latency = slot.elapsed()
+            status_code = response.status_code
+            await read(response, feed=feed)
+            return response
+        except httpx.TimeoutException:
+            timeout = True
+            raise
+        finally:
+            await self.throttle.release(
+                slot,
+                status_code=status_code,
+                timeout=timeout,
+                latency=latency,
+            )
+
+    async def check(self, url: Url, use_cache: bool = True) -> outcome.Result:
+        """
+        Check that a URL is available, without downloading its content if possible.
+
+        If enabled, results are taken from the cache when they are fresh enough.
+        """
+
+        cache = self.cache if use_cache else None
+
+        if cache is not None and (cached := cache.get(url)) is not None:
+            logger.debug("Cached: %s", url)
+            return cached
+
+        result = await self.get(url=url, use_head=True)
+
+        if result.status_code() == 405:  # method not allowed
+            result = await self.get(url=url)
+
+        if cache is not None and not isinstance(
+            result, (outcome.Excluded, outcome.Skipped)
+        ):
+            cache.put(url, result)
 
-        return httpx_to_result(response)
+        return result
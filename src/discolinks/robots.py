@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import re
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from .core import Url
+
+logger = logging.getLogger(__name__)
+
+# Product token matched against the user agents of `robots.txt` groups.
+USER_AGENT = "discolinks"
+
+# Robots files larger than this are truncated, as allowed by RFC 9309.
+MAX_SIZE = 500 * 1024
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    `Allow` or `Disallow` rule of a `robots.txt` file.
+
+    Patterns without wildcards (the vast majority) are matched as simple prefixes, others
+    are compiled to regular expressions.
+    """
+
+    pattern: str
+    allow: bool
+    regex: Optional[re.Pattern[str]]
+
+    @classmethod
+    def compile(cls, pattern: str, allow: bool) -> "Rule":
+        if "*" not in pattern and not pattern.endswith("$"):
+            return cls(pattern=pattern, allow=allow, regex=None)
+
+        anchored = pattern.endswith("$")
+        parts = (pattern[:-1] if anchored else pattern).split("*")
+        regex = ".*".join(re.escape(part) for part in parts) + ("$" if anchored else "")
+        return cls(pattern=pattern, allow=allow, regex=re.compile(regex))
+
+    def matches(self, path: str) -> bool:
+        if self.regex is None:
+            return path.startswith(self.pattern)
+
+        return self.regex.match(path) is not None
+
+
+@dataclass(frozen=True)
+class RobotsRules:
+    """
+    Rules of a `robots.txt` file which apply to us.
+
+    Rules are sorted so that the first matching one is the most specific (longest
+    pattern, `Allow` winning ties), which is the one to follow according to RFC 9309.
+    """
+
+    rules: Sequence[Rule] = ()
+    crawl_delay: Optional[float] = None
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        return cls(rules=(Rule.compile("/", allow=False),))
+
+    def allows(self, path: str) -> bool:
+        for rule in self.rules:
+            if rule.matches(path):
+                return rule.allow
+
+        return True
+
+
+def parse_robots(text: str, user_agent: str = USER_AGENT) -> RobotsRules:
+    """
+    Parse a `robots.txt` file and keep the rules for the given user agent.
+
+    Groups naming the user agent take precedence over the `*` group. Several matching
+    groups are merged.
+    """
+
+    groups: list[tuple[list[str], list[Rule], list[float]]] = []
+    in_agents = False
+
+    for line in text.splitlines():
+        (key, sep, value) = line.split("#", maxsplit=1)[0].partition(":")
+
+        if not sep:
+            continue
+
+        key = key.strip().lower()
+        value = value.strip()
+
+        if key == "user-agent":
+            if not in_agents:
+                groups.append(([], [], []))
+                in_agents = True
+
+            groups[-1][0].append(value.lower())
+            continue
+
+        in_agents = False
+
+        if not groups:
+            continue
+
+        (_, rules, delays) = groups[-1]
+
+        if key in ("allow", "disallow") and value:
+            rules.append(Rule.compile(value, allow=key == "allow"))
+        elif key == "crawl-delay":
+            try:
+                delays.append(float(value))
+            except ValueError:
+                pass
+
+    token = user_agent.lower()
+    matching = [group for group in groups if token in group[0]] or [
+        group for group in groups if "*" in group[0]
+    ]
+    rules = [rule for (_, group_rules, _) in matching for rule in group_rules]
+    delays = [delay for (_, _, group_delays) in matching for delay in group_delays]
+    return RobotsRules(
+        rules=tuple(sorted(rules, key=lambda rule: (-len(rule.pattern), not rule.allow))),
+        crawl_delay=max(delays) if delays else None,
+    )
+
+
+def origin(url: Url) -> str:
+    return f"{url.scheme}://{url.netloc}"
+
+
+def robots_path(url: Url) -> str:
+    parts = urlsplit(url.full)
+    path = parts.path or "/"
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+@dataclass
+class Robots:
+    """
+    `robots.txt` rules of the hosts being requested, each fetched only once.
+
+    Missing files (4xx status codes) allow everything, while server errors (5xx) disallow
+    everything, as required by RFC 9309. Files which can't be requested at all allow
+    everything, so that the requests to the host fail with the actual error instead.
+    `Crawl-delay` is honored by spacing requests to a host.
+    """
+
+    client: httpx.AsyncClient
+    user_agent: str = USER_AGENT
+    rules: dict[str, Union[RobotsRules, asyncio.Task[RobotsRules]]] = field(
+        init=False, default_factory=dict
+    )
+    # Time after which the next request to each host can be made.
+    next_slots: dict[str, float] = field(init=False, default_factory=dict)
+
+    async def fetch(self, site: str) -> RobotsRules:
+        url = f"{site}/robots.txt"
+        logger.debug("GET %s", url)
+
+        try:
+            response = await self.client.get(url, follow_redirects=True)
+        except (httpx.RequestError, ssl.SSLError) as error:
+            logger.debug("Can't retrieve %s: %s", url, error)
+            return RobotsRules()
+
+        if response.status_code >= 500:
+            logger.debug("Can't retrieve %s: %d", url, response.status_code)
+            return RobotsRules.disallow_all()
+
+        if response.status_code != 200:
+            return RobotsRules()
+
+        return parse_robots(response.text[:MAX_SIZE], user_agent=self.user_agent)
+
+    async def get_rules(self, url: Url) -> RobotsRules:
+        key = origin(url)
+        rules = self.rules.get(key)
+
+        if isinstance(rules, RobotsRules):
+            return rules
+
+        if rules is None:
+            rules = asyncio.create_task(self.fetch(key))
+            self.rules[key] = rules
+
+        # Requests to a new host all wait for the same download.
+        result = await asyncio.shield(rules)
+        self.rules[key] = result
+        return result
+
+    async def allows(self, url: Url) -> bool:
+        rules = await self.get_rules(url)
+        return rules.allows(robots_path(url))
+
+    async def wait(self, url: Url) -> None:
+        """
+        Wait until a request to the host of a URL complies with its crawl delay.
+        """
+
+        rules = await self.get_rules(url)
+
+        if not rules.crawl_delay:
+            return
+
+        now = time.monotonic()
+        key = origin(url)
+        slot = max(now, self.next_slots.get(key, now))
+        self.next_slots[key] = slot + rules.crawl_delay
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+
+from .canonical import Canonicalizer
+from .core import LinkKind, Url
+
+
+@dataclass(frozen=True)
+class Scope:
+    """
+    Decide how each discovered URL is checked.
+
+    Pages of the crawled websites, identified by their network location (e.g.
+    `example.net:8000`), are downloaded so that their links can be followed, while other
+    URLs are only checked for availability. Links of the given kinds are extracted from
+    pages, but only regular links lead to pages: embedded resources are only checked.
+    Extracted URLs are put in canonical form so that equivalent URLs are fetched once.
+    """
+
+    sites: frozenset[str]
+    extract_links: bool = True
+    kinds: frozenset[LinkKind] = frozenset([LinkKind.LINK])
+    canonicalizer: Canonicalizer = field(default_factory=Canonicalizer)
+
+    def is_internal(self, url: Url) -> bool:
+        return url.netloc in self.sites
+
+    def should_extract_links(self, url: Url) -> bool:
+        return self.extract_links and self.is_internal(url)
@@ -0,0 +1,295 @@
+import hashlib
+import math
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from .core import Url
+
+# False positive rate of Bloom filters in front of fingerprint tables.
+BLOOM_ERROR_RATE = 0.01
+
+# Capacity of the first filter of growing Bloom filters, and the factor applied to the
+# error rate of each next one.
+BLOOM_INITIAL_CAPACITY = 2**16
+BLOOM_TIGHTENING = 0.5
+
+# Width in bits of the fingerprints which can be stored, with their array type codes.
+FINGERPRINT_TYPES = {16: "H", 32: "I", 64: "Q"}
+
+# Maximum share of used slots in fingerprint tables before they grow. Linear probing
+# only gets slow beyond that.
+MAX_LOAD = 0.8
+
+
+class SeenUrls(ABC):
+    """
+    URLs discovered during a crawl, so that each of them is only fetched once.
+    """
+
+    @abstractmethod
+    def add(self, url: Url) -> bool:
+        """
+        Add a URL and tell whether it is new.
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def update(self, urls: Iterable[Url]) -> None:
+        for url in urls:
+            self.add(url)
+
+
+@dataclass
+class ExactSeenUrls(SeenUrls):
+    urls: set[Url] = field(default_factory=set)
+
+    def add(self, url: Url) -> bool:
+        if url in self.urls:
+            return False
+
+        self.urls.add(url)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+
+def url_hashes(url: Url) -> tuple[int, int, int]:
+    """
+    Return three independent 64-bit hashes of a URL.
+    """
+
+    digest = hashlib.blake2b(url.full.encode(), digest_size=24).digest()
+    return (
+        int.from_bytes(digest[:8], "little"),
+        int.from_bytes(digest[8:16], "little"),
+        int.from_bytes(digest[16:], "little"),
+    )
+
+
+@dataclass
+class BloomFilter:
+    """
+    Set of hashes with false positives (at `error_rate` for `capacity` items) but no
+    false negatives, in about 1.2 bytes per item for a 1% error rate.
+    """
+
+    capacity: int
+    error_rate: float
+    size: int = field(init=False)
+    hashes: int = field(init=False)
+    bits: bytearray = field(init=False)
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.size = math.ceil(
+            -self.capacity * math.log(self.error_rate) / math.log(2) ** 2
+        )
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, first: int, second: int) -> Iterator[tuple[int, int]]:
+        # Double hashing: the positions are `first + i * second`.
+        for index in range(self.hashes):
+            yield divmod((first + index * second) % self.size, 8)
+
+    def contains(self, first: int, second: int) -> bool:
+        return all(
+            self.bits[byte] & (1 << bit) for (byte, bit) in self.positions(first, second)
+        )
+
+    def add(self, first: int, second: int) -> bool:
+        """
+        Add an item from two of its hashes, and tell whether it may have been added
+        already.
+        """
+
+        present = True
+
+        for byte, bit in self.positions(first, second):
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                present = False
+
+        self.count += not present
+        return present
+
+    def current_error_rate(self) -> float:
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+@dataclass
+class GrowingBloomFilter:
+    """
+    Bloom filter whose memory follows the number of items, with a false positive rate
+    under `error_rate` however many they are.
+
+    Items are added to the last of a series of Bloom filters, and a new one twice as
+    large is added when it is full. The error rates of the filters decrease
+    geometrically so that their sum stays under `error_rate` (see "Scalable Bloom
+    Filters" by Almeida et al.).
+    """
+
+    error_rate: float
+    filters: list[BloomFilter] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.filters.append(
+            BloomFilter(
+                capacity=BLOOM_INITIAL_CAPACITY,
+                error_rate=self.error_rate * (1 - BLOOM_TIGHTENING),
+            )
+        )
+
+    def add(self, first: int, second: int) -> bool:
+        """
+        Add an item from two of its hashes, and tell whether it may have been added
+        already.
+        """
+
+        *previous, last = self.filters
+
+        if any(bloom.contains(first, second) for bloom in previous):
+            return True
+
+        if last.count >= last.capacity:
+            last = BloomFilter(
+                capacity=2 * last.capacity,
+                error_rate=last.error_rate * BLOOM_TIGHTENING,
+            )
+            self.filters.append(last)
+
+        return last.add(first, second)
+
+    def current_error_rate(self) -> float:
+        return 1 - math.prod(1 - bloom.current_error_rate() for bloom in self.filters)
+
+    def size(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+
+def fingerprint_width(capacity: int, error_rate: float, bloom: bool) -> int:
+    """
+    Return the narrowest fingerprints which keep the false positive rate under
+    `error_rate` for `capacity` URLs.
+
+    A new URL is a false positive if its fingerprint is already in the table (and if
+    the Bloom filter, if any, is wrong about it as well).
+    """
+
+    filtered = BLOOM_ERROR_RATE if bloom else 1
+
+    for width in sorted(FINGERPRINT_TYPES):
+        if capacity / 2**width * filtered <= error_rate:
+            return width
+
+    return max(FINGERPRINT_TYPES)
+
+
+@dataclass
+class CompactSeenUrls(SeenUrls):
+    """
+    Fingerprints of URLs, which take much less memory than the URLs themselves.
+
+    Fingerprints are stored in an array used as an open-addressing hash table (with
+    linear probing), which grows to stay at most 80% full. They are wide enough for a
+    false positive rate below `error_rate` with up to `capacity` URLs: then a new URL is
+    taken as seen, and never fetched, with this probability. With the free slots of the
+    table, each fingerprint takes from 1.25 to 2.5 times its width (e.g. 10 to 20 bytes
+    for 64 bits).
+
+    With `bloom`, a Bloom filter in front of the table tells most new URLs apart
+    without looking at the table, so that narrower fingerprints are enough.
+    """
+
+    capacity: int = 10_000_000
+    error_rate: float = 1e-6
+    bloom: bool = False
+    width: int = field(init=False)
+    table: array = field(init=False)
+    filter: Optional[GrowingBloomFilter] = field(init=False)
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.width = fingerprint_width(
+            capacity=self.capacity,
+            error_rate=self.error_rate,
+            bloom=self.bloom,
+        )
+        self.table = self.new_table(1024)
+        self.filter = (
+            GrowingBloomFilter(error_rate=BLOOM_ERROR_RATE) if self.bloom else None
+        )
+
+    def new_table(self, size: int) -> array:
+        typecode = FINGERPRINT_TYPES[self.width]
+        return array(typecode, bytes(size * array(typecode).itemsize))
+
+    def insert(self, fingerprint: int, check: bool = True) -> bool:
+        table = self.table
+        mask = len(table) - 1
+        index = fingerprint & mask
+
+        while (slot := table[index]) != 0:
+            if check and slot == fingerprint:
+                return False
+
+            index = (index + 1) & mask
+
+        table[index] = fingerprint
+        return True
+
+    def grow(self) -> None:
+        old_table = self.table
+        self.table = self.new_table(2 * len(old_table))
+
+        for fingerprint in old_table:
+            if fingerprint != 0:
+                self.insert(fingerprint, check=False)
+
+    def add(self, url: Url) -> bool:
+        (first, second, third) = url_hashes(url)
+        # Zero marks empty slots.
+        fingerprint = first & (2**self.width - 1) or 1
+        # URLs missing from the Bloom filter are new for sure.
+        check = self.filter is None or self.filter.add(second, third)
+
+        if not self.insert(fingerprint, check=check):
+            return False
+
+        self.count += 1
+
+        if self.count > MAX_LOAD * len(self.table):
+            self.grow()
+
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def false_positive_rate(self) -> float:
+        """
+        Estimate the probability that a new URL is taken as seen, at this point.
+        """
+
+        filtered = 1 if self.filter is None else self.filter.current_error_rate()
+        return min(1, self.count / 2**self.width * filtered)
+
+    def size(self) -> int:
+        """
+        Return the memory used, in bytes.
+        """
+
+        bloom_size = 0 if self.filter is None else self.filter.size()
+        return len(self.table) * self.table.itemsize + bloom_size
+
+    def summary(self) -> str:
+        return (
+            f"Seen URLs: {self.count} fingerprints of {self.width} bits"
+            f" in {self.size() / 2**20:.1f} MiB,"
+            f" estimated false positive rate {self.false_positive_rate():.1e}"
+        )
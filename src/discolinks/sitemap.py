@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import zlib
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Sequence, cast
+from xml.etree import ElementTree
+
+from . import outcome
+from .canonical import Canonicalizer
+from .core import Link, Transfer, Url
+from .html import parse_href
+from .requester import Requester
+from .url_store import UrlInfo, UrlStore
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def local_name(tag: str) -> str:
+    """
+    Remove the XML namespace from a tag name (e.g. `{http://...}loc` → `loc`).
+    """
+
+    return tag.rsplit("}", maxsplit=1)[-1]
+
+
+@dataclass
+class SitemapParser:
+    """
+    Incremental parser for sitemaps and sitemap indexes.
+
+    Data can be fed chunk by chunk as it is downloaded. Parsed entries are discarded as
+    soon as their location is extracted, so memory doesn't grow with the size of the
+    document, apart from the list of locations itself.
+    """
+
+    parser: ElementTree.XMLPullParser = field(
+        default_factory=lambda: ElementTree.XMLPullParser(events=("start", "end"))
+    )
+    decompressor: Optional["zlib._Decompress"] = None
+    root: Optional[ElementTree.Element] = None
+    locs: list[str] = field(default_factory=list)
+    head: Optional[bytes] = b""
+
+    def feed(self, data: bytes) -> None:
+        if self.head is not None:
+            # Wait until there's enough data to detect compressed sitemaps, which are
+            # usually served as is (e.g. `sitemap.xml.gz`), without a `Content-Encoding`
+            # which would let the HTTP client decompress them.
+            data = self.head + data
+
+            if len(data) < len(GZIP_MAGIC):
+                self.head = data
+                return
+
+            self.head = None
+
+            if data.startswith(GZIP_MAGIC):
+                self.decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+
+        if self.decompressor is not None:
+            data = self.decompressor.decompress(data)
+
+        self.parser.feed(data)
+
+        # Only "start" and "end" events are requested, which always come with an element.
+        events = cast(
+            Iterator[tuple[str, ElementTree.Element]], self.parser.read_events()
+        )
+
+        for event, element in events:
+            name = local_name(element.tag)
+
+            if event == "start":
+                if self.root is None:
+                    self.root = element
+            elif name == "loc":
+                if element.text:
+                    self.locs.append(element.text.strip())
+            elif name in ("url", "sitemap") and self.root is not None:
+                self.root.clear()
+
+    def close(self) -> None:
+        if self.head:
+            self.parser.feed(self.head)
+
+        self.parser.close()
+
+    def is_index(self) -> bool:
+        return self.root is not None and local_name(self.root.tag) == "sitemapindex"
+
+
+@dataclass(frozen=True)
+class Sitemap:
+    result: outcome.Result
+    links: Optional[Sequence[Link]]
+    is_index: bool
+    transfer: Optional[Transfer] = None
+
+
+async def fetch_sitemap(
+    requester: Requester,
+    url: Url,
+    canonicalizer: Optional[Canonicalizer] = None,
+) -> Sitemap:
+    """
+    Download and parse a sitemap, without following redirects.
+
+    The sitemap is parsed as it is downloaded, without ever holding the full document.
+    """
+
+    parser = SitemapParser()
+
+    try:
+        (result, transfer) = await requester.stream(url, feed=parser.feed)
+
+        if not isinstance(result, outcome.Page) or not result.ok():
+            return Sitemap(result=result, links=None, is_index=False, transfer=transfer)
+
+        parser.close()
+    except (ElementTree.ParseError, zlib.error) as error:
+        msg = f"Invalid sitemap: {error}"
+        return Sitemap(result=outcome.RequestError(msg=msg), links=None, is_index=False)
+
+    links = [
+        Link(href=loc, url=link_url)
+        for loc in parser.locs
+        if (link_url := parse_href(loc, base_url=url, canonicalizer=canonicalizer))
+        is not None
+    ]
+    return Sitemap(
+        result=result,
+        links=links,
+        is_index=parser.is_index(),
+        transfer=transfer,
+    )
+
+
+async def add_sitemap(
+    requester: Requester,
+    url_store: UrlStore,
+    url: Url,
+    canonicalizer: Optional[Canonicalizer] = None,
+) -> frozenset[Url]:
+    """
+    Store a sitemap and the sitemaps it refers to, and return the new URLs they list.
+
+    Sitemaps are stored like pages whose links are their entries, so that broken entries
+    are reported like any other broken link. Their redirects are followed and stored like
+    those of pages.
+    """
+
+    sitemap = await fetch_sitemap(
+        requester=requester,
+        url=url,
+        canonicalizer=canonicalizer,
+    )
+    new_urls = url_store.add_page(
+        url=url,
+        info=UrlInfo(
+            result=sitemap.result,
+            links=sitemap.links,
+            transfer=sitemap.transfer,
+        ),
+    )
+    # Redirects beyond the limit are stored as errors.
+    redirect_url = url_store.get_url_infos()[url].result.redirect_url()
+
+    if redirect_url is not None:
+        if redirect_url not in new_urls:
+            return frozenset()
+
+        return await add_sitemap(
+            requester=requester,
+            url_store=url_store,
+            url=redirect_url,
+            canonicalizer=canonicalizer,
+        )
+
+    if not sitemap.is_index:
+        logger.info("Found %d new URLs in sitemap %s", len(new_urls), url)
+        return new_urls
+
+    children = await asyncio.gather(
+        *(
+            add_sitemap(
+                requester=requester,
+                url_store=url_store,
+                url=child_url,
+                canonicalizer=canonicalizer,
+            )
+            for child_url in new_urls
+        )
+    )
+    return frozenset().union(*children)
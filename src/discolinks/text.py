@@ -1,15 +1,23 @@
 from dataclasses import dataclass
+from typing import Sequence
 
 from rich import print
 from rich.markup import escape
 from rich.tree import Tree
 
 from . import analyzer, outcome
+from .core import LinkKind, Transfer, Url
+
+# Maximum number of broken links shown as a tree, which takes a long time to render.
+TREE_MAX_LINKS = 1000
 
 
 @dataclass(frozen=True)
 class Converter(outcome.Converter[str]):
     def convert_page(self, page: outcome.Page) -> str:
+        if page.ok():
+            return escape(str(page.code))
+
         return f"[red]{escape(str(page.code))}[/red]"
 
     def convert_redirect(self, redirect: outcome.Redirect) -> str:
@@ -24,16 +32,61 @@ class Converter(outcome.Converter[str]):
     def convert_unknown(self, unknown: outcome.Unknown) -> str:
         raise AssertionError("`Unknown` result isn't supposed to be shown")
 
+    def convert_missing_fragment(self, missing: outcome.MissingFragment) -> str:
+        return f"[red]#{escape(missing.fragment)} not found[/red]"
+
+    def convert_skipped(self, skipped: outcome.Skipped) -> str:
+        return f"skipped ({escape(skipped.reason)})"
+
+
+def size_label(size: int) -> str:
+    if size < 1000:
+        return f"{size} B"
+
+    units = ["kB", "MB", "GB"]
+    value = size / 1000
+
+    while value >= 1000 and len(units) > 1:
+        value /= 1000
+        units.pop(0)
+
+    return f"{value:.1f} {units[0]}"
+
+
+def transfer_label(transfer: Transfer) -> str:
+    return (
+        f"[bold]{size_label(transfer.wire_bytes)}[/bold] transferred"
+        f" ({size_label(transfer.decoded_bytes)} decoded)"
+    )
+
 
-def print_results(analysis: analyzer.Analysis) -> None:
-    failed_style = "bold dim" if analysis.ok() else "bold red"
-    root_label = (
-        f"📂 Results: [bold]{analysis.stats.total}[/bold] links"
-        f" ([bold green]{analysis.stats.ok}[/bold green] ok,"
-        f" [{failed_style}]{analysis.stats.failed}[/{failed_style}] failed)"
+def stats_label(stats: analyzer.Stats, with_transfer: bool = False) -> str:
+    failed_style = "bold dim" if stats.failed == 0 else "bold red"
+    label = (
+        f"[bold]{stats.total}[/bold] links"
+        f" ([bold green]{stats.ok}[/bold green] ok,"
+        f" [{failed_style}]{stats.failed}[/{failed_style}] failed"
     )
-    tree = Tree(root_label, guide_style="dim")
 
+    if stats.skipped:
+        label += f", [bold yellow]{stats.skipped}[/bold yellow] skipped"
+
+    label += ")"
+
+    if with_transfer:
+        label += f", {transfer_label(stats.transfer)}"
+
+    return label
+
+
+def link_label(link: analyzer.LinkResult) -> str:
+    items = link.results.convert_with(Converter())
+    results = " → ".join(items)
+    kind = "" if link.kind is LinkKind.LINK else f" ({link.kind.value})"
+    return f"🔗 [blue]{escape(link.href)}[/blue]{kind}: {results}"
+
+
+def add_pages(tree: Tree, analysis: analyzer.Analysis) -> None:
     for url, info in analysis.pages.items():
         bad_links = [link for link in info.links if not link.ok()]
 
@@ -43,8 +96,108 @@ def print_results(analysis: analyzer.Analysis) -> None:
         branch = tree.add(f"📄 {escape(str(url))}", style="bold")
 
         for link in bad_links:
-            items = link.results.convert_with(Converter())
-            results = " → ".join(items)
-            branch.add(f"🔗 [blue]{escape(link.href)}[/blue]: {results}")
+            branch.add(link_label(link))
+
+
+def page_lines(url: Url, page: analyzer.Page) -> Sequence[str]:
+    """
+    Return the lines showing the broken links of a page, if any, without a tree.
+    """
+
+    bad_links = [link for link in page.links if not link.ok()]
+
+    if not bad_links:
+        return []
+
+    return [
+        f"📄 [bold]{escape(str(url))}[/bold]",
+        *(f"    {link_label(link)}" for link in bad_links),
+    ]
+
+
+def duplicates_lines(duplicates: Sequence[Sequence[Url]]) -> Sequence[str]:
+    return [
+        f"🪞 [bold]{len(duplicates)}[/bold] groups of identical pages",
+        *(f"    {' = '.join(escape(str(url)) for url in group)}" for group in duplicates),
+    ]
+
+
+def print_lines(
+    analysis: analyzer.Analysis,
+    by_site: bool = False,
+    with_transfer: bool = False,
+    with_duplicates: bool = False,
+) -> None:
+    """
+    Print broken links line by line, which is much faster than a tree for huge outputs.
+    """
+
+    lines = [f"📂 Results: {stats_label(analysis.stats, with_transfer=with_transfer)}"]
+    sites = (analyzer.split_by_site(analysis) if by_site else {"": analysis}).items()
+
+    for site, site_analysis in sites:
+        if site:
+            label = stats_label(site_analysis.stats, with_transfer=with_transfer)
+            lines.append(f"🌐 [bold]{escape(site)}[/bold]: {label}")
+
+        for url, page in site_analysis.pages.items():
+            lines.extend(page_lines(url, page))
+
+    if with_duplicates and analysis.duplicates:
+        lines.extend(duplicates_lines(analysis.duplicates))
+
+    print("\n".join(lines))
+
+
+def add_duplicates(tree: Tree, duplicates: Sequence[Sequence[Url]]) -> None:
+    branch = tree.add(f"🪞 [bold]{len(duplicates)}[/bold] groups of identical pages")
+
+    for group in duplicates:
+        group_branch = branch.add(f"{len(group)} pages", style="bold")
+
+        for url in group:
+            group_branch.add(f"📄 {escape(str(url))}")
+
+
+def print_results(
+    analysis: analyzer.Analysis,
+    by_site: bool = False,
+    with_transfer: bool = False,
+    with_duplicates: bool = False,
+) -> None:
+    """
+    Print a tree of broken links, optionally grouping pages by website.
+
+    With `with_transfer`, the number of downloaded bytes is shown for the whole crawl and
+    for each website. With `with_duplicates`, groups of pages with identical bodies are
+    listed after broken links.
+
+    Beyond `TREE_MAX_LINKS` broken links, results are printed line by line instead.
+    """
+
+    if analysis.stats.failed > TREE_MAX_LINKS:
+        print_lines(
+            analysis=analysis,
+            by_site=by_site,
+            with_transfer=with_transfer,
+            with_duplicates=with_duplicates,
+        )
+        return
+
+    tree = Tree(
+        f"📂 Results: {stats_label(analysis.stats, with_transfer=with_transfer)}",
+        guide_style="dim",
+    )
+
+    if by_site:
+        for site, site_analysis in analyzer.split_by_site(analysis).items():
+            label = stats_label(site_analysis.stats, with_transfer=with_transfer)
+            branch = tree.add(f"🌐 [bold]{escape(site)}[/bold]: {label}")
+            add_pages(tree=branch, analysis=site_analysis)
+    else:
+        add_pages(tree=tree, analysis=analysis)
+
+    if with_duplicates and analysis.duplicates:
+        add_duplicates(tree=tree, duplicates=analysis.duplicates)
 
     print(tree)
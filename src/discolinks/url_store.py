@@ -1,14 +1,41 @@
-from dataclasses import dataclass, field
-from typing import Mapping, Optional, Sequence
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Callable, Mapping, Optional, Sequence
+from urllib.parse import urlsplit
 
 from . import outcome
-from .core import Link, Url
+from .core import Link, LinkKind, Transfer, Url
+from .html import Document
+from .seen import ExactSeenUrls, SeenUrls
 
 
 @dataclass(frozen=True)
 class UrlInfo:
     result: outcome.Result
     links: Optional[Sequence[Link]]
+    anchors: Optional[frozenset[str]] = None
+    # Only known for URLs which were downloaded.
+    transfer: Optional[Transfer] = None
+    # Digest of the body of parsed pages.
+    digest: Optional[str] = None
+
+    @classmethod
+    def from_document(
+        cls,
+        result: outcome.Result,
+        document: Optional[Document],
+        transfer: Optional[Transfer] = None,
+    ) -> "UrlInfo":
+        if document is None:
+            return cls(result=result, links=None, transfer=transfer)
+
+        return cls(
+            result=result,
+            links=document.links,
+            anchors=document.anchors,
+            transfer=transfer,
+            digest=document.digest,
+        )
 
     def link_urls(self) -> frozenset[Url]:
         redirect_url = self.result.redirect_url()
@@ -20,27 +47,182 @@ class UrlInfo:
         else:
             return frozenset(link.url for link in self.links)
 
+    def compact(self) -> "UrlInfo":
+        """
+        Return a copy without the page body, which is useless once links are extracted.
+        """
+
+        if isinstance(self.result, outcome.Page):
+            return replace(self, result=replace(self.result, body=""))
+
+        return self
+
+
+@dataclass(frozen=True)
+class Limits:
+    """
+    Bounds on the pages crawled, for websites with effectively infinite pages (e.g.
+    calendars or faceted search).
+
+    The depth of a page is the number of links leading to it from a start URL (redirects
+    excluded). Path budgets limit the number of pages whose path starts with a given
+    prefix (e.g. `/calendar/`).
+    """
+
+    max_depth: Optional[int] = None
+    max_pages: Optional[int] = None
+    path_budgets: Mapping[str, int] = field(default_factory=dict)
+
+    def budgets(self) -> Mapping[str, int]:
+        """
+        Return all budgets by path prefix, the empty prefix being the overall budget.
+        """
+
+        if self.max_pages is None:
+            return self.path_budgets
+
+        return {"": self.max_pages, **self.path_budgets}
+
 
 @dataclass(frozen=True)
 class UrlStore:
+    max_redirects: int = 20
+    limits: Limits = field(default_factory=Limits)
+    # Called after a URL is stored, with all the URLs stored so far.
+    on_store: Optional[Callable[[Url, Mapping[Url, UrlInfo]], None]] = None
+    # URLs discovered so far (see `CompactSeenUrls` for large crawls).
+    seen_urls: SeenUrls = field(default_factory=ExactSeenUrls)
     url_infos: dict[Url, UrlInfo] = field(init=False, default_factory=dict)
-    seen_urls: set[Url] = field(init=False, default_factory=set)
+    # URLs not stored yet which were only found as embedded resources.
+    resource_urls: set[Url] = field(init=False, default_factory=set)
+    # Number of redirects leading to URLs not stored yet.
+    redirect_hops: dict[Url, int] = field(init=False, default_factory=dict)
+    # Depth of URLs not stored yet (start URLs have a depth of 0).
+    depths: dict[Url, int] = field(init=False, default_factory=dict)
+    # Number of crawled pages for each budget of the limits.
+    page_counts: Counter[str] = field(init=False, default_factory=Counter)
+    # URLs stored from a previous crawl instead of being fetched.
+    restored_urls: set[Url] = field(init=False, default_factory=set)
 
     def add_page(self, url: Url, info: UrlInfo) -> frozenset[Url]:
         """
         Store page information for a given URL and return new URLs.
 
         This can only be called once for each URL and each discovered URL is only returned
-        once.
+        once. A redirect beyond `max_redirects` consecutive ones is stored as an error
+        instead, and its target isn't returned: it is left to other links, if any.
         """
 
         assert url not in self.url_infos, f"URL already stored: {url}"
-        self.url_infos[url] = info
+        hops = self.redirect_hops.pop(url, 0)
+        depth = self.depths.pop(url, 0)
+        redirect_url = info.result.redirect_url()
+
+        if redirect_url is not None and hops >= self.max_redirects:
+            info = UrlInfo(
+                result=outcome.RequestError(msg="Too many redirects"),
+                links=None,
+                transfer=info.transfer,
+            )
+
+        self.store(url, info)
         self.seen_urls.add(url)
-        new_urls = info.link_urls() - self.seen_urls
-        self.seen_urls.update(new_urls)
+        new_urls = frozenset(
+            link_url for link_url in info.link_urls() if self.seen_urls.add(link_url)
+        )
+
+        if redirect_url in new_urls:
+            self.redirect_hops[redirect_url] = hops + 1
+
+        for new_url in new_urls:
+            # A redirect leads to the same page under another URL.
+            self.depths[new_url] = depth if new_url == redirect_url else depth + 1
+
+        if url in self.resource_urls:
+            # Redirects of resources lead to resources.
+            self.resource_urls.remove(url)
+            self.resource_urls.update(new_urls)
+        elif info.links is not None:
+            page_urls = {link.url for link in info.links if link.kind is LinkKind.LINK}
+            self.resource_urls.update(new_urls - page_urls)
+            # URLs found as resources first are pages after all, if not fetched yet.
+            self.resource_urls.difference_update(page_urls)
+
         return new_urls
 
+    def restore(self, url_infos: Mapping[Url, UrlInfo]) -> None:
+        """
+        Store URLs from a previous crawl.
+
+        The URLs they link to are considered seen: they are expected to be restored too,
+        except the ones left out to be fetched again. `on_store` isn't called.
+        """
+
+        links = [link for info in url_infos.values() for link in info.links or ()]
+
+        for url, info in url_infos.items():
+            self.url_infos[url] = info
+            self.seen_urls.add(url)
+            self.seen_urls.update(info.link_urls())
+
+        self.restored_urls.update(url_infos)
+        page_urls = {link.url for link in links if link.kind is LinkKind.LINK}
+        self.resource_urls.difference_update(page_urls)
+        self.resource_urls.update(
+            link.url
+            for link in links
+            if link.url not in page_urls and link.url not in self.url_infos
+        )
+
+    def store(self, url: Url, info: UrlInfo) -> None:
+        self.url_infos[url] = info
+
+        if self.on_store is not None:
+            self.on_store(url, self.url_infos)
+
+    def try_crawl(self, url: Url) -> bool:
+        """
+        Count a page about to be crawled against the limits and return `True`, or store
+        it as skipped and return `False` if it would exceed them.
+
+        A chain of redirects is counted once, as the URL it starts from.
+        """
+
+        if url in self.redirect_hops:
+            return True
+
+        depth = self.depths.get(url, 0)
+        path = urlsplit(url.full).path or "/"
+        budgets = {
+            prefix: budget
+            for (prefix, budget) in self.limits.budgets().items()
+            if path.startswith(prefix)
+        }
+
+        if self.limits.max_depth is not None and depth > self.limits.max_depth:
+            reason = "depth limit"
+        elif exhausted := [
+            prefix
+            for (prefix, budget) in budgets.items()
+            if self.page_counts[prefix] >= budget
+        ]:
+            reason = f"page limit for {exhausted[0]}" if exhausted[0] else "page limit"
+        else:
+            self.page_counts.update(budgets.keys())
+            return True
+
+        self.store(url, UrlInfo(result=outcome.Skipped(reason=reason), links=None))
+        self.depths.pop(url, None)
+        self.redirect_hops.pop(url, None)
+        return False
+
+    def is_resource(self, url: Url) -> bool:
+        """
+        Tell whether a URL was only found as a resource embedded in pages.
+        """
+
+        return url in self.resource_urls
+
     def count(self) -> int:
         return len(self.seen_urls)
 
@@ -1,46 +1,127 @@
 import asyncio
-from typing import AbstractSet
+import functools
+from typing import AbstractSet, Optional
 
 from .core import Url
-from .link_extractor import get_links
+from .html import ScanCache
+from .link_extractor import get_document
 from .monitor import Monitor
+from .parsing import ParsePool
 from .requester import Requester
+from .scope import Scope
 from .url_store import UrlInfo, UrlStore
 
 
+async def fetch_url_info(
+    requester: Requester,
+    scope: Scope,
+    url: Url,
+    resource: bool = False,
+    scans: Optional[ScanCache] = None,
+    monitor: Optional[Monitor] = None,
+    pool: Optional[ParsePool] = None,
+) -> UrlInfo:
+    """
+    Follow HTTP link and return what was learned about it.
+
+    For external websites and embedded resources (or all URLs if link extraction is
+    disabled) this only does a `HEAD` to know if the link is broken or not, so no links
+    are extracted. This is also the case of pages which aren't HTML, if the requester
+    predicts it. Pages are scanned through `scans`, if given, to avoid parsing
+    identical bodies again, and parsed on the threads of `pool`, if given. Stages are
+    reported to `monitor`, if given.
+    """
+
+    if monitor is not None:
+        monitor.on_stage(url, "requesting")
+
+    if resource or not scope.should_extract_links(url):
+        # Only external websites are cached since internal pages change with the crawled
+        # websites.
+        result = await requester.check(url=url, use_cache=not scope.is_internal(url))
+        return UrlInfo(result=result, links=None).compact()
+
+    (result, transfer, html) = await requester.request_page(url=url)
+
+    if monitor is not None:
+        monitor.on_stage(url, "parsing")
+
+    if html and result.ok():
+        parse = functools.partial(
+            get_document,
+            url=url,
+            result=result,
+            kinds=scope.kinds,
+            canonicalizer=scope.canonicalizer,
+            scans=scans,
+        )
+        document = parse() if pool is None else await pool.run(parse)
+    else:
+        document = None
+
+    # Only the extracted data is needed from now on, not the page body.
+    return UrlInfo.from_document(
+        result=result,
+        document=document,
+        transfer=transfer,
+    ).compact()
+
+
+def admit(url_store: UrlStore, scope: Scope, url: Url) -> bool:
+    """
+    Tell whether a URL can be fetched, given the crawl limits.
+
+    Only pages whose links are followed count against the limits: other URLs are only
+    checked.
+    """
+
+    if scope.should_extract_links(url) and not url_store.is_resource(url):
+        return url_store.try_crawl(url)
+
+    return True
+
+
 async def investigate_url(
     requester: Requester,
     url_store: UrlStore,
-    start_url: Url,
+    scope: Scope,
     url: Url,
+    scans: Optional[ScanCache] = None,
+    monitor: Optional[Monitor] = None,
+    pool: Optional[ParsePool] = None,
 ) -> AbstractSet[Url]:
     """
     Follow HTTP link and return new links if any are found.
 
-    For external websites this only does a `HEAD` to know if the link is broken or not, so
-    no new links are returned.
+    Redirects are followed right away instead of going through the queue again, unless
+    their target was already found. Each of them is stored like any other URL.
     """
 
-    if url.netloc != start_url.netloc:
-        result = await requester.get(url=url, use_head=True)
-
-        if result.status_code() == 405:  # method not allowed
-            result = await requester.get(url=url)
+    while True:
+        if not admit(url_store=url_store, scope=scope, url=url):
+            return frozenset()
 
-        return url_store.add_page(
+        info = await fetch_url_info(
+            requester=requester,
+            scope=scope,
             url=url,
-            info=UrlInfo(result=result, links=None),
+            resource=url_store.is_resource(url),
+            scans=scans,
+            monitor=monitor,
+            pool=pool,
         )
 
-    result = await requester.get(url=url)
+        if monitor is not None:
+            monitor.on_stage(url, "storing")
 
-    return url_store.add_page(
-        url=url,
-        info=UrlInfo(
-            result=result,
-            links=(get_links(url=url, result=result) if result.ok() else None),
-        ),
-    )
+        new_urls = url_store.add_page(url=url, info=info)
+        requester.prefetch(new_urls)
+        redirect_url = info.result.redirect_url()
+
+        if redirect_url is None or redirect_url not in new_urls:
+            return new_urls
+
+        url = redirect_url
 
 
 async def work(
@@ -48,7 +129,9 @@ async def work(
     requester: Requester,
     url_store: UrlStore,
     monitor: Monitor,
-    start_url: Url,
+    scope: Scope,
+    scans: Optional[ScanCache] = None,
+    pool: Optional[ParsePool] = None,
 ):
     while True:
         task_url = await queue.get()
@@ -57,8 +140,11 @@ async def work(
             new_urls = await investigate_url(
                 requester=requester,
                 url_store=url_store,
-                start_url=start_url,
+                scope=scope,
                 url=task_url,
+                scans=scans,
+                monitor=monitor,
+                pool=pool,
             )
             for url in new_urls:
                 queue.put_nowait(url)
@@ -0,0 +1,63 @@
+from discolinks import analyzer, outcome
+from discolinks.core import Link, Transfer, Url
+from discolinks.url_store import UrlInfo
+
+FOO = Url.from_str("http://foo.example/")
+FOO_OLD = Url.from_str("http://foo.example/old")
+FOO_NEW = Url.from_str("http://foo.example/new")
+BAR = Url.from_str("http://bar.example/")
+EXTERNAL = Url.from_str("http://external.example/")
+EXTERNAL_NEW = Url.from_str("http://external.example/new")
+START = Url.from_str("http://start.example/")
+
+
+def page(*urls: Url, size: int) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Page(code=200, body=""),
+        links=[Link(href=url.full, url=url) for url in urls],
+        transfer=Transfer(wire_bytes=size, decoded_bytes=size),
+    )
+
+
+def redirect(url: Url, size: int) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Redirect(code=302, ref=url.full, url=url),
+        links=None,
+        transfer=Transfer(wire_bytes=size, decoded_bytes=size),
+    )
+
+
+def checked(size: int) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Page(code=200, body=""),
+        links=None,
+        transfer=Transfer(wire_bytes=size, decoded_bytes=size),
+    )
+
+
+def test_split_by_site_transfer() -> None:
+    url_infos = {
+        START: redirect(FOO, size=1),
+        FOO: page(FOO_OLD, EXTERNAL, size=10),
+        FOO_OLD: redirect(FOO_NEW, size=100),
+        FOO_NEW: page(size=1000),
+        EXTERNAL: redirect(EXTERNAL_NEW, size=10000),
+        EXTERNAL_NEW: checked(size=100000),
+        BAR: page(EXTERNAL, size=1000000),
+    }
+
+    analysis = analyzer.analyze(url_infos)
+    sites = analyzer.split_by_site(analysis)
+
+    assert {site: sites[site].stats.transfer.wire_bytes for site in sites} == {
+        "foo.example": 111110,
+        "bar.example": 1000000,
+        "start.example": 1,
+    }
+    assert (
+        sum(
+            (site_analysis.stats.transfer for site_analysis in sites.values()),
+            Transfer(),
+        )
+        == analysis.stats.transfer
+    )
@@ -0,0 +1,86 @@
+import asyncio
+import gzip
+from pathlib import Path
+
+import httpx
+import pytest
+
+from discolinks.archive import (
+    ArchiveConfig,
+    RecordingTransport,
+    ReplayTransport,
+    archive_transport,
+    read_archive,
+)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/gzip":
+        return httpx.Response(
+            200,
+            headers={"Content-Encoding": "gzip"},
+            content=gzip.compress(b"compressed"),
+        )
+
+    return httpx.Response(200, text=f"{request.method} {request.url.path}")
+
+
+async def fetch(transport: httpx.AsyncBaseTransport, paths: list[str]) -> list[str]:
+    async with httpx.AsyncClient(transport=transport) as client:
+        return [(await client.get(f"http://example.net{path}")).text for path in paths]
+
+
+def test_record_replay(tmp_path: Path) -> None:
+    path = tmp_path / "archive.gz"
+    paths = ["/a", "/gzip", "/a"]
+
+    for _ in range(2):  # The second run appends to the archive.
+        recording = archive_transport(
+            ArchiveConfig(path=path, replay=False),
+            transport=httpx.MockTransport(handler),
+        )
+        assert isinstance(recording, RecordingTransport)
+        assert asyncio.run(fetch(recording, paths)) == ["GET /a", "compressed", "GET /a"]
+
+    exchanges = list(read_archive(path))
+    assert len(exchanges) == 6
+    # Bodies are kept as they were sent.
+    assert exchanges[1].body == gzip.compress(b"compressed")
+
+    replay = ReplayTransport.load(path)
+    assert asyncio.run(fetch(replay, paths)) == ["GET /a", "compressed", "GET /a"]
+
+
+def test_read_truncated(tmp_path: Path) -> None:
+    path = tmp_path / "archive.gz"
+    sizes = []
+
+    for paths in [["/a", "/b"], ["/c"]]:
+        recording = archive_transport(
+            ArchiveConfig(path=path, replay=False),
+            transport=httpx.MockTransport(handler),
+        )
+        asyncio.run(fetch(recording, paths))
+        sizes.append(path.stat().st_size)
+
+    data = path.read_bytes()
+    urls = ["http://example.net/a", "http://example.net/b", "http://example.net/c"]
+
+    # Interrupted at any point while writing the last exchange, which is only read if
+    # its data made it to the file.
+    for size in range(sizes[0] + 1, sizes[1]):
+        path.write_bytes(data[:size])
+        assert [exchange.url for exchange in read_archive(path)] in [urls[:2], urls]
+
+    path.write_bytes(data[: (sizes[0] + sizes[1]) // 2])
+    assert [exchange.url for exchange in read_archive(path)] == urls[:2]
+
+    replay = ReplayTransport.load(path)
+    assert asyncio.run(fetch(replay, ["/a", "/b"])) == ["GET /a", "GET /b"]
+
+
+def test_replay_missing(tmp_path: Path) -> None:
+    replay = ReplayTransport(exchanges={})
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(fetch(replay, ["/a"]))
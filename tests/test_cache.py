@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from discolinks import outcome
+from discolinks.cache import CacheConfig, ResultCache
+from discolinks.core import Url
+
+URL = Url.from_str("https://example.net")
+
+
+def open_cache(path: Path, success_ttl: float, failure_ttl: float) -> ResultCache:
+    config = CacheConfig(
+        path=path / "cache.sqlite",
+        success_ttl=success_ttl,
+        failure_ttl=failure_ttl,
+    )
+    return ResultCache.open(config)
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        outcome.Page(code=200, body=""),
+        outcome.Redirect(
+            code=301, ref="/foo", url=Url.from_str("https://example.net/foo")
+        ),
+        outcome.RequestError(msg="Network timeout"),
+    ],
+)
+def test_cache_across_runs(tmp_path: Path, result: outcome.Result):
+    cache = open_cache(tmp_path, success_ttl=60, failure_ttl=60)
+    cache.put(URL, result)
+    cache.close()
+
+    cache = open_cache(tmp_path, success_ttl=60, failure_ttl=60)
+
+    assert cache.get(URL) == result
+    assert cache.get(Url.from_str("https://example.org")) is None
+
+
+@pytest.mark.parametrize(
+    "result,success_ttl,failure_ttl,expected_hit",
+    [
+        (outcome.Page(code=200, body=""), 60, 0, True),
+        (outcome.Page(code=200, body=""), 0, 60, False),
+        (outcome.Page(code=404, body=""), 60, 0, False),
+        (outcome.Page(code=404, body=""), 0, 60, True),
+    ],
+)
+def test_cache_ttl(
+    tmp_path: Path,
+    result: outcome.Result,
+    success_ttl: float,
+    failure_ttl: float,
+    expected_hit: bool,
+):
+    cache = open_cache(tmp_path, success_ttl=success_ttl, failure_ttl=failure_ttl)
+    cache.put(URL, result)
+
+    assert (cache.get(URL) == result) is expected_hit
@@ -0,0 +1,65 @@
+import pytest
+
+from discolinks.canonical import Canonicalizer, Rule, normalize_percent_encoding
+from discolinks.core import Url
+from discolinks.html import parse_href
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("", ""),
+        ("/foo", "/foo"),
+        ("/%7efoo", "/~foo"),
+        ("/%2f%41", "/%2FA"),
+        ("/%E2%82%AC", "/%E2%82%AC"),
+    ],
+)
+def test_normalize_percent_encoding(value: str, expected: str):
+    assert normalize_percent_encoding(value) == expected
+
+
+@pytest.mark.parametrize(
+    "rules,url,expected",
+    [
+        (frozenset(), "http://Example.NET:80/A/?b&a", "http://Example.NET:80/A/?b&a"),
+        (None, "http://Example.NET:80/%7eA/", "http://example.net/~A/"),
+        (None, "https://example.net:80/", "https://example.net:80/"),
+        (None, "https://user@Example.net:443", "https://user@example.net"),
+        (None, "http://example.net:bad/", "http://example.net:bad/"),
+        ({Rule.TRAILING_SLASH}, "http://example.net/foo/", "http://example.net/foo"),
+        ({Rule.TRAILING_SLASH}, "http://example.net/", "http://example.net/"),
+        ({Rule.LOWERCASE_PATH}, "http://example.net/Foo", "http://example.net/foo"),
+        (
+            {Rule.TRACKING_PARAMS},
+            "http://example.net/?utm_source=x&id=1&fbclid=2&UTM_MEDIUM=y",
+            "http://example.net/?id=1",
+        ),
+        (
+            {Rule.SORT_QUERY},
+            "http://example.net/?b=1&a=2&b=0&a",
+            "http://example.net/?a=2&a&b=1&b=0",
+        ),
+        (
+            {Rule.TRACKING_PARAMS, Rule.SORT_QUERY},
+            "http://example.net/?utm_source=x",
+            "http://example.net/",
+        ),
+    ],
+)
+def test_canonicalize(rules, url: str, expected: str):
+    canonicalizer = (
+        Canonicalizer() if rules is None else Canonicalizer(rules=frozenset(rules))
+    )
+
+    assert canonicalizer.canonicalize(url) == expected
+
+
+def test_parse_href_canonical():
+    canonicalizer = Canonicalizer(rules=frozenset([Rule.TRAILING_SLASH]))
+
+    assert parse_href(
+        "bar/#baz",
+        base_url=Url.from_str("http://example.net/foo/"),
+        canonicalizer=canonicalizer,
+    ) == Url.from_str("http://example.net/foo/bar")
@@ -0,0 +1,148 @@
+import asyncio
+from typing import AsyncIterator
+
+import httpx
+
+from discolinks.concurrency import AdaptiveLimit, Throttle
+from discolinks.core import Url
+from discolinks.excluder import Excluder
+from discolinks.requester import Requester
+
+
+def test_adaptive_limit() -> None:
+    limit = AdaptiveLimit(maximum=10)
+
+    for _ in range(3):
+        limit.in_flight = int(limit.limit)
+        limit.increase()
+
+    assert limit.limit == 4
+
+    limit.decrease(epoch=0, factor=0.5)
+    limit.decrease(epoch=0, factor=0.5)
+
+    assert (limit.limit, limit.decreases) == (2, 1)
+
+    limit.in_flight = 2
+    limit.increase()
+
+    assert limit.limit == 2.5
+
+
+def test_adaptive_limit_not_reached() -> None:
+    limit = AdaptiveLimit(maximum=10, limit=4, in_flight=1)
+
+    limit.increase()
+
+    assert limit.limit == 4
+
+
+def test_throttle() -> None:
+    throttle = Throttle(maximum=8)
+    ok = Url.from_str("http://example.net/")
+    busy = Url.from_str("http://example.org/")
+
+    async def run() -> None:
+        for _ in range(4):
+            count = int(throttle.host_limit(ok.netloc).limit)
+            slots = [await throttle.acquire(ok, method="GET") for _ in range(count)]
+
+            for slot in slots:
+                await throttle.release(slot, status_code=200)
+
+        slot = await throttle.acquire(busy, method="GET")
+        await throttle.release(slot, status_code=503)
+
+    asyncio.run(run())
+
+    assert throttle.hosts["example.org"].limit == 1
+    assert throttle.hosts["example.net"].limit > 2
+    assert throttle.summary() == (
+        f"Concurrency settled at {int(throttle.total.limit)} parallel requests"
+        " (example.org: 1)"
+    )
+
+
+def test_throttle_wait() -> None:
+    throttle = Throttle(maximum=8)
+    url = Url.from_str("http://example.net/")
+    order = []
+
+    async def request(name: str) -> None:
+        slot = await throttle.acquire(url, method="GET")
+        order.append(f"{name} start")
+        await asyncio.sleep(0.01)
+        order.append(f"{name} end")
+        await throttle.release(slot, status_code=200)
+
+    async def run() -> None:
+        await asyncio.gather(request("a"), request("b"))
+
+    asyncio.run(run())
+
+    # The first limit is a single request.
+    assert order == ["a start", "a end", "b start", "b end"]
+
+
+def test_throttle_status_classes() -> None:
+    throttle = Throttle(maximum=8)
+    url = Url.from_str("http://example.net/")
+
+    async def run() -> None:
+        for _ in range(10):
+            count = int(throttle.host_limit(url.netloc).limit)
+            slots = [await throttle.acquire(url, method="GET") for _ in range(count)]
+
+            # Fast redirects and slower pages, none of them getting slower.
+            for index, slot in enumerate(slots):
+                (status_code, latency) = (301, 0.03) if index % 2 else (200, 0.15)
+                await throttle.release(slot, status_code=status_code, latency=latency)
+
+    asyncio.run(run())
+
+    assert throttle.hosts["example.net"].limit == 8
+    assert throttle.total.limit == 8
+
+
+async def body(text: str, duration: float) -> AsyncIterator[bytes]:
+    await asyncio.sleep(duration)
+    yield text.encode()
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/large":
+        return httpx.Response(200, content=body("<p>Large page</p>", duration=0.2))
+
+    return httpx.Response(200, content=body("<p>Small page</p>", duration=0.01))
+
+
+def test_requester_latency_until_headers() -> None:
+    throttle = Throttle(maximum=4)
+    urls = [
+        Url.from_str("http://example.net/small"),
+        Url.from_str("http://example.net/large"),
+    ]
+
+    async def run() -> list[str]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            requester = Requester(
+                excluder=Excluder.from_regexes(regexes=()),
+                client=client,
+                throttle=throttle,
+            )
+            texts = []
+
+            for _ in range(4):
+                count = int(throttle.host_limit("example.net").limit)
+                responses = await asyncio.gather(
+                    *(requester.send("GET", urls[index % 2]) for index in range(count))
+                )
+                texts += [response.text for response in responses]
+
+            return texts
+
+    texts = asyncio.run(run())
+
+    # Large pages take longer to download, which isn't a sign of overload.
+    assert throttle.hosts["example.net"].limit == 4
+    assert texts[:3] == ["<p>Small page</p>", "<p>Small page</p>", "<p>Large page</p>"]
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from discolinks import outcome
+from discolinks.content import ContentPredictor
+from discolinks.core import Url
+from discolinks.excluder import Excluder
+from discolinks.requester import Requester
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("http://example.net/", False),
+        ("http://example.net/docs/page", False),
+        ("http://example.net/docs/page.html", False),
+        ("http://example.net/report.PDF", True),
+        ("http://example.net/video.mp4?download=1", True),
+        ("http://example.net/archive.tar.gz", True),
+        ("http://example.net/.zip", False),
+        ("http://example.net/v1.2/", False),
+    ],
+)
+def test_predicts_other(url: str, expected: bool) -> None:
+    assert ContentPredictor().predicts_other(Url.from_str(url)) == expected
+
+
+def test_learn() -> None:
+    content = ContentPredictor()
+    content.learn(Url.from_str("http://example.net/files/a"), "application/zip")
+    content.learn(Url.from_str("http://example.net/files/b.png"), "text/html")
+    content.learn(Url.from_str("http://example.net/docs/a"), "text/html; charset=utf-8")
+
+    assert content.predicts_other(Url.from_str("http://example.net/files/c"))
+    assert not content.predicts_other(Url.from_str("http://example.net/files/c.php"))
+    assert not content.predicts_other(Url.from_str("http://example.net/docs/b"))
+    assert not content.predicts_other(Url.from_str("http://example.net/c"))
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/nohead.zip" and request.method == "HEAD":
+        return httpx.Response(405)
+
+    if request.url.path == "/page.pdf":
+        return httpx.Response(200, html="<a href='/'>")
+
+    return httpx.Response(200, headers={"Content-Type": "application/zip"})
+
+
+@pytest.mark.parametrize(
+    "path,methods,html",
+    [
+        ("/file.zip", ["HEAD"], False),
+        ("/nohead.zip", ["HEAD", "GET"], True),
+        ("/page.pdf", ["HEAD", "GET"], True),
+        ("/page", ["GET"], True),
+    ],
+)
+def test_request_page(path: str, methods: list[str], html: bool) -> None:
+    sent = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        sent.append(request.method)
+        return handler(request)
+
+    async def run() -> tuple[outcome.Result, bool]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(record)) as client:
+            requester = Requester(
+                excluder=Excluder.from_regexes([]),
+                client=client,
+                content=ContentPredictor(),
+            )
+            (result, _, is_html) = await requester.request_page(
+                Url.from_str(f"http://example.net{path}")
+            )
+            return (result, is_html)
+
+    (result, is_html) = asyncio.run(run())
+
+    assert result.status_code() == 200
+    assert sent == methods
+    assert is_html == html
@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+
+from discolinks import CrawlConfig, PageResult, StartError, crawl
+
+PAGES = {
+    "/": """<a href="/a"><a href="/missing">""",
+    "/a": """<a href="/">""",
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    body = PAGES.get(request.url.path)
+
+    if body is None:
+        return httpx.Response(404)
+
+    return httpx.Response(200, text=body, headers={"content-type": "text/html"})
+
+
+async def collect(config: CrawlConfig) -> dict[str, PageResult]:
+    return {str(result.url): result async for result in crawl(config)}
+
+
+def test_crawl() -> None:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run() -> dict[str, PageResult]:
+        async with client:
+            results = await collect(
+                CrawlConfig(start_urls=["http://example.net/"], client=client)
+            )
+            # The injected client is left open.
+            assert not client.is_closed
+            return results
+
+    results = asyncio.run(run())
+
+    assert sorted(results) == ["http://example.net/", "http://example.net/a"]
+    assert [(link.href, link.ok()) for link in results["http://example.net/"].links] == [
+        ("/a", True),
+        ("/missing", False),
+    ]
+    assert results["http://example.net/a"].ok()
+
+
+def test_crawl_start_error() -> None:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    config = CrawlConfig(start_urls=["http://example.net/nope"], client=client)
+
+    with pytest.raises(StartError):
+        asyncio.run(collect(config))
+
+
+def test_crawl_stop_early() -> None:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    config = CrawlConfig(start_urls=["http://example.net/"], client=client)
+
+    async def run() -> list[PageResult]:
+        results = []
+
+        async for result in crawl(config):
+            results.append(result)
+            break
+
+        return results
+
+    assert len(asyncio.run(run())) == 1
@@ -0,0 +1,33 @@
+from collections import Counter
+
+import pytest
+
+from discolinks.core import Url
+from discolinks.distributed import partition
+from discolinks.scope import Scope
+
+
+@pytest.mark.parametrize("count", [1, 2, 7])
+def test_partition_same_host(count: int):
+    first = partition(Url.from_str("http://example.net/foo"), count=count)
+    second = partition(Url.from_str("http://example.net/bar?baz"), count=count)
+
+    assert first == second
+    assert 0 <= first < count
+
+
+def test_partition_internal_pages():
+    scope = Scope(sites=frozenset(["example.net"]))
+    urls = [Url.from_str(f"http://example.net/{index}") for index in range(100)]
+
+    counts = Counter(partition(url, count=4, scope=scope) for url in urls)
+
+    assert sorted(counts) == [0, 1, 2, 3]
+    assert min(counts.values()) >= 15
+
+
+def test_partition_external_hosts():
+    scope = Scope(sites=frozenset(["example.net"]))
+    urls = [Url.from_str(f"http://example.org/{index}") for index in range(100)]
+
+    assert len({partition(url, count=4, scope=scope) for url in urls}) == 1
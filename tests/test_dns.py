@@ -0,0 +1,83 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import httpcore
+import pytest
+
+from discolinks.core import Url
+from discolinks.dns import Resolution, Resolver, ResolvingBackend
+
+
+@dataclass
+class FakeResolver(Resolver):
+    lookups: list[str] = field(default_factory=list)
+
+    async def lookup(self, host: str) -> Resolution:
+        self.lookups.append(host)
+        await asyncio.sleep(0)
+        error = "Failed to resolve" if host.endswith(".invalid") else None
+        return Resolution(
+            addresses=() if error else ("127.0.0.1",),
+            error=error,
+            expires_at=time.monotonic() + self.ttl,
+        )
+
+
+def test_prefetch_shared_with_requests():
+    async def run() -> FakeResolver:
+        resolver = FakeResolver()
+        resolver.prefetch(
+            [
+                Url.from_str("https://example.net/foo"),
+                Url.from_str("https://example.net:8080/bar"),
+            ]
+        )
+        resolutions = await asyncio.gather(
+            resolver.resolve("example.net"),
+            resolver.resolve("example.net"),
+        )
+        assert [r.addresses for r in resolutions] == [("127.0.0.1",)] * 2
+        await resolver.resolve("example.net")
+        return resolver
+
+    assert asyncio.run(run()).lookups == ["example.net"]
+
+
+def test_expired():
+    async def run() -> FakeResolver:
+        resolver = FakeResolver(ttl=0)
+        await resolver.resolve("example.net")
+        await resolver.resolve("example.net")
+        return resolver
+
+    assert asyncio.run(run()).lookups == ["example.net", "example.net"]
+
+
+def test_failure_fails_fast():
+    async def run() -> FakeResolver:
+        resolver = FakeResolver()
+        backend = ResolvingBackend(
+            resolver=resolver, backend=httpcore.AsyncMockBackend([])
+        )
+
+        for _ in range(2):
+            with pytest.raises(httpcore.ConnectError, match="Failed to resolve"):
+                await backend.connect_tcp(host="example.invalid", port=80)
+
+        return resolver
+
+    assert asyncio.run(run()).lookups == ["example.invalid"]
+
+
+def test_lookup_invalid_host():
+    host = f"{'a' * 70}.com"
+
+    async def run() -> Resolution:
+        return await Resolver().resolve(host)
+
+    resolution = asyncio.run(run())
+
+    assert resolution.addresses == ()
+    assert resolution.error is not None
+    assert resolution.error.startswith(f"Failed to resolve {host}")
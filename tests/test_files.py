@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from discolinks.core import Url
+from discolinks.files import FileSite
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> FileSite:
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.html").write_text("<p>Docs</p>")
+    (tmp_path / "style.css").write_text("p {}")
+    return FileSite(root=tmp_path, base_url=Url.from_str("http://example.net/site/"))
+
+
+def respond(site: FileSite, url: str, method: str = "GET") -> httpx.Response:
+    return site.respond(httpx.Request(method, url))
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("http://example.net/site/", True),
+        ("http://example.net/site", True),
+        ("http://example.net/site/docs/", True),
+        ("http://example.net/sitemap.xml", False),
+        ("https://example.net/site/", False),
+        ("http://example.org/site/", False),
+    ],
+)
+def test_serves(site: FileSite, url: str, expected: bool) -> None:
+    assert site.serves(Url.from_str(url)) == expected
+
+
+def test_respond_file(site: FileSite) -> None:
+    response = respond(site, "http://example.net/site/style.css")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/css"
+    assert response.text == "p {}"
+
+
+def test_respond_head(site: FileSite) -> None:
+    response = respond(site, "http://example.net/site/style.css", method="HEAD")
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == "4"
+    assert response.content == b""
+
+
+def test_respond_directory(site: FileSite) -> None:
+    response = respond(site, "http://example.net/site/docs/")
+
+    assert response.status_code == 200
+    assert response.text == "<p>Docs</p>"
+
+
+def test_respond_directory_redirect(site: FileSite) -> None:
+    response = respond(site, "http://example.net/site/docs")
+
+    assert response.status_code == 301
+    assert response.headers["location"] == "http://example.net/site/docs/"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://example.net/site/missing.html",
+        "http://example.net/site/../../etc/passwd",
+        "http://example.net/site/%2E%2E/%2E%2E/etc/passwd",
+    ],
+)
+def test_respond_not_found(site: FileSite, url: str) -> None:
+    assert respond(site, url).status_code == 404
@@ -1,9 +1,23 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence
 
 import pytest
 
-from discolinks.core import Url
-from discolinks.html import get_hrefs, parse_href
+from discolinks import html
+from discolinks.core import LinkKind, Url
+from discolinks.html import (
+    Ref,
+    ScanCache,
+    body_digest,
+    get_hrefs,
+    has_anchor,
+    parse_document,
+    parse_href,
+    parse_srcset,
+    scan,
+)
 
 
 @pytest.mark.parametrize(
@@ -30,6 +44,101 @@ def test_get_hrefs(body: str, expected: Sequence[str]):
     assert list(result) == expected
 
 
+@pytest.mark.parametrize(
+    "body,expected",
+    [
+        ("""<img src="foo.png">""", [Ref(href="foo.png", kind=LinkKind.IMAGE)]),
+        (
+            """<img srcset="foo.png 1x, bar.png 2x">""",
+            [
+                Ref(href="foo.png", kind=LinkKind.IMAGE),
+                Ref(href="bar.png", kind=LinkKind.IMAGE),
+            ],
+        ),
+        ("""<script src="foo.js">""", [Ref(href="foo.js", kind=LinkKind.SCRIPT)]),
+        (
+            """<link rel="stylesheet" href="foo.css">""",
+            [Ref(href="foo.css", kind=LinkKind.STYLESHEET)],
+        ),
+        ("""<link rel="canonical" href="foo">""", []),
+        ("""<iframe src="foo">""", [Ref(href="foo", kind=LinkKind.FRAME)]),
+        (
+            """<video src="foo.mp4" poster="foo.png">""",
+            [
+                Ref(href="foo.mp4", kind=LinkKind.MEDIA),
+                Ref(href="foo.png", kind=LinkKind.IMAGE),
+            ],
+        ),
+        ("""<a href="foo">""", [Ref(href="foo", kind=LinkKind.LINK)]),
+    ],
+)
+def test_scan_refs(body: str, expected: Sequence[Ref]):
+    result = scan(body=body, kinds=frozenset(LinkKind))
+
+    assert list(result.refs) == expected
+
+
+def test_scan_refs_filtered():
+    result = scan(
+        body="""<a href="foo"><img src="bar.png"><script src="baz.js">""",
+        kinds=frozenset([LinkKind.SCRIPT]),
+    )
+
+    assert list(result.refs) == [Ref(href="baz.js", kind=LinkKind.SCRIPT)]
+
+
+@pytest.mark.parametrize(
+    "srcset,expected",
+    [
+        ("", []),
+        ("foo.png", ["foo.png"]),
+        ("foo.png 1x, bar.png 2x", ["foo.png", "bar.png"]),
+        ("foo.png,bar.png", ["foo.png,bar.png"]),
+        ("foo.png 100w,  bar.png 200w ,", ["foo.png", "bar.png"]),
+        (
+            "data:image/png;base64,AAAA 1x, foo.png 2x",
+            ["data:image/png;base64,AAAA", "foo.png"],
+        ),
+    ],
+)
+def test_parse_srcset(srcset: str, expected: Sequence[str]):
+    result = parse_srcset(srcset)
+
+    assert list(result) == expected
+
+
+@pytest.mark.parametrize(
+    "body,expected",
+    [
+        ("<body></body>", set()),
+        ("""<h2 id="foo">""", {"foo"}),
+        ("""<a name="foo">""", {"foo"}),
+        ("""<div name="foo">""", set()),
+        ("""<p id="foo"><a id="bar" name="baz" href="#foo">""", {"foo", "bar", "baz"}),
+    ],
+)
+def test_scan_anchors(body: str, expected: set[str]):
+    result = scan(body=body)
+
+    assert result.anchors == expected
+
+
+@pytest.mark.parametrize(
+    "fragment,expected",
+    [
+        ("", True),
+        ("top", True),
+        ("foo", True),
+        ("bar", False),
+        ("caf%C3%A9", True),
+    ],
+)
+def test_has_anchor(fragment: str, expected: bool):
+    result = has_anchor(frozenset(["foo", "café"]), fragment=fragment)
+
+    assert result is expected
+
+
 @pytest.mark.parametrize(
     "href,base_url,expected",
     [
@@ -89,3 +198,65 @@ def test_parse_href(href: str, base_url: Url, expected: Url):
     result = parse_href(href=href, base_url=base_url)
 
     assert result == expected
+
+
+def test_parse_document_scan_cache():
+    scans = ScanCache()
+    body = """<a href="bar"><a href="/baz">"""
+
+    first = parse_document(
+        body,
+        url=Url.from_str("https://example.net/foo/"),
+        kinds=frozenset([LinkKind.LINK]),
+        scans=scans,
+    )
+    second = parse_document(
+        body,
+        url=Url.from_str("https://example.org/qux/"),
+        kinds=frozenset([LinkKind.LINK]),
+        scans=scans,
+    )
+
+    assert len(scans.scans) == 1
+    assert first.digest == second.digest
+    assert [link.url.full for link in second.links] == [
+        "https://example.org/qux/bar",
+        "https://example.org/baz",
+    ]
+
+
+def test_scan_cache_eviction():
+    scans = ScanCache(max_size=2)
+
+    for body in ["<a href='1'>", "<a href='2'>", "<a href='3'>"]:
+        scans.scan(body, digest=body_digest(body), kinds=frozenset([LinkKind.LINK]))
+
+    assert list(scans.scans) == [body_digest("<a href='2'>"), body_digest("<a href='3'>")]
+
+
+def test_scan_cache_threads(monkeypatch):
+    scans = ScanCache(max_size=4)
+    bodies = [f"<a href='{index}'>" for index in range(4)]
+    scanned: list[str] = []
+    lock = threading.Lock()
+
+    def slow_scan(body, kinds):
+        with lock:
+            scanned.append(body)
+
+        # Gives other threads time to ask for the same body.
+        time.sleep(0.05)
+        return scan(body, kinds=kinds)
+
+    monkeypatch.setattr(html, "scan", slow_scan)
+
+    def run(body: str) -> Sequence[str]:
+        kinds = frozenset([LinkKind.LINK])
+        result = scans.scan(body, digest=body_digest(body), kinds=kinds)
+        return [ref.href for ref in result.refs]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, bodies * 4))
+
+    assert sorted(scanned) == sorted(bodies)
+    assert results == [[str(index)] for index in range(4)] * 4
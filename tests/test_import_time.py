@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+# Modules which take most of the import time and aren't needed to parse arguments.
+HEAVY_MODULES = ["asyncio", "bs4", "httpcore", "httpx", "rich"]
+
+# Cumulative import time of the command line module, in microseconds. It's about 30 ms
+# when heavy modules are imported lazily and 250 ms otherwise.
+MAX_IMPORT_TIME = 150_000
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Return the cumulative import time of each module imported by a module, as measured
+    by `python -X importtime`.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    times = {}
+
+    for line in result.stderr.decode().splitlines():
+        (prefix, _, rest) = line.partition(":")
+
+        if prefix != "import time" or "cumulative" in rest:
+            continue
+
+        (_, cumulative, name) = rest.split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_cli_import_is_lazy() -> None:
+    times = import_times("discolinks.cli")
+
+    imported = {name.split(".")[0] for name in times}
+    assert imported.isdisjoint(HEAVY_MODULES)
+    assert times["discolinks.cli"] < MAX_IMPORT_TIME
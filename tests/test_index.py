@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from discolinks import outcome
+from discolinks.core import Link, LinkKind, Url
+from discolinks.index import LinkIndex
+from discolinks.url_store import UrlInfo
+
+
+def url(path: str) -> Url:
+    return Url.from_str(f"http://example.net{path}")
+
+
+def page(*paths: str) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Page(code=200, body=""),
+        links=[Link(href=path, url=url(path), kind=LinkKind.LINK) for path in paths],
+        anchors=frozenset(["top"]),
+        digest="0123",
+    )
+
+
+def redirect(path: str) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Redirect(code=301, ref=path, url=url(path)),
+        links=None,
+    )
+
+
+def test_save_load(tmp_path: Path) -> None:
+    site_urls = {"example.net": url("/")}
+    url_infos = {
+        url("/"): page("/a", "/old"),
+        url("/old"): redirect("/a"),
+        url("/a"): page(),
+    }
+    index = LinkIndex.open(tmp_path / "index.sqlite")
+
+    index.save(site_urls=site_urls, url_infos=url_infos)
+
+    assert index.load() == (site_urls, url_infos)
+    assert sorted(index.referrers(url("/a")), key=str) == [
+        (url("/"), "/a", False),
+        (url("/old"), "/a", True),
+    ]
+
+
+def test_save_replaces(tmp_path: Path) -> None:
+    index = LinkIndex.open(tmp_path / "index.sqlite")
+    index.save(site_urls={}, url_infos={url("/"): page("/a")})
+
+    index.save(site_urls={}, url_infos={url("/b"): page()})
+
+    assert index.load() == ({}, {url("/b"): page()})
+    assert index.referrers(url("/a")) == []
+
+
+def test_affected(tmp_path: Path) -> None:
+    index = LinkIndex.open(tmp_path / "index.sqlite")
+    index.save(
+        site_urls={},
+        url_infos={
+            url("/"): page("/old", "/b"),
+            url("/old"): redirect("/older"),
+            url("/older"): redirect("/a"),
+            url("/a"): page("/b"),
+            url("/b"): page("/c"),
+            url("/c"): page(),
+        },
+    )
+
+    assert index.affected([url("/a")]) == {url("/")}
+    assert index.affected([url("/b")]) == {url("/"), url("/a")}
+    assert index.affected([url("/c"), url("/x")]) == {url("/b")}
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+from discolinks.core import Url
+from discolinks.loop import LagMonitor
+
+
+def test_lag_monitor() -> None:
+    lag = LagMonitor(threshold=0.1)
+    url = Url.from_str("http://example.net/")
+
+    async def run() -> None:
+        sampler = asyncio.create_task(lag.run())
+        await asyncio.sleep(0.05)
+        lag.on_stage(url, "parsing")
+        # Blocks the loop, like parsing a large page would.
+        time.sleep(0.3)  # noqa: ASYNC251
+        lag.on_stage(url, "storing")
+        await asyncio.sleep(0.05)
+        sampler.cancel()
+        await asyncio.gather(sampler, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert [(stall.url, stall.stage) for stall in lag.stalls] == [(url, "parsing")]
+    assert lag.stalls[0].duration >= 0.25
+    assert lag.max_lag == lag.stalls[0].duration
+    assert lag.stopped.is_set()
@@ -0,0 +1,27 @@
+import asyncio
+import threading
+
+from discolinks.parsing import ParsePool, default_parse_threads, gil_enabled
+
+
+def test_default_parse_threads() -> None:
+    threads = default_parse_threads()
+
+    assert (threads == 0) == gil_enabled()
+
+
+def test_parse_pool() -> None:
+    pool = ParsePool.start(2)
+
+    async def run() -> tuple[str, str]:
+        return await asyncio.gather(
+            pool.run(lambda: threading.current_thread().name),
+            pool.run(lambda: threading.current_thread().name),
+        )
+
+    try:
+        names = asyncio.run(run())
+    finally:
+        pool.close()
+
+    assert all(name.startswith("discolinks-parse") for name in names)
@@ -0,0 +1,88 @@
+from typing import Sequence
+
+from discolinks import outcome
+from discolinks.analyzer import Page, Stats
+from discolinks.core import Link, LinkKind, Url
+from discolinks.report import PageWriter, Reporter
+from discolinks.url_store import UrlInfo, UrlStore
+
+
+class FakeWriter(PageWriter):
+    def write_pages(self, pages: Sequence[tuple[Url, Page]]) -> None:
+        pass
+
+    def finish(self, stats: Stats, duplicates: Sequence[Sequence[Url]]) -> None:
+        pass
+
+
+def url(path: str) -> Url:
+    return Url.from_str(f"http://example.net{path}")
+
+
+def page(*paths: str) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Page(code=200, body=""),
+        links=[Link(href=path, url=url(path), kind=LinkKind.LINK) for path in paths],
+    )
+
+
+def reported(reporter: Reporter) -> list[Url]:
+    urls = []
+
+    while not reporter.queue.empty():
+        item = reporter.queue.get_nowait()
+        assert item is not None
+        urls.append(item[0])
+
+    return urls
+
+
+def test_reporter_waits_for_links() -> None:
+    reporter = Reporter(writers=[FakeWriter()])
+    url_store = UrlStore(on_store=reporter.on_store)
+
+    url_store.add_page(url("/"), page("/a", "/b"))
+    url_store.add_page(url("/a"), page())
+
+    assert reported(reporter) == [url("/a")]
+
+    url_store.add_page(url("/b"), page("/a"))
+
+    assert reported(reporter) == [url("/"), url("/b")]
+    assert reporter.stats == Stats(ok=3)
+
+
+def test_reporter_follows_redirects() -> None:
+    reporter = Reporter(writers=[FakeWriter()])
+    url_store = UrlStore(on_store=reporter.on_store)
+
+    url_store.add_page(url("/"), page("/old"))
+    url_store.add_page(
+        url("/old"),
+        UrlInfo(
+            result=outcome.Redirect(code=301, ref="/new", url=url("/new")),
+            links=None,
+        ),
+    )
+
+    assert reported(reporter) == []
+
+    url_store.add_page(
+        url("/new"),
+        UrlInfo(result=outcome.Page(code=404, body=""), links=None),
+    )
+
+    assert reported(reporter) == [url("/")]
+    assert reporter.stats == Stats(failed=1)
+
+
+def test_reporter_close() -> None:
+    reporter = Reporter(writers=[FakeWriter()])
+    url_store = UrlStore(on_store=reporter.on_store)
+
+    url_store.add_page(url("/"), page("/a"))
+    reporter.close(url_store.get_url_infos())
+
+    assert reporter.queue.get_nowait() is not None
+    assert reporter.queue.get_nowait() is None
+    assert reporter.remaining == {}
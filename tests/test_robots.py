@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+
+from discolinks.core import Url
+from discolinks.robots import Robots, RobotsRules, parse_robots, robots_path
+
+ROBOTS = """
+# Comment
+User-agent: *
+Disallow: /private/
+Allow: /private/public
+Disallow: /*.pdf$
+Crawl-delay: 2
+
+User-agent: OtherBot
+User-agent: discolinks
+Disallow: /other/
+Disallow: /*?session=
+Crawl-delay: 0.5
+"""
+
+
+@pytest.mark.parametrize(
+    "user_agent,path,expected",
+    [
+        ("foo", "/", True),
+        ("foo", "/private/", False),
+        ("foo", "/private/foo", False),
+        ("foo", "/private/public/foo", True),
+        ("foo", "/doc.pdf", False),
+        ("foo", "/doc.pdf?x", True),
+        ("foo", "/other/", True),
+        ("discolinks", "/private/", True),
+        ("discolinks", "/other/foo", False),
+        ("discolinks", "/foo?session=1", False),
+        ("DiscoLinks", "/other/", False),
+    ],
+)
+def test_parse_robots(user_agent: str, path: str, expected: bool):
+    assert parse_robots(ROBOTS, user_agent=user_agent).allows(path) is expected
+
+
+def test_crawl_delay():
+    assert parse_robots(ROBOTS, user_agent="foo").crawl_delay == 2
+    assert parse_robots(ROBOTS, user_agent="discolinks").crawl_delay == 0.5
+
+
+def test_empty():
+    assert parse_robots("") == RobotsRules()
+    assert parse_robots("User-agent: *\nDisallow:\n").allows("/foo")
+
+
+def test_robots_path():
+    assert robots_path(Url.from_str("https://example.net")) == "/"
+    assert robots_path(Url.from_str("https://example.net/a?b=c")) == "/a?b=c"
+
+
+@pytest.mark.parametrize(
+    "status_code,expected",
+    [
+        (200, False),
+        (404, True),
+        (403, True),
+        (500, False),
+        (503, False),
+    ],
+)
+def test_fetch_status(status_code: int, expected: bool):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, text="User-agent: *\nDisallow: /foo\n")
+
+    async def run() -> bool:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            robots = Robots(client=client)
+            return await robots.allows(Url.from_str("http://example.net/foo"))
+
+    assert asyncio.run(run()) is expected
@@ -0,0 +1,121 @@
+import pytest
+
+from discolinks import outcome
+from discolinks.core import Link, LinkKind, Url
+from discolinks.seen import (
+    BloomFilter,
+    CompactSeenUrls,
+    ExactSeenUrls,
+    GrowingBloomFilter,
+    SeenUrls,
+    fingerprint_width,
+    url_hashes,
+)
+from discolinks.url_store import UrlInfo, UrlStore
+
+URLS = [Url.from_str(f"http://example.net/{index}") for index in range(5000)]
+
+
+@pytest.mark.parametrize(
+    "seen",
+    [
+        ExactSeenUrls(),
+        CompactSeenUrls(),
+        CompactSeenUrls(capacity=10_000, error_rate=1e-3),
+        CompactSeenUrls(capacity=10_000, bloom=True),
+    ],
+)
+def test_add(seen: SeenUrls) -> None:
+    assert all(seen.add(url) for url in URLS)
+    assert not any(seen.add(url) for url in URLS)
+    assert len(seen) == len(URLS)
+
+
+@pytest.mark.parametrize(
+    "capacity,error_rate,bloom,expected",
+    [
+        (10_000_000, 1e-6, False, 64),
+        (10_000_000, 1e-3, True, 32),
+        (1000, 1e-6, False, 32),
+        (10, 1e-3, False, 16),
+        (10**20, 1e-9, False, 64),
+    ],
+)
+def test_fingerprint_width(
+    capacity: int,
+    error_rate: float,
+    bloom: bool,
+    expected: int,
+) -> None:
+    assert fingerprint_width(capacity, error_rate=error_rate, bloom=bloom) == expected
+
+
+def test_false_positive_rate() -> None:
+    seen = CompactSeenUrls(capacity=10_000, error_rate=1e-3)
+    seen.update(URLS)
+
+    assert seen.width == 32
+    assert seen.false_positive_rate() == pytest.approx(len(URLS) / 2**32)
+    assert seen.summary().startswith("Seen URLs: 5000 fingerprints of 32 bits")
+
+
+def test_bloom_filter() -> None:
+    bloom = BloomFilter(capacity=len(URLS), error_rate=0.01)
+
+    for url in URLS:
+        (_, first, second) = url_hashes(url)
+        bloom.add(first, second)
+
+    assert bloom.current_error_rate() == pytest.approx(0.01, rel=0.2)
+
+    others = [Url.from_str(f"http://example.org/{index}") for index in range(1000)]
+    false_positives = sum(bloom.add(*url_hashes(url)[1:]) for url in others)
+
+    # The filter goes over its capacity as they are added.
+    assert false_positives < 0.04 * len(others)
+
+
+@pytest.mark.parametrize("count", [1000, 2000, 5000])
+def test_size(count: int) -> None:
+    seen = CompactSeenUrls(capacity=10_000, error_rate=1e-3)
+    seen.update(URLS[:count])
+
+    assert seen.width == 32
+    # The table grows to stay between 40% and 80% full, for 4-byte fingerprints.
+    assert 4 / 0.8 <= seen.size() / count <= 4 / 0.4
+
+
+def test_growing_bloom_filter() -> None:
+    bloom = GrowingBloomFilter(error_rate=0.01)
+    urls = [Url.from_str(f"http://example.net/{index}") for index in range(200_000)]
+
+    # Small filters are enough for small crawls.
+    assert bloom.size() < 100_000
+
+    for url in urls:
+        (_, first, second) = url_hashes(url)
+        bloom.add(first, second)
+
+    assert len(bloom.filters) == 3
+    assert all(bloom.add(*url_hashes(url)[1:]) for url in urls[:1000])
+    assert bloom.current_error_rate() < 0.01
+
+    others = [Url.from_str(f"http://example.org/{index}") for index in range(10_000)]
+    false_positives = sum(bloom.add(*url_hashes(url)[1:]) for url in others)
+
+    assert false_positives < 0.02 * len(others)
+
+
+def test_url_store() -> None:
+    url_store = UrlStore(seen_urls=CompactSeenUrls())
+    info = UrlInfo(
+        result=outcome.Page(code=200, body=""),
+        links=[
+            Link(href=url.full, url=url, kind=LinkKind.LINK)
+            for url in [URLS[0], URLS[1], URLS[0]]
+        ],
+    )
+
+    assert url_store.add_page(URLS[0], info) == {URLS[1]}
+    assert url_store.add_page(URLS[1], info) == frozenset()
+    assert url_store.count() == 2
@@ -0,0 +1,46 @@
+import gzip
+from typing import Sequence
+
+import pytest
+
+from discolinks.sitemap import SitemapParser
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>https://example.net/</loc><lastmod>2024-01-01</lastmod></url>
+    <url><loc> https://example.net/foo </loc></url>
+</urlset>
+"""
+
+URLSET_LOCS = ["https://example.net/", "https://example.net/foo"]
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap><loc>https://example.net/pages.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+
+@pytest.mark.parametrize(
+    "data,expected_locs,expected_index",
+    [
+        (URLSET, URLSET_LOCS, False),
+        (gzip.compress(URLSET), URLSET_LOCS, False),
+        (INDEX, ["https://example.net/pages.xml"], True),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_sitemap_parser(
+    data: bytes,
+    expected_locs: Sequence[str],
+    expected_index: bool,
+    chunk_size: int,
+):
+    parser = SitemapParser()
+
+    for i in range(0, len(data), chunk_size):
+        parser.feed(data[i : i + chunk_size])
+    parser.close()
+
+    assert parser.locs == expected_locs
+    assert parser.is_index() is expected_index
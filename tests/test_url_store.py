@@ -0,0 +1,77 @@
+from discolinks import outcome
+from discolinks.core import Link, LinkKind, Url
+from discolinks.url_store import Limits, UrlInfo, UrlStore
+
+FOO = Url.from_str("http://example.net/foo")
+BAR = Url.from_str("http://example.net/bar")
+BAZ = Url.from_str("http://example.net/baz")
+QUX = Url.from_str("http://example.net/qux")
+
+
+def page(*links: tuple[Url, LinkKind]) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Page(code=200, body=""),
+        links=[Link(href=url.full, url=url, kind=kind) for (url, kind) in links],
+    )
+
+
+def test_resource_then_link() -> None:
+    url_store = UrlStore()
+
+    assert url_store.add_page(FOO, page((BAR, LinkKind.FRAME))) == {BAR}
+    assert url_store.is_resource(BAR)
+    assert url_store.add_page(BAZ, page((BAR, LinkKind.LINK))) == frozenset()
+    assert not url_store.is_resource(BAR)
+
+
+def test_link_then_resource() -> None:
+    url_store = UrlStore()
+
+    assert url_store.add_page(FOO, page((BAR, LinkKind.LINK))) == {BAR}
+    assert url_store.add_page(BAZ, page((BAR, LinkKind.FRAME))) == frozenset()
+    assert not url_store.is_resource(BAR)
+
+
+def test_resource_then_link_restored() -> None:
+    url_store = UrlStore()
+    url_store.restore({FOO: page((BAR, LinkKind.IMAGE))})
+
+    assert url_store.is_resource(BAR)
+
+    url_store.add_page(BAZ, page((BAR, LinkKind.LINK)))
+
+    assert not url_store.is_resource(BAR)
+
+
+def redirect(url: Url) -> UrlInfo:
+    return UrlInfo(
+        result=outcome.Redirect(code=302, ref=url.full, url=url),
+        links=None,
+    )
+
+
+def test_too_many_redirects() -> None:
+    url_store = UrlStore(max_redirects=1)
+
+    assert url_store.add_page(FOO, redirect(BAR)) == {BAR}
+    assert url_store.add_page(BAR, redirect(BAZ)) == frozenset()
+    assert url_store.get_url_infos() == {
+        FOO: redirect(BAR),
+        BAR: UrlInfo(
+            result=outcome.RequestError(msg="Too many redirects"),
+            links=None,
+        ),
+    }
+    assert url_store.add_page(QUX, page((BAZ, LinkKind.LINK))) == {BAZ}
+
+
+def test_max_pages_redirect() -> None:
+    url_store = UrlStore(limits=Limits(max_pages=2))
+
+    assert url_store.try_crawl(FOO)
+    url_store.add_page(FOO, page((BAR, LinkKind.LINK), (BAZ, LinkKind.LINK)))
+    assert url_store.try_crawl(BAR)
+    url_store.add_page(BAR, redirect(QUX))
+    # The redirect target is part of the page being crawled.
+    assert url_store.try_crawl(QUX)
+    assert not url_store.try_crawl(BAZ)